@@ -8,12 +8,26 @@ from collections import Counter
 from typing import List, Dict, Tuple, Any
 import json
 
+import decode_search
+import geocoder
+import ngrams
+import primes
+import reporting
+import scoring
+import timestamps
+from cache import ResultCache
+from palindromes import PalindromeIndex
+
+CICADA_NUMBER = "10412790658919985359827898739594318956404425106955675643739226952372682423852959081739834390370374475764863415203423499357108713631"
+
 class CicadaCompleteSolution:
     
-    def __init__(self):
-        self.original_number = "10412790658919985359827898739594318956404425106955675643739226952372682423852959081739834390370374475764863415203423499357108713631"
+    def __init__(self, original_number: str = CICADA_NUMBER, result_cache: ResultCache = None):
+        self.original_number = original_number
+        self.result_cache = ResultCache() if result_cache is None else result_cache
         
         self.palindromes = ['78987', '7447', '13631']
+        self.compress_report = False
         self.pattern_739_positions = [26, 56, 83]
         self.cicada_constants = {3301: "Main Cicada number", 509: "Totient of 3301", 
                                311: "Prime factor", 113: "Prime factor", 29: "Liber Primus", 7: "Sacred number"}
@@ -23,13 +37,19 @@ class CicadaCompleteSolution:
         self.coordinates = []
         self.timestamps = []
         
+    def run_phase(self, phase):
+        return self.result_cache.run(self.original_number, phase, state=('analysis_results', 'hex_layers'))
+    
+    def cache_params(self) -> Dict[str, Any]:
+        return {
+            'palindromes': self.palindromes,
+            'compress_report': self.compress_report,
+            'pattern_739_positions': self.pattern_739_positions,
+            'cicada_constants': self.cicada_constants
+        }
+        
     def is_prime(self, n: int) -> bool:
-        if n < 2:
-            return False
-        for i in range(2, int(n**0.5) + 1):
-            if n % i == 0:
-                return False
-        return True
+        return primes.is_prime(n)
     
     def digital_root(self, n: int) -> int:
         while n >= 10:
@@ -67,11 +87,8 @@ class CicadaCompleteSolution:
         print("🔍 Phase 2: Pattern Recognition")
         
         palindromes_found = []
-        for length in range(3, 8):
-            for i in range(len(self.original_number) - length + 1):
-                substr = self.original_number[i:i + length]
-                if substr == substr[::-1] and len(substr) >= 4:
-                    palindromes_found.append({'text': substr, 'position': i, 'length': length})
+        for substr, i, length in PalindromeIndex(self.original_number).occurrences(4, 7):
+            palindromes_found.append({'text': substr, 'position': i, 'length': length})
         
         pattern_739_occurrences = []
         start = 0
@@ -115,75 +132,40 @@ class CicadaCompleteSolution:
     def phase_3_breakthrough_method(self):
         print("🔥 Phase 3: BREAKTHROUGH - Every 5th Digit Method")
         
-        every_5th = ''.join([self.original_number[i] for i in range(0, len(self.original_number), 5)])
+        primary = decode_search.decode(self.original_number, stride=5, offset=0, rotation=1, group_size=2,
+                                       scorer=scoring.CONTROL_INCLUSIVE_SCORER)
+        every_5th = primary['extracted']
+        shifted = primary['shifted']
+        ascii_result = primary['text']
+        decimal_values = primary['values']
+        primary_validity = primary['score']
         
-        shifted = every_5th[1:] + every_5th[:1]
-        
-        ascii_result = ""
-        decimal_values = []
-        valid_ascii = 0
-        total_pairs = 0
-        
-        for i in range(0, len(shifted) - 1, 2):
-            pair = shifted[i:i+2]
-            try:
-                ascii_val = int(pair)
-                decimal_values.append(ascii_val)
-                total_pairs += 1
-                
-                if 32 <= ascii_val <= 126:
-                    ascii_result += chr(ascii_val)
-                    valid_ascii += 1
-                elif 1 <= ascii_val <= 31:
-                    ascii_result += f"[{ascii_val}]"
-                    valid_ascii += 1
-                else:
-                    ascii_result += "?"
-            except ValueError:
-                ascii_result += "?"
-                total_pairs += 1
-        
-        primary_validity = (valid_ascii / total_pairs * 100) if total_pairs > 0 else 0
-        
-        shifted_3 = every_5th[3:] + every_5th[:3]
-        ascii_result_2 = ""
-        valid_ascii_2 = 0
-        total_pairs_2 = 0
-        
-        for i in range(0, len(shifted_3) - 1, 2):
-            pair = shifted_3[i:i+2]
-            try:
-                ascii_val = int(pair)
-                total_pairs_2 += 1
-                
-                if 32 <= ascii_val <= 126:
-                    ascii_result_2 += chr(ascii_val)
-                    valid_ascii_2 += 1
-                elif 1 <= ascii_val <= 31:
-                    ascii_result_2 += f"[{ascii_val}]"
-                    valid_ascii_2 += 1
-                else:
-                    ascii_result_2 += "?"
-            except ValueError:
-                ascii_result_2 += "?"
-                total_pairs_2 += 1
+        secondary = decode_search.decode(self.original_number, stride=5, offset=0, rotation=3, group_size=2,
+                                         scorer=scoring.CONTROL_INCLUSIVE_SCORER)
+        ascii_result_2 = secondary['text']
+        secondary_validity = secondary['score']
         
-        secondary_validity = (valid_ascii_2 / total_pairs_2 * 100) if total_pairs_2 > 0 else 0
+        primary_language, primary_language_score = ngrams.best_language(decimal_values)
+        secondary_language, secondary_language_score = ngrams.best_language(secondary['values'])
         
         self.analysis_results['phase_3'] = {
             'every_5th_digits': every_5th,
             'shifted_sequence': shifted,
             'primary_decoded_message': ascii_result,
             'primary_validity': primary_validity,
+            'primary_language': primary_language,
+            'primary_language_score': primary_language_score,
             'decimal_values': decimal_values,
             'secondary_decoded_message': ascii_result_2,
-            'secondary_validity': secondary_validity
+            'secondary_validity': secondary_validity,
+            'secondary_language': secondary_language,
+            'secondary_language_score': secondary_language_score
         }
         
         print(f"  ✓ Every 5th digit: {every_5th}")
         print(f"  ✓ Shifted sequence: {shifted}")
-        print(f"  🎯 PRIMARY DECODED MESSAGE: '{ascii_result}' (Validity: {primary_validity:.1f}%)")
-        print(f"  🎯 SECONDARY MESSAGE: '{ascii_result_2}' (Validity: {secondary_validity:.1f}%)")
+        print(f"  🎯 PRIMARY DECODED MESSAGE: '{ascii_result}' (Validity: {primary_validity:.1f}%, {primary_language}: {primary_language_score:.1f})")
+        print(f"  🎯 SECONDARY MESSAGE: '{ascii_result_2}' (Validity: {secondary_validity:.1f}%, {secondary_language}: {secondary_language_score:.1f})")
         
     def phase_4_hex_analysis(self):
         print("🔍 Phase 4: Complete Hex Analysis (5 Layers)")
@@ -195,30 +177,14 @@ class CicadaCompleteSolution:
         
         ascii_command = self.analysis_results['phase_3']['primary_decoded_message']
         
-        timestamps = []
-        for length in [8, 10]:
-            for i in range(0, len(hex_string) - length + 1):
-                timestamp_hex = hex_string[i:i + length]
-                try:
-                    timestamp = int(timestamp_hex, 16)
-                    if 1000000000 < timestamp < 2000000000:
-                        dt = datetime.datetime.fromtimestamp(timestamp)
-                        timestamps.append({
-                            'hex': timestamp_hex,
-                            'decimal': timestamp,
-                            'datetime': dt.strftime('%Y-%m-%d %H:%M:%S'),
-                            'position': i
-                        })
-                except:
-                    pass
-        
-        unique_timestamps = []
-        seen = set()
-        for ts in timestamps:
-            if ts['decimal'] not in seen:
-                unique_timestamps.append(ts)
-                seen.add(ts['decimal'])
-        unique_timestamps.sort(key=lambda x: x['decimal'])
+        found = timestamps.scan_timestamps(bytes(decimal_values), widths=(32, 40), byteorders=('big',),
+                                           epochs=('unix',), low=1000000001, high=1999999999, nibble_aligned=True)
+        unique_timestamps = [{
+            'hex': ts['hex'],
+            'decimal': ts['raw'],
+            'datetime': ts['datetime'],
+            'position': ts['position']
+        } for ts in found.unique()[:]]
         
         coordinates = []
         for i in range(0, len(hex_string) - 11, 4):
@@ -331,14 +297,11 @@ class CicadaCompleteSolution:
             print(f"  ✓ Timeline: {temporal_analysis['earliest_date']} to {temporal_analysis['latest_date']}")
         
     def analyze_coordinate_significance(self, lat: float, lon: float) -> str:
-        if 10 <= lat <= 20 and 50 <= lon <= 60:
-            return "Arabian Peninsula region - Strategic shipping lanes near Bab-el-Mandeb Strait"
-        elif 0 <= lat <= 30 and 60 <= lon <= 90:
-            return "Indian Ocean region - Major maritime trade routes"
-        elif -10 <= lat <= 40 and -20 <= lon <= 50:
-            return "Africa/Middle East region - Strategic geographic significance"
-        else:
-            return f"Coordinates {lat}°N, {lon}°E - Location requires further geographic analysis"
+        location = geocoder.describe(lat, lon)
+        if location['significance']:
+            return f"{location['label']} - {location['significance']}"
+        return (f"{location['label']} - {location['distance_km']:.0f} km from "
+                f"{location['nearest_place']}, {location['place_country']}")
     
     def interpret_decoded_message(self, message: str) -> str:
         interpretations = []
@@ -369,7 +332,10 @@ class CicadaCompleteSolution:
                 "global shipping infrastructure.")
     
     def generate_complete_report(self) -> str:
-        report = f"""# Cicada 3301 Final Puzzle - Complete Solution Demonstration
+        return reporting.render(self.write_complete_report)
+    
+    def write_complete_report(self, report):
+        report += f"""# Cicada 3301 Final Puzzle - Complete Solution Demonstration
 
 **Generated:** {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 **Status:** ✅ COMPLETELY SOLVED
@@ -452,11 +418,13 @@ Decimal values: {self.analysis_results['phase_3']['decimal_values']}
 ### 🎯 PRIMARY RESULT
 **Decoded Message:** `{self.analysis_results['phase_3']['primary_decoded_message']}`
 **ASCII Validity:** {self.analysis_results['phase_3']['primary_validity']:.1f}% (NEAR PERFECT)
+**Language Score:** {self.analysis_results['phase_3']['primary_language_score']:.1f} ({self.analysis_results['phase_3']['primary_language']} n-grams)
 **Confidence:** CRITICAL - This is the intended message
 
 ### Verification Through Secondary Method
 **Secondary Message:** `{self.analysis_results['phase_3']['secondary_decoded_message']}`
 **Secondary Validity:** {self.analysis_results['phase_3']['secondary_validity']:.1f}%
+**Secondary Language Score:** {self.analysis_results['phase_3']['secondary_language_score']:.1f} ({self.analysis_results['phase_3']['secondary_language']} n-grams)
 **Consistency:** Multiple methods confirm the same pattern
 
 ---
@@ -589,8 +557,6 @@ The Cicada 3301 "final puzzle" has been **completely and definitively solved**.
 *This demonstration proves the complete solution of the Cicada 3301 final puzzle through systematic cryptanalytic methodology.*
 *Generated by automated analysis system - {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*
 """
-        
-        return report
     
     def run_complete_demonstration(self):
         print("🏆 CICADA 3301 FINAL PUZZLE - COMPLETE SOLUTION DEMONSTRATION")
@@ -599,27 +565,26 @@ The Cicada 3301 "final puzzle" has been **completely and definitively solved**.
         print(f"Length: {len(self.original_number)} digits")
         print("=" * 80)
         
-        self.phase_1_basic_analysis()
+        self.run_phase(self.phase_1_basic_analysis)
         print()
         
-        self.phase_2_pattern_recognition()
+        self.run_phase(self.phase_2_pattern_recognition)
         print()
         
-        self.phase_3_breakthrough_method()
+        self.run_phase(self.phase_3_breakthrough_method)
         print()
         
-        self.phase_4_hex_analysis()
+        self.run_phase(self.phase_4_hex_analysis)
         print()
         
-        self.phase_5_interpretation()
+        self.run_phase(self.phase_5_interpretation)
         print()
         
         print("📄 Generating complete demonstration report...")
-        report = self.generate_complete_report()
-        
         filename = f"cicada_complete_solution_demo_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(report)
+        with reporting.ReportWriter(filename, compress=self.compress_report) as report:
+            self.write_complete_report(report)
+        filename = report.path
         
         print("=" * 80)
         print("🎯 DEMONSTRATION COMPLETE")
@@ -636,11 +601,15 @@ The Cicada 3301 "final puzzle" has been **completely and definitively solved**.
         
         return filename
 
-if __name__ == "__main__":
+def main():
     solver = CicadaCompleteSolution()
     report_file = solver.run_complete_demonstration()
     
     print(f"\n🎉 SUCCESS!")
     print(f"Complete solution demonstration generated: {report_file}")
     print(f"This file contains proof of the complete solution from start to finish.")
-    print(f"\nTo verify: python3 {__file__}")
\ No newline at end of file
+    print(f"\nTo verify: python3 {__file__}")
+    return report_file
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
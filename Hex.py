@@ -1,14 +1,27 @@
 #!/usr/bin/env python3
 
+import os
+import mmap
+import argparse
 import datetime
+import pathlib
 import json
-from typing import List, Dict, Tuple, Any
+from typing import List, Dict, Tuple, Any, Union
+
+import numpy as np
+
+import geocoder
+import reporting
+import timestamps
+
+HEX_STRING = "4e58595e0620203263233e2347"
 
 class CicadaHexProcessor:
     
-    def __init__(self):
-        self.hex_string = "4e58595e0620203263233e2347"
-        self.decimal_bytes = []
+    def __init__(self, source: Union[str, bytes, bytearray, memoryview, os.PathLike] = HEX_STRING):
+        self.compress_report = False
+        self.mapping = None
+        self.decimal_bytes = self.load_source(source)
         self.results = {
             'layer_1_ascii': '',
             'layer_2_timestamps': [],
@@ -17,11 +30,26 @@ class CicadaHexProcessor:
             'layer_5_mathematics': {}
         }
         
+    def load_source(self, source) -> memoryview:
+        # Hex text is decoded once; bytes and mapped files are used in place, so no layer copies the input
+        if isinstance(source, os.PathLike):
+            with open(source, 'rb') as handle:
+                if os.fstat(handle.fileno()).st_size == 0:
+                    return memoryview(b'')
+                self.mapping = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            return memoryview(self.mapping)
+        if isinstance(source, str):
+            return memoryview(bytes.fromhex(source))
+        return memoryview(source).cast('B')
+    
+    @property
+    def hex_string(self) -> str:
+        return self.decimal_bytes.hex()
+    
     def convert_hex_to_bytes(self):
-        self.decimal_bytes = [int(self.hex_string[i:i+2], 16) for i in range(0, len(self.hex_string), 2)]
         print(f"📊 Hex to Decimal Conversion:")
         print(f"   Hex: {self.hex_string}")
-        print(f"   Decimal bytes: {self.decimal_bytes}")
+        print(f"   Decimal bytes: {self.decimal_bytes.tolist()}")
         print(f"   Total bytes: {len(self.decimal_bytes)}")
         
     def process_layer_1_ascii(self):
@@ -82,38 +110,18 @@ class CicadaHexProcessor:
     def process_layer_2_timestamps(self):
         print(f"\n⏰ LAYER 2: EMBEDDED TIMESTAMPS")
         
-        timestamps = []
-        
-        for timestamp_length in [8, 10]:
-            for i in range(len(self.hex_string) - timestamp_length + 1):
-                timestamp_hex = self.hex_string[i:i + timestamp_length]
-                
-                try:
-                    timestamp_decimal = int(timestamp_hex, 16)
-                    
-                    if 946684800 <= timestamp_decimal <= 1893456000:
-                        dt = datetime.datetime.fromtimestamp(timestamp_decimal)
-                        
-                        timestamps.append({
-                            'hex': timestamp_hex,
-                            'decimal': timestamp_decimal,
-                            'datetime': dt.strftime('%Y-%m-%d %H:%M:%S UTC'),
-                            'position': i,
-                            'length': timestamp_length,
-                            'year': dt.year
-                        })
-                except (ValueError, OSError):
-                    continue
-        
+        found = timestamps.scan_timestamps(self.decimal_bytes, widths=(32, 40), byteorders=('big',), epochs=('unix',),
+                                           low=946684800, high=1893456000, nibble_aligned=True)
         unique_timestamps = []
-        seen_decimals = set()
-        
-        for ts in timestamps:
-            if ts['decimal'] not in seen_decimals:
-                unique_timestamps.append(ts)
-                seen_decimals.add(ts['decimal'])
-                
-        unique_timestamps.sort(key=lambda x: x['decimal'])
+        for ts in found.unique()[:]:
+            unique_timestamps.append({
+                'hex': ts['hex'],
+                'decimal': ts['raw'],
+                'datetime': f"{ts['datetime']} UTC",
+                'position': ts['position'],
+                'length': ts['width'] // 4,
+                'year': ts['year']
+            })
         
         self.results['layer_2_timestamps'] = unique_timestamps
         
@@ -135,86 +143,90 @@ class CicadaHexProcessor:
     def process_layer_3_coordinates(self):
         print(f"\n🌍 LAYER 3: GEOGRAPHIC COORDINATES")
         
-        coordinates = []
-        
-        for i in range(0, len(self.hex_string) - 7, 4):
-            lat_hex = self.hex_string[i:i+4]
-            lon_hex = self.hex_string[i+4:i+8] if i+8 <= len(self.hex_string) else None
-            
-            if not lon_hex:
-                continue
-                
-            try:
-                lat_val = int(lat_hex, 16)
-                lon_val = int(lon_hex, 16)
-                
-                for lat_decimal_pos in [1, 2]:
-                    for lon_decimal_pos in [1, 2, 3]:
-                        lat_str = str(lat_val)
-                        lon_str = str(lon_val)
-                        
-                        if len(lat_str) > lat_decimal_pos and len(lon_str) > lon_decimal_pos:
-                            lat = float(lat_str[:lat_decimal_pos] + '.' + lat_str[lat_decimal_pos:])
-                            lon = float(lon_str[:lon_decimal_pos] + '.' + lon_str[lon_decimal_pos:])
-                            
-                            if -90 <= lat <= 90 and -180 <= lon <= 180:
-                                location_info = self.analyze_coordinate_location(lat, lon)
-                                
-                                coordinates.append({
-                                    'latitude': lat,
-                                    'longitude': lon,
-                                    'lat_hex': lat_hex,
-                                    'lon_hex': lon_hex,
-                                    'position': i,
-                                    'format': f"{lat_decimal_pos}.{len(lat_str)-lat_decimal_pos}°, {lon_decimal_pos}.{len(lon_str)-lon_decimal_pos}°",
-                                    'location': location_info
-                                })
-            except ValueError:
-                continue
+        lat_positions, lon_positions = [1, 2], [1, 2, 3]
+        data = np.frombuffer(self.decimal_bytes, dtype=np.uint8)
+        pair_count = len(range(0, len(data) - 3, 2))
+        span = data[:2 * pair_count + 2] if pair_count else data[:0]
+        words = (span[0::2].astype(np.int64) << 8) | span[1::2]
+        
+        # Splits depend only on the 16-bit value, so each distinct word is converted once
+        distinct, inverse = np.unique(words, return_inverse=True)
+        lat_splits = [self.split_coordinate_value(value, lat_positions, 90) for value in distinct.tolist()]
+        lon_splits = [self.split_coordinate_value(value, lon_positions, 180) for value in distinct.tolist()]
+        lat_keys = np.array([[round(split[0], 3) if split else np.nan for split in splits] for splits in lat_splits],
+                            dtype=np.float64).reshape(-1, len(lat_positions))
+        lon_keys = np.array([[round(split[0], 3) if split else np.nan for split in splits] for splits in lon_splits],
+                            dtype=np.float64).reshape(-1, len(lon_positions))
+        
+        # Candidates flatten in the scan order: pair position, then latitude split, then longitude split
+        shape = (pair_count, len(lat_positions), len(lon_positions))
+        lat_grid = np.broadcast_to(lat_keys[inverse[:-1]][:, :, None], shape).ravel()
+        lon_grid = np.broadcast_to(lon_keys[inverse[1:]][:, None, :], shape).ravel()
+        candidates = np.flatnonzero(~np.isnan(lat_grid) & ~np.isnan(lon_grid))
+        
+        # Keys are already rounded to 3 decimals, so whole thousandths identify them exactly
+        lat_codes = np.rint(lat_grid[candidates] * 1000).astype(np.int64)
+        lon_codes = np.rint(lon_grid[candidates] * 1000).astype(np.int64)
+        codes = lat_codes * 1000000 + lon_codes
+        unique_keys, first_seen = np.unique(codes, return_index=True)
         
         unique_coords = []
-        seen_coords = set()
-        
-        for coord in coordinates:
-            coord_key = (round(coord['latitude'], 3), round(coord['longitude'], 3))
-            if coord_key not in seen_coords:
-                unique_coords.append(coord)
-                seen_coords.add(coord_key)
-        
-        self.results['layer_3_coordinates'] = unique_coords[:5]
-        
-        print(f"   Found {len(unique_coords)} valid coordinate pairs:")
-        for i, coord in enumerate(unique_coords[:5]):
+        for index in np.sort(candidates[first_seen])[:5].tolist():
+            pair, split = divmod(index, len(lat_positions) * len(lon_positions))
+            lat_index, lon_index = divmod(split, len(lon_positions))
+            lat_val, lon_val = int(words[pair]), int(words[pair + 1])
+            lat, lat_format = lat_splits[inverse[pair]][lat_index]
+            lon, lon_format = lon_splits[inverse[pair + 1]][lon_index]
+            
+            unique_coords.append({
+                'latitude': lat,
+                'longitude': lon,
+                'lat_hex': f"{lat_val:04x}",
+                'lon_hex': f"{lon_val:04x}",
+                'position': 4 * pair,
+                'format': f"{lat_format}°, {lon_format}°"
+            })
+        
+        # Labelled in one batch so the place index is searched once for all records
+        locations = geocoder.reverse([(coord['latitude'], coord['longitude']) for coord in unique_coords])
+        for coord, label in zip(unique_coords, locations.labels()):
+            coord['location'] = label
+        
+        self.results['layer_3_coordinates'] = unique_coords
+        
+        print(f"   Found {len(unique_keys)} valid coordinate pairs:")
+        for i, coord in enumerate(unique_coords):
             print(f"     {i+1}. {coord['latitude']:8.4f}°N, {coord['longitude']:8.4f}°E")
             print(f"        Hex: {coord['lat_hex']}/{coord['lon_hex']} | {coord['location']}")
             
+    def split_coordinate_value(self, value: int, decimal_positions: List[int], limit: int) -> List[Tuple[float, str]]:
+        # One entry per decimal position, None where the split is too short or out of range
+        digits = str(value)
+        splits = []
+        for decimal_pos in decimal_positions:
+            degrees = float(digits[:decimal_pos] + '.' + digits[decimal_pos:]) if len(digits) > decimal_pos else None
+            if degrees is not None and -limit <= degrees <= limit:
+                splits.append((degrees, f"{decimal_pos}.{len(digits)-decimal_pos}"))
+            else:
+                splits.append(None)
+        return splits
+    
     def analyze_coordinate_location(self, lat: float, lon: float) -> str:
-        if 10 <= lat <= 30 and 35 <= lon <= 65:
-            return "Arabian Peninsula region"
-        elif 0 <= lat <= 25 and 60 <= lon <= 100:
-            return "Indian Ocean region"
-        elif -35 <= lat <= 35 and -20 <= lon <= 55:
-            return "African continent"
-        elif 35 <= lat <= 70 and -10 <= lon <= 40:
-            return "European region"
-        elif -60 <= lat <= 60 and 100 <= lon <= 180:
-            return "Pacific Ocean region"
-        else:
-            return "Open ocean/remote location"
+        return geocoder.describe(lat, lon)['label']
             
     def process_layer_4_colors(self):
         print(f"\n🎨 LAYER 4: COLOR CODES")
         
         colors = []
         
-        for i in range(0, len(self.hex_string) - 5, 6):
-            color_hex = self.hex_string[i:i+6]
+        data = self.decimal_bytes
+        for start in range(0, len(data) - 2, 3):
+            i = 2 * start
+            color_hex = data[start:start+3].hex()
             
             if len(color_hex) == 6:
                 try:
-                    r = int(color_hex[0:2], 16)
-                    g = int(color_hex[2:4], 16)
-                    b = int(color_hex[4:6], 16)
+                    r, g, b = data[start:start+3]
                     
                     color_name = self.get_color_name(r, g, b)
                     
@@ -268,7 +280,7 @@ class CicadaHexProcessor:
         byte_sum = sum(self.decimal_bytes)
         digital_root = self.calculate_digital_root(byte_sum)
         
-        binary_repr = ''.join([f"{val:08b}" for val in self.decimal_bytes])
+        binary_repr = f"{int.from_bytes(self.decimal_bytes, 'big'):0{8 * len(self.decimal_bytes)}b}" if self.decimal_bytes else ''
         ones_count = binary_repr.count('1')
         zeros_count = binary_repr.count('0')
         
@@ -343,7 +355,10 @@ class CicadaHexProcessor:
         return patterns
     
     def generate_comprehensive_report(self) -> str:
-        report = f"""# Cicada 3301 Hex Layer Analysis Report
+        return reporting.render(self.write_comprehensive_report)
+    
+    def write_comprehensive_report(self, report):
+        report += f"""# Cicada 3301 Hex Layer Analysis Report
 
 **Generated:** {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 **Hex String:** `{self.hex_string}`
@@ -474,7 +489,7 @@ Multi-format encoding includes:
 
 ### Decimal Bytes
 ```
-{self.decimal_bytes}
+{self.decimal_bytes.tolist()}
 ```
 
 ### Binary Representation
@@ -492,8 +507,6 @@ Multi-format encoding includes:
 
 *Generated by Cicada Hex Layer Processor - {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*
 """
-        
-        return report
     
     def run_complete_analysis(self):
         print("🔧 CICADA 3301 HEX LAYER PROCESSOR")
@@ -508,11 +521,10 @@ Multi-format encoding includes:
         self.process_layer_5_mathematics()
         
         print(f"\n📄 Generating comprehensive analysis report...")
-        report = self.generate_comprehensive_report()
-        
         filename = f"cicada_hex_analysis_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(report)
+        with reporting.ReportWriter(filename, compress=self.compress_report) as report:
+            self.write_comprehensive_report(report)
+        filename = report.path
         
         print("=" * 60)
         print("🎯 HEX LAYER ANALYSIS COMPLETE")
@@ -529,10 +541,27 @@ Multi-format encoding includes:
         
         return filename
 
-if __name__ == "__main__":
-    processor = CicadaHexProcessor()
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Cicada 3301 five-layer hex processor")
+    parser.add_argument("hex", nargs="?", default=HEX_STRING, help="Hex text to analyze (default: the extracted Cicada hex)")
+    parser.add_argument("--file", default=None, help="Binary file to analyze in place through a memory map")
+    parser.add_argument("--hex-file", default=None, help="Text file holding hex digits")
+    args = parser.parse_args(argv)
+    
+    if args.file:
+        source = pathlib.Path(args.file)
+    elif args.hex_file:
+        source = pathlib.Path(args.hex_file).read_text(encoding='ascii')
+    else:
+        source = args.hex
+    
+    processor = CicadaHexProcessor(source)
     report_file = processor.run_complete_analysis()
     
     print(f"\n🎉 Hex analysis complete!")
     print(f"Detailed report: {report_file}")
-    print(f"\nTo run: python3 {__file__}")
\ No newline at end of file
+    print(f"\nTo run: python3 {__file__}")
+    return report_file
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
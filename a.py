@@ -1,20 +1,44 @@
 #!/usr/bin/env python3
 
 import os
+import io
+import sys
+import argparse
+import contextlib
 import hashlib
 import base64
-import json
 from datetime import datetime
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 import itertools
 import math
-import requests
-from typing import List, Dict, Tuple, Any
+from typing import Dict, List, Tuple, Any
+
+import primes
+from cache import ResultCache
+from palindromes import PalindromeIndex
+from repeats import RepeatIndex
+from results import ResultStore
+
+ANALYSIS_METHODS = [
+    ("Basic Analysis", "basic_analysis"),
+    ("Pattern Analysis", "find_patterns"),
+    ("Coordinate Analysis", "coordinate_analysis"),
+    ("ASCII Analysis", "ascii_analysis"),
+    ("Book Cipher Analysis", "book_cipher_analysis"),
+    ("Gematria Analysis", "gematria_analysis"),
+    ("Cryptographic Analysis", "cryptographic_analysis"),
+    ("Advanced Pattern Analysis", "advanced_pattern_analysis"),
+    ("Steganography Analysis", "steganography_analysis")
+]
+
+CICADA_NUMBER = "10412790658919985359827898739594318956404425106955675643739226952372682423852959081739834390370374475764863415203423499357108713631"
 
 class CicadaSolver:
-    def __init__(self):
-        self.cicada_number = "10412790658919985359827898739594318956404425106955675643739226952372682423852959081739834390370374475764863415203423499357108713631"
-        self.results = []
+    def __init__(self, cicada_number: str = CICADA_NUMBER, result_cache: ResultCache = None):
+        self.cicada_number = cicada_number
+        self.result_cache = ResultCache() if result_cache is None else result_cache
+        self.results = ResultStore(fields=('timestamp', 'method', 'result', 'confidence'))
         self.workspace_dir = Path("/workspace/cicada_analysis")
         self.workspace_dir.mkdir(exist_ok=True)
         
@@ -35,13 +59,7 @@ class CicadaSolver:
         ]
         
     def log_result(self, method: str, result: Any, confidence: str = "LOW"):
-        entry = {
-            "timestamp": datetime.now().isoformat(),
-            "method": method,
-            "result": str(result),
-            "confidence": confidence
-        }
-        self.results.append(entry)
+        self.results.add(None, method, result, confidence)
         print(f"[{confidence}] {method}: {result}")
     
     def basic_analysis(self):
@@ -213,9 +231,8 @@ class CicadaSolver:
             self.log_result("Fibonacci Patterns", fib_patterns, "HIGH")
         
         prime_positions = []
-        for i, digit in enumerate(self.cicada_number):
-            if self.is_prime(i + 1):
-                prime_positions.append((i + 1, digit))
+        for i in primes.prime_indices(len(self.cicada_number)).tolist():
+            prime_positions.append((i + 1, self.cicada_number[i]))
         
         prime_digits = ''.join([pair[1] for pair in prime_positions[:20]])
         self.log_result("Digits at Prime Positions (first 20)", prime_digits, "MEDIUM")
@@ -237,12 +254,7 @@ class CicadaSolver:
         self.log_result("Even/Odd Ratio", f"{even_sum}/{odd_sum} = {even_sum/odd_sum:.4f}", "MEDIUM")
     
     def is_prime(self, n):
-        if n < 2:
-            return False
-        for i in range(2, int(n**0.5) + 1):
-            if n % i == 0:
-                return False
-        return True
+        return primes.is_prime(n)
     
     def calculate_digital_root(self, n):
         while n >= 10:
@@ -251,23 +263,16 @@ class CicadaSolver:
     
     def find_palindromes(self, text, min_length=3):
         palindromes = []
-        for length in range(min_length, min(11, len(text) + 1)):
-            for i in range(len(text) - length + 1):
-                substr = text[i:i + length]
-                if substr == substr[::-1]:
-                    palindromes.append({"text": substr, "position": i, "length": length})
+        for substr, i, length in PalindromeIndex(text).occurrences(min_length, 10):
+            palindromes.append({"text": substr, "position": i, "length": length})
         return palindromes
     
     def find_repeating_patterns(self, text, min_length=2, max_length=10):
-        patterns = {}
-        for length in range(min_length, min(max_length + 1, len(text))):
-            for i in range(len(text) - length + 1):
-                pattern = text[i:i + length]
-                if pattern not in patterns:
-                    patterns[pattern] = []
-                patterns[pattern].append(i)
-        
-        return {k: v for k, v in patterns.items() if len(v) > 1}
+        max_length = min(max_length, len(text) - 1)
+        if max_length < min_length:
+            return {}
+        
+        return RepeatIndex(text, max_length=max_length).repeats(min_length, max_length)
     
     def caesar_cipher(self, text, shift):
         result = ""
@@ -325,9 +330,8 @@ class CicadaSolver:
             
             for confidence in ["HIGH", "MEDIUM", "LOW"]:
                 f.write(f"### {confidence} Confidence Results\n\n")
-                for result in self.results:
-                    if result["confidence"] == confidence:
-                        f.write(f"**{result['method']}:** {result['result']}\n\n")
+                for result in self.results.select(confidence=confidence):
+                    f.write(f"**{result['method']}:** {result['result']}\n\n")
             
             f.write("## Summary of Key Findings\n\n")
             
@@ -350,37 +354,66 @@ class CicadaSolver:
             f.write("4. Analyze the pattern '739' in context of Cicada mythology\n")
             f.write("5. Apply steganographic techniques to the digit sequences\n")
             
-            f.write(f"\n## Raw Results JSON\n\n```json\n{json.dumps(self.results, indent=2)}\n```\n")
+            f.write(f"\n## Raw Results JSON\n\n```json\n{self.results.to_json(indent=2)}\n```\n")
         
         print(f"Report generated: {report_path}")
+        return report_path
+    
+    def cache_params(self) -> Dict[str, Any]:
+        return {
+            'cicada_constants': self.cicada_constants,
+            'known_phrases': self.known_phrases,
+            'workspace_dir': str(self.workspace_dir)
+        }
+    
+    def run_method(self, method_name: str, attribute: str):
+        try:
+            self.result_cache.run(self.cicada_number, getattr(self, attribute), state=('results',))
+        except Exception as e:
+            self.log_result(f"{method_name} Error", str(e), "LOW")
+    
+    def run_methods_parallel(self, workers: int = None) -> List[Tuple[ResultStore, str]]:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(run_analysis_method, self.cicada_number, self.result_cache, method_name, attribute)
+                       for method_name, attribute in ANALYSIS_METHODS]
+            return [future.result() for future in futures]
     
-    def run_complete_analysis(self):
+    def run_complete_analysis(self, parallel: bool = False, workers: int = None):
         print("Starting Cicada 3301 Final Puzzle Analysis...")
         print(f"Working directory: {self.workspace_dir}")
         
-        analysis_methods = [
-            ("Basic Analysis", self.basic_analysis),
-            ("Pattern Analysis", self.find_patterns),
-            ("Coordinate Analysis", self.coordinate_analysis),
-            ("ASCII Analysis", self.ascii_analysis),
-            ("Book Cipher Analysis", self.book_cipher_analysis),
-            ("Gematria Analysis", self.gematria_analysis),
-            ("Cryptographic Analysis", self.cryptographic_analysis),
-            ("Advanced Pattern Analysis", self.advanced_pattern_analysis),
-            ("Steganography Analysis", self.steganography_analysis)
-        ]
-        
-        for method_name, method in analysis_methods:
-            print(f"\n--- Running {method_name} ---")
-            try:
-                method()
-            except Exception as e:
-                self.log_result(f"{method_name} Error", str(e), "LOW")
+        if parallel:
+            # Workers return their entries and console output; merging in method order keeps the report deterministic
+            for (method_name, _), (results, output) in zip(ANALYSIS_METHODS, self.run_methods_parallel(workers)):
+                print(f"\n--- Running {method_name} ---")
+                sys.stdout.write(output)
+                self.results.extend(results)
+        else:
+            for method_name, attribute in ANALYSIS_METHODS:
+                print(f"\n--- Running {method_name} ---")
+                self.run_method(method_name, attribute)
         
         print("\n--- Generating Report ---")
-        self.generate_report()
+        report_path = self.generate_report()
         print("Analysis complete!")
+        return report_path
 
-if __name__ == "__main__":
+def run_analysis_method(cicada_number: str, result_cache: ResultCache, method_name: str,
+                        attribute: str) -> Tuple[ResultStore, str]:
+    solver = CicadaSolver(cicada_number, result_cache)
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        solver.run_method(method_name, attribute)
+    return solver.results, output.getvalue()
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Cicada 3301 final puzzle analysis")
+    parser.add_argument("--parallel", action="store_true", help="Run the analysis methods in a process pool")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Worker processes (implies --parallel; default: CPU count)")
+    args = parser.parse_args(argv)
+    
     solver = CicadaSolver()
-    solver.run_complete_analysis()
\ No newline at end of file
+    return solver.run_complete_analysis(parallel=args.parallel or args.workers is not None, workers=args.workers)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
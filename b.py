@@ -8,121 +8,186 @@ from datetime import datetime
 from collections import Counter, defaultdict
 import math
 
+import numpy as np
+
+import coordinates
+import digits
+import keysearch
+import ngrams
+import primes
+import reporting
+import scoring
+from palindromes import PalindromeIndex
+from repeats import RepeatIndex
+from results import ResultStore
+from variants import VariantRegistry
+
 class CicadaAdvancedAnalyzer:
-    def __init__(self, number_string):
+    def __init__(self, number_string, backend="str"):
+        if backend not in ("str", "numpy"):
+            raise ValueError(f"Unknown preprocessing backend: {backend}")
+        
         self.original_number = number_string
-        self.results = []
+        self.backend = backend
+        self.results = ResultStore()
         self.timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
         
         self.key_palindromes = ['78987', '7447', '13631']
+        self.ascii_top_rotations = 3
+        self.coordinate_examples = 3
+        self.language_scorer = ngrams.ENGLISH_SCORER
+        self.key_search_length = 3
+        self.key_search_top = 5
+        self.compress_report = False
         
         self.pattern_739_positions = [26, 56, 83]
         
+        self.variants = None
+        
     def log_finding(self, category, method, result, confidence="MEDIUM"):
-        self.results.append({
-            'category': category,
-            'method': method,
-            'result': str(result),
-            'confidence': confidence
-        })
+        self.results.add(category, method, result, confidence)
     
     def preprocess_data(self):
-        preprocessing_results = {}
+        if self.variants is None:
+            self.variants = VariantRegistry()
+            
+            if self.backend == "numpy":
+                factories = self.array_variant_factories()
+            else:
+                factories = self.string_variant_factories()
+            
+            for name, factory in factories.items():
+                self.variants.register(name, factory)
+            
+            self.log_finding("PREPROCESSING", "Data Preprocessing Methods", f"Generated {len(self.variants)} preprocessed versions", "HIGH")
         
-        preprocessing_results['original'] = self.original_number
+        return self.variants
+    
+    def preprocess_strings(self):
+        return {name: factory() for name, factory in self.string_variant_factories().items()}
+    
+    def preprocess_arrays(self):
+        return {name: factory() for name, factory in self.array_variant_factories().items()}
+    
+    def string_variant_factories(self):
+        number = self.original_number
+        factories = {}
         
-        preprocessing_results['reversed'] = self.original_number[::-1]
+        factories['original'] = lambda: number
         
-        preprocessing_results['no_zeros'] = self.original_number.replace('0', '')
+        factories['reversed'] = lambda: number[::-1]
+        
+        factories['no_zeros'] = lambda: number.replace('0', '')
         
         for n in [2, 3, 5, 7]:
-            preprocessing_results[f'every_{n}th'] = ''.join([self.original_number[i] for i in range(0, len(self.original_number), n)])
+            factories[f'every_{n}th'] = lambda n=n: ''.join([number[i] for i in range(0, len(number), n)])
         
-        prime_positions = []
-        for i in range(1, len(self.original_number) + 1):
-            if self.is_prime(i):
-                prime_positions.append(self.original_number[i-1])
-        preprocessing_results['prime_positions'] = ''.join(prime_positions)
+        factories['prime_positions'] = self.extract_prime_positions
+        
+        factories['fibonacci_positions'] = self.extract_fibonacci_positions
+        
+        factories['palindrome_split'] = lambda: ''.join(number[start:end] for start, end in self.palindrome_split_ranges())
+        
+        factories['xor_739'] = lambda: self.xor_with_key(number, "739")
+        
+        for block_size in [3, 5, 7, 13]:
+            if len(number) >= block_size:
+                factories[f'transpose_{block_size}'] = lambda block_size=block_size: self.transpose_string(number, block_size)
+        
+        for shift in [1, 3, 7, 13]:
+            factories[f'caesar_shift_{shift}'] = lambda shift=shift: ''.join([str((int(d) + shift) % 10) for d in number])
+        
+        return factories
+    
+    def array_variant_factories(self):
+        digit_array = digits.to_digit_array(self.original_number)
+        factories = {}
+        
+        factories['original'] = lambda: digit_array
+        
+        factories['reversed'] = lambda: digit_array[::-1]
+        
+        factories['no_zeros'] = lambda: digit_array[digit_array != 0]
+        
+        for n in [2, 3, 5, 7]:
+            factories[f'every_{n}th'] = lambda n=n: digits.every_nth(digit_array, n)
         
+        factories['prime_positions'] = lambda: digits.prime_positions(digit_array)
+        
+        factories['fibonacci_positions'] = lambda: digits.gather_positions(digit_array, self.generate_fibonacci(len(digit_array)))
+        
+        factories['palindrome_split'] = lambda: digits.concatenate_ranges(digit_array, self.palindrome_split_ranges())
+        
+        factories['xor_739'] = lambda: digits.xor_with_key(digit_array, "739")
+        
+        for block_size in [3, 5, 7, 13]:
+            if len(digit_array) >= block_size:
+                factories[f'transpose_{block_size}'] = lambda block_size=block_size: digits.transpose_blocks(digit_array, block_size)
+        
+        for shift in [1, 3, 7, 13]:
+            factories[f'caesar_shift_{shift}'] = lambda shift=shift: digits.caesar_shift(digit_array, shift)
+        
+        return factories
+    
+    def extract_prime_positions(self):
+        prime_positions = []
+        for i in primes.prime_indices(len(self.original_number)).tolist():
+            prime_positions.append(self.original_number[i])
+        return ''.join(prime_positions)
+    
+    def extract_fibonacci_positions(self):
         fib_positions = []
         fib_sequence = self.generate_fibonacci(len(self.original_number))
         for pos in fib_sequence:
             if pos <= len(self.original_number):
                 fib_positions.append(self.original_number[pos-1])
-        preprocessing_results['fibonacci_positions'] = ''.join(fib_positions)
-        
-        parts = []
+        return ''.join(fib_positions)
+    
+    def transpose_string(self, data, block_size):
+        blocks = [data[i:i+block_size] for i in range(0, len(data), block_size)]
+        transposed = []
+        max_len = max(len(block) for block in blocks)
+        for i in range(max_len):
+            for block in blocks:
+                if i < len(block):
+                    transposed.append(block[i])
+        return ''.join(transposed)
+    
+    def palindrome_split_ranges(self):
+        ranges = []
         last_end = 0
         for palindrome in self.key_palindromes:
             pos = self.original_number.find(palindrome)
             if pos != -1:
                 if pos > last_end:
-                    parts.append(self.original_number[last_end:pos])
-                parts.append(palindrome)
+                    ranges.append((last_end, pos))
+                ranges.append((pos, pos + len(palindrome)))
                 last_end = pos + len(palindrome)
         if last_end < len(self.original_number):
-            parts.append(self.original_number[last_end:])
-        preprocessing_results['palindrome_split'] = ''.join(parts)
-        
-        xor_result = []
-        pattern = "739"
-        for i, digit in enumerate(self.original_number):
-            xor_digit = int(digit) ^ int(pattern[i % len(pattern)])
-            xor_result.append(str(xor_digit))
-        preprocessing_results['xor_739'] = ''.join(xor_result)
-        
-        for block_size in [3, 5, 7, 13]:
-            if len(self.original_number) >= block_size:
-                blocks = [self.original_number[i:i+block_size] for i in range(0, len(self.original_number), block_size)]
-                transposed = []
-                max_len = max(len(block) for block in blocks)
-                for i in range(max_len):
-                    for block in blocks:
-                        if i < len(block):
-                            transposed.append(block[i])
-                preprocessing_results[f'transpose_{block_size}'] = ''.join(transposed)
-        
-        for shift in [1, 3, 7, 13]:
-            shifted = ''.join([str((int(d) + shift) % 10) for d in self.original_number])
-            preprocessing_results[f'caesar_shift_{shift}'] = shifted
-        
-        self.log_finding("PREPROCESSING", "Data Preprocessing Methods", f"Generated {len(preprocessing_results)} preprocessed versions", "HIGH")
-        
-        return preprocessing_results
+            ranges.append((last_end, len(self.original_number)))
+        return ranges
     
     def comprehensive_ascii_analysis(self, data_variants):
+        data_variants = VariantRegistry.from_mapping(data_variants)
         ascii_results = {}
+        variant_labels = {}
         
-        for variant_name, data in data_variants.items():
+        for variant_name, data, names in data_variants.unique_items():
             variant_results = {}
+            digit_array = data_variants.array(variant_name)
             
             for group_size in [2, 3]:
-                ascii_text = ""
-                valid_chars = 0
-                total_groups = 0
-                
-                for i in range(0, len(data) - group_size + 1, group_size):
-                    group = data[i:i + group_size]
-                    if len(group) == group_size:
-                        try:
-                            ascii_val = int(group)
-                            total_groups += 1
-                            if 32 <= ascii_val <= 126:
-                                ascii_text += chr(ascii_val)
-                                valid_chars += 1
-                            elif 1 <= ascii_val <= 31:
-                                ascii_text += f"[{ascii_val}]"
-                            else:
-                                ascii_text += "?"
-                        except ValueError:
-                            ascii_text += "?"
-                            total_groups += 1
+                valid_counts, total_groups = scoring.rotation_counts(digit_array, group_size)
+                valid_chars = int(valid_counts[0]) if total_groups > 0 else 0
+                language = float(self.language_scorer.score_rotations(digit_array, group_size)[0]) if total_groups > 0 else 0
+                ascii_text = scoring.render(digit_array, group_size, control_markers=True)
                 
                 validity_percent = (valid_chars / total_groups * 100) if total_groups > 0 else 0
                 
                 variant_results[f'group_{group_size}'] = {
                     'text': ascii_text,
                     'validity': validity_percent,
+                    'language': language,
                     'valid_chars': valid_chars,
                     'total_groups': total_groups
                 }
@@ -134,113 +199,125 @@ class CicadaAdvancedAnalyzer:
                     patterns = self.find_ascii_patterns(ascii_text)
                     variant_results[f'group_{group_size}']['patterns'] = patterns
             
-            for start_pos in range(min(5, len(data))):
-                shifted_data = data[start_pos:] + data[:start_pos]
-                for group_size in [2, 3]:
-                    ascii_text = ""
-                    valid_chars = 0
-                    total_groups = 0
-                    
-                    for i in range(0, len(shifted_data) - group_size + 1, group_size):
-                        group = shifted_data[i:i + group_size]
-                        if len(group) == group_size:
-                            try:
-                                ascii_val = int(group)
-                                total_groups += 1
-                                if 32 <= ascii_val <= 126:
-                                    ascii_text += chr(ascii_val)
-                                    valid_chars += 1
-                                else:
-                                    ascii_text += "?"
-                            except ValueError:
-                                ascii_text += "?"
-                                total_groups += 1
-                    
-                    validity_percent = (valid_chars / total_groups * 100) if total_groups > 0 else 0
-                    
-                    if validity_percent > 40:
-                        variant_results[f'shift_{start_pos}_group_{group_size}'] = {
-                            'text': ascii_text,
-                            'validity': validity_percent,
-                            'valid_chars': valid_chars,
-                            'total_groups': total_groups
-                        }
+            for candidate in scoring.top_rotations(digit_array, [2, 3], 40, limit=self.ascii_top_rotations, always=5,
+                                                   ranker=self.language_scorer):
+                start_pos, group_size = candidate['rotation'], candidate['group_size']
+                variant_results[f'shift_{start_pos}_group_{group_size}'] = {
+                    'text': scoring.render(digit_array, group_size, start_pos),
+                    'validity': candidate['valid_chars'] / candidate['total_groups'] * 100,
+                    'language': candidate[self.language_scorer.name],
+                    'valid_chars': candidate['valid_chars'],
+                    'total_groups': candidate['total_groups']
+                }
             
-            ascii_results[variant_name] = variant_results
+            for name in names:
+                ascii_results[name] = variant_results
+            variant_labels[variant_name] = data_variants.label(names)
         
         best_candidates = []
-        for variant_name, variant_data in ascii_results.items():
-            for method, result in variant_data.items():
+        for variant_name, label in variant_labels.items():
+            for method, result in ascii_results[variant_name].items():
                 if isinstance(result, dict) and 'validity' in result:
                     if result['validity'] > 50:
                         best_candidates.append({
-                            'variant': variant_name,
+                            'variant': label,
                             'method': method,
                             'text': result['text'],
-                            'validity': result['validity']
+                            'validity': result['validity'],
+                            'language': result['language']
                         })
         
-        best_candidates.sort(key=lambda x: x['validity'], reverse=True)
+        best_candidates.sort(key=lambda x: (x['language'], x['validity']), reverse=True)
         
-        self.log_finding("ASCII", "Comprehensive ASCII Analysis", f"Analyzed {len(data_variants)} variants with {len(best_candidates)} high-validity candidates", "HIGH")
+        self.log_finding("ASCII", "Comprehensive ASCII Analysis", f"Analyzed {len(data_variants)} variants ({len(variant_labels)} unique) with {len(best_candidates)} high-validity candidates", "HIGH")
         
         for i, candidate in enumerate(best_candidates[:10]):
             self.log_finding("ASCII", f"Top ASCII Candidate #{i+1}", 
-                            f"Variant: {candidate['variant']}, Method: {candidate['method']}, Validity: {candidate['validity']:.1f}%, Text: {candidate['text'][:100]}{'...' if len(candidate['text']) > 100 else ''}", 
+                            f"Variant: {candidate['variant']}, Method: {candidate['method']}, Validity: {candidate['validity']:.1f}%, Language: {candidate['language']:.1f}, Text: {candidate['text'][:100]}{'...' if len(candidate['text']) > 100 else ''}", 
                             "HIGH" if candidate['validity'] > 70 else "MEDIUM")
         
         return ascii_results, best_candidates
     
     def palindrome_key_analysis(self, data_variants):
+        data_variants = VariantRegistry.from_mapping(data_variants)
         palindrome_results = {}
         
         for palindrome in self.key_palindromes:
             palindrome_results[palindrome] = {}
             
-            for variant_name, data in data_variants.items():
+            for variant_name, data, names in data_variants.unique_items():
+                label = data_variants.label(names)
                 xor_result = self.xor_with_key(data, palindrome)
-                palindrome_results[palindrome][f'xor_{variant_name}'] = xor_result
+                for name in names:
+                    palindrome_results[palindrome][f'xor_{name}'] = xor_result
                 
                 ascii_validity = self.calculate_ascii_validity(xor_result)
                 if ascii_validity > 40:
-                    self.log_finding("PALINDROME_KEY", f"Palindrome {palindrome} XOR with {variant_name}", 
+                    self.log_finding("PALINDROME_KEY", f"Palindrome {palindrome} XOR with {label}", 
                                    f"ASCII validity: {ascii_validity:.1f}%, Result: {xor_result[:50]}{'...' if len(xor_result) > 50 else ''}", 
                                    "HIGH" if ascii_validity > 60 else "MEDIUM")
             
             shift_value = sum(int(d) for d in palindrome) % 26
-            for variant_name, data in data_variants.items():
+            for variant_name, data, names in data_variants.unique_items():
+                label = data_variants.label(names)
                 letter_data = self.digits_to_letters(data)
                 if letter_data:
                     shifted = self.caesar_shift(letter_data, shift_value)
-                    palindrome_results[palindrome][f'caesar_{variant_name}'] = shifted
+                    for name in names:
+                        palindrome_results[palindrome][f'caesar_{name}'] = shifted
                     
                     if len(shifted) > 10:
-                        self.log_finding("PALINDROME_KEY", f"Palindrome {palindrome} Caesar shift ({shift_value}) on {variant_name}", 
+                        self.log_finding("PALINDROME_KEY", f"Palindrome {palindrome} Caesar shift ({shift_value}) on {label}", 
                                        f"Result: {shifted[:100]}{'...' if len(shifted) > 100 else ''}", "MEDIUM")
             
             mod_value = int(palindrome) % 1000
-            for variant_name, data in data_variants.items():
-                mod_result = []
-                for i, digit in enumerate(data):
-                    try:
-                        new_digit = (int(digit) + (mod_value >> (i % 10))) % 10
-                        mod_result.append(str(new_digit))
-                    except:
-                        mod_result.append(digit)
-                mod_result_str = ''.join(mod_result)
-                palindrome_results[palindrome][f'mod_{variant_name}'] = mod_result_str
+            for variant_name, data, names in data_variants.unique_items():
+                label = data_variants.label(names)
+                mod_result_str = self.shift_by_position(data, mod_value)
+                for name in names:
+                    palindrome_results[palindrome][f'mod_{name}'] = mod_result_str
                 
                 ascii_validity = self.calculate_ascii_validity(mod_result_str)
                 if ascii_validity > 30:
-                    self.log_finding("PALINDROME_KEY", f"Palindrome {palindrome} modular operation on {variant_name}", 
+                    self.log_finding("PALINDROME_KEY", f"Palindrome {palindrome} modular operation on {label}", 
                                    f"ASCII validity: {ascii_validity:.1f}%, Result: {mod_result_str[:50]}{'...' if len(mod_result_str) > 50 else ''}", "MEDIUM")
         
         return palindrome_results
     
+    def shift_by_position(self, data, mod_value):
+        # Digit i gains mod_value >> (i % 10); characters that are not digits pass through
+        values, invalid = scoring.as_digit_array(data)
+        shifted = (values + (mod_value >> (np.arange(len(values)) % 10))) % 10
+        if not invalid.any():
+            return digits.to_digit_string(shifted)
+        return ''.join(char if broken else str(value)
+                       for char, broken, value in zip(data, invalid.tolist(), shifted.tolist()))
+    
+    def key_search_analysis(self, data_variants):
+        data_variants = VariantRegistry.from_mapping(data_variants)
+        names = {variant_name: names for variant_name, _, names in data_variants.unique_items()}
+        variants = {variant_name: data for variant_name, data, _ in data_variants.unique_items()}
+        
+        search = keysearch.KeySearch(self.key_search_length, top_k=self.key_search_top)
+        key_results = search.search(variants)
+        self.log_finding("KEY_SEARCH", "Digit Key Search",
+                       f"Scored {search.evaluated} key/variant/operation combinations, keys up to length {self.key_search_length} under "
+                       f"{', '.join(search.operations)} across {len(variants)} variants", "HIGH")
+        
+        for result in key_results:
+            if result['score'] > 40:
+                label = data_variants.label(names[result['variant']])
+                self.log_finding("KEY_SEARCH", f"{result['operation'].upper()} key {result['key']} on {label}",
+                               f"ASCII validity: {result['score']:.1f}%, Text: {result['text'][:50]}",
+                               "HIGH" if result['score'] > 60 else "MEDIUM")
+        return key_results
+    
     def smart_pattern_analysis(self, data_variants):
+        data_variants = VariantRegistry.from_mapping(data_variants)
         pattern_results = {}
+        variant_labels = {}
         
-        for variant_name, data in data_variants.items():
+        for variant_name, data, names in data_variants.unique_items():
             variant_patterns = {}
             
             digit_freq = Counter(data)
@@ -249,8 +326,10 @@ class CicadaAdvancedAnalyzer:
             sequences = self.find_mathematical_sequences(data)
             variant_patterns['math_sequences'] = sequences
             
-            for pattern_length in range(2, min(15, len(data) // 3)):
-                repeating = self.find_all_repeating_patterns(data, pattern_length)
+            pattern_lengths = range(2, min(15, len(data) // 3))
+            repeat_index = RepeatIndex(data, max_length=pattern_lengths[-1]) if pattern_lengths else None
+            for pattern_length in pattern_lengths:
+                repeating = self.find_all_repeating_patterns(data, pattern_length, repeat_index)
                 if repeating:
                     variant_patterns[f'repeating_{pattern_length}'] = repeating
             
@@ -266,17 +345,19 @@ class CicadaAdvancedAnalyzer:
             stats = self.calculate_statistics(data)
             variant_patterns['statistics'] = stats
             
-            pattern_results[variant_name] = variant_patterns
+            for name in names:
+                pattern_results[name] = variant_patterns
+            variant_labels[variant_name] = data_variants.label(names)
         
         interesting_patterns = []
-        for variant_name, patterns in pattern_results.items():
-            for pattern_type, pattern_data in patterns.items():
+        for variant_name, label in variant_labels.items():
+            for pattern_type, pattern_data in pattern_results[variant_name].items():
                 if pattern_type == 'math_sequences' and pattern_data:
-                    interesting_patterns.append(f"{variant_name}: Found {len(pattern_data)} mathematical sequences")
+                    interesting_patterns.append(f"{label}: Found {len(pattern_data)} mathematical sequences")
                 elif pattern_type.startswith('repeating_') and isinstance(pattern_data, dict) and len(pattern_data) > 2:
-                    interesting_patterns.append(f"{variant_name}: {len(pattern_data)} patterns of length {pattern_type.split('_')[1]}")
+                    interesting_patterns.append(f"{label}: {len(pattern_data)} patterns of length {pattern_type.split('_')[1]}")
                 elif pattern_type == 'symmetries' and pattern_data:
-                    interesting_patterns.append(f"{variant_name}: {len(pattern_data)} symmetries detected")
+                    interesting_patterns.append(f"{label}: {len(pattern_data)} symmetries detected")
         
         for pattern in interesting_patterns:
             self.log_finding("PATTERN", "Interesting Pattern Detection", pattern, "MEDIUM")
@@ -284,63 +365,29 @@ class CicadaAdvancedAnalyzer:
         return pattern_results
     
     def coordinate_analysis(self, data_variants):
+        data_variants = VariantRegistry.from_mapping(data_variants)
         coordinate_results = {}
         
-        for variant_name, data in data_variants.items():
-            coords = []
-            
-            for i in range(0, len(data) - 11):
-                segment = data[i:i+12]
-                
-                formats = [
-                    (6, 6),
-                    (5, 7),
-                    (7, 5),
-                    (4, 8),
-                ]
-                
-                for lat_len, lon_len in formats:
-                    if lat_len + lon_len <= len(segment):
-                        try:
-                            lat_str = segment[:lat_len]
-                            lon_str = segment[lat_len:lat_len + lon_len]
-                            
-                            for lat_decimal in range(1, lat_len):
-                                for lon_decimal in range(1, lon_len):
-                                    lat = float(lat_str[:lat_decimal] + '.' + lat_str[lat_decimal:])
-                                    lon = float(lon_str[:lon_decimal] + '.' + lon_str[lon_decimal:])
-                                    
-                                    if -90 <= lat <= 90 and -180 <= lon <= 180:
-                                        coords.append({
-                                            'lat': lat,
-                                            'lon': lon,
-                                            'position': i,
-                                            'format': f'{lat_len}_{lon_len}',
-                                            'lat_str': lat_str,
-                                            'lon_str': lon_str
-                                        })
-                        except ValueError:
-                            continue
+        for variant_name, data, names in data_variants.unique_items():
+            label = data_variants.label(names)
+            # Only the examples are kept; a long variant can have millions of candidates
+            coords = coordinates.find_coordinates(data, limit=self.coordinate_examples)
             
-            coordinate_results[variant_name] = coords
+            for name in names:
+                coordinate_results[name] = coords
             
-            if coords:
-                self.log_finding("COORDINATES", f"Coordinates in {variant_name}", 
-                               f"Found {len(coords)} potential coordinate pairs", "MEDIUM")
+            if coords.total:
+                self.log_finding("COORDINATES", f"Coordinates in {label}", 
+                               f"Found {coords.total} potential coordinate pairs", "MEDIUM")
                 
-                for coord in coords[:3]:
-                    self.log_finding("COORDINATES", f"Coordinate Example from {variant_name}", 
+                for coord in coords:
+                    self.log_finding("COORDINATES", f"Coordinate Example from {label}", 
                                    f"Lat: {coord['lat']}, Lon: {coord['lon']} at position {coord['position']}", "MEDIUM")
         
         return coordinate_results
     
     def is_prime(self, n):
-        if n < 2:
-            return False
-        for i in range(2, int(n**0.5) + 1):
-            if n % i == 0:
-                return False
-        return True
+        return primes.is_prime(n)
     
     def generate_fibonacci(self, max_val):
         fib = [1, 1]
@@ -349,28 +396,10 @@ class CicadaAdvancedAnalyzer:
         return [f for f in fib if f <= max_val]
     
     def xor_with_key(self, data, key):
-        result = []
-        key_digits = [int(d) for d in key]
-        for i, digit in enumerate(data):
-            try:
-                xor_result = int(digit) ^ key_digits[i % len(key_digits)]
-                result.append(str(xor_result))
-            except ValueError:
-                result.append(digit)
-        return ''.join(result)
+        return keysearch.combine(data, key, 'xor')
     
     def calculate_ascii_validity(self, data):
-        valid = 0
-        total = 0
-        for i in range(0, len(data) - 1, 2):
-            try:
-                ascii_val = int(data[i:i+2])
-                total += 1
-                if 32 <= ascii_val <= 126:
-                    valid += 1
-            except ValueError:
-                total += 1
-        return (valid / total * 100) if total > 0 else 0
+        return scoring.validity(data, 2)
     
     def digits_to_letters(self, data):
         letters = []
@@ -423,22 +452,15 @@ class CicadaAdvancedAnalyzer:
                 continue
         return sequences
     
-    def find_all_repeating_patterns(self, data, length):
-        patterns = {}
-        for i in range(len(data) - length + 1):
-            pattern = data[i:i + length]
-            if pattern not in patterns:
-                patterns[pattern] = []
-            patterns[pattern].append(i)
-        return {k: v for k, v in patterns.items() if len(v) > 1}
+    def find_all_repeating_patterns(self, data, length, repeat_index=None):
+        if repeat_index is None:
+            repeat_index = RepeatIndex(data, max_length=length)
+        return repeat_index.repeats(length, length)
     
     def find_symmetries(self, data):
         symmetries = []
-        for length in range(5, min(20, len(data))):
-            for i in range(len(data) - length + 1):
-                substr = data[i:i + length]
-                if substr == substr[::-1]:
-                    symmetries.append(f"Palindrome: {substr} at position {i}")
+        for substr, i, _ in PalindromeIndex(data).occurrences(5, min(19, len(data) - 1)):
+            symmetries.append(f"Palindrome: {substr} at position {i}")
         return symmetries
     
     def analyze_digit_transitions(self, data):
@@ -489,7 +511,10 @@ class CicadaAdvancedAnalyzer:
         return n
     
     def generate_report(self):
-        report = f"""# Cicada 3301 Advanced Analysis Report
+        return reporting.render(self.write_report)
+    
+    def write_report(self, report):
+        report += f"""# Cicada 3301 Advanced Analysis Report
 
 **Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 **Input Number:** `{self.original_number}`
@@ -511,20 +536,14 @@ This comprehensive analysis applied advanced preprocessing, ASCII decoding, pali
 
 """
         
-        categories = {}
-        for result in self.results:
-            cat = result['category']
-            if cat not in categories:
-                categories[cat] = {'HIGH': [], 'MEDIUM': [], 'LOW': []}
-            categories[cat][result['confidence']].append(result)
-        
-        for category, confidence_levels in categories.items():
+        for category in self.results.category_names():
             report += f"### {category} Analysis\n\n"
             
             for confidence in ['HIGH', 'MEDIUM', 'LOW']:
-                if confidence_levels[confidence]:
+                findings = self.results.select(category, confidence)
+                if findings:
                     report += f"#### {confidence} Confidence Results\n\n"
-                    for result in confidence_levels[confidence]:
+                    for result in findings:
                         report += f"**{result['method']}**  \n{result['result']}\n\n"
             
             report += "---\n\n"
@@ -569,38 +588,57 @@ This comprehensive analysis applied advanced preprocessing, ASCII decoding, pali
             report += f"- **Occurrence {i}**: Position {pos}\n"
         
         report += f"\n---\n\n*Analysis completed at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*\n"
-        
-        return report
     
-    def run_complete_analysis(self):
-        print("🔍 Starting Cicada 3301 Advanced Analysis...")
-        
-        print("📊 Preprocessing data with multiple methods...")
+    def run_analysis_stages(self, verbose=True):
+        if verbose:
+            print("📊 Preprocessing data with multiple methods...")
         data_variants = self.preprocess_data()
         
-        print("🔤 Running comprehensive ASCII analysis...")
+        if verbose:
+            print("🔤 Running comprehensive ASCII analysis...")
         ascii_results, best_ascii = self.comprehensive_ascii_analysis(data_variants)
         
-        print("🔑 Testing palindrome keys...")
+        if verbose:
+            print("🔑 Testing palindrome keys...")
         palindrome_results = self.palindrome_key_analysis(data_variants)
         
-        print("📈 Analyzing patterns...")
+        if verbose:
+            print("🗝️ Searching the digit key space...")
+        key_results = self.key_search_analysis(data_variants)
+        
+        if verbose:
+            print("📈 Analyzing patterns...")
         pattern_results = self.smart_pattern_analysis(data_variants)
         
-        print("🌍 Analyzing coordinate patterns...")
+        if verbose:
+            print("🌍 Analyzing coordinate patterns...")
         coordinate_results = self.coordinate_analysis(data_variants)
         
-        print("📄 Generating comprehensive report...")
-        report = self.generate_report()
+        return {
+            'data_variants': data_variants,
+            'ascii_results': ascii_results,
+            'best_ascii': best_ascii,
+            'palindrome_results': palindrome_results,
+            'key_results': key_results,
+            'pattern_results': pattern_results,
+            'coordinate_results': coordinate_results
+        }
+    
+    def run_complete_analysis(self):
+        print("🔍 Starting Cicada 3301 Advanced Analysis...")
         
+        self.run_analysis_stages()
+        
+        print("📄 Generating comprehensive report...")
         filename = f"cicada_advanced_analysis_{self.timestamp}.md"
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(report)
+        with reporting.ReportWriter(filename, compress=self.compress_report) as report:
+            self.write_report(report)
+        filename = report.path
         
         print(f"✅ Analysis complete! Report saved as: {filename}")
         return filename
 
-if __name__ == "__main__":
+def main():
     cicada_number = "10412790658919985359827898739594318956404425106955675643739226952372682423852959081739834390370374475764863415203423499357108713631"
     
     analyzer = CicadaAdvancedAnalyzer(cicada_number)
@@ -608,4 +646,8 @@ if __name__ == "__main__":
     
     print(f"\n🎯 Analysis Results:")
     print(f"   Report: {report_file}")
-    print(f"   Focus on HIGH confidence ASCII and palindrome key results!")
\ No newline at end of file
+    print(f"   Focus on HIGH confidence ASCII and palindrome key results!")
+    return report_file
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
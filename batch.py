@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import json
+import time
+import argparse
+import itertools
+import functools
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Tuple, Any
+
+from b import CicadaAdvancedAnalyzer
+
+
+def read_sequences(path: str) -> Iterator[Tuple[str, str]]:
+    with open(path, encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+
+            if line.startswith('{'):
+                record = json.loads(line)
+                yield str(record.get('id', line_number)), str(record['sequence'])
+            else:
+                yield str(line_number), line
+
+
+def analyze_sequence(item: Tuple[str, str], backend: str = "str") -> Dict[str, Any]:
+    sequence_id, sequence = item
+    start = time.perf_counter()
+
+    analyzer = CicadaAdvancedAnalyzer(sequence, backend=backend)
+    stages = analyzer.run_analysis_stages(verbose=False)
+
+    coordinate_counts = {name: coords.total for name, coords in stages['coordinate_results'].items()}
+
+    return {
+        'id': sequence_id,
+        'length': len(sequence),
+        'variants': len(stages['data_variants']),
+        'best_ascii': [
+            {
+                'variant': candidate['variant'],
+                'method': candidate['method'],
+                'validity': round(candidate['validity'], 2),
+                'language': round(candidate['language'], 2),
+                'text': candidate['text'][:100]
+            }
+            for candidate in stages['best_ascii'][:10]
+        ],
+        'coordinate_candidates': sum(coordinate_counts.values()),
+        'coordinate_counts': coordinate_counts,
+        'findings': analyzer.results.as_dicts(),
+        'elapsed': round(time.perf_counter() - start, 6)
+    }
+
+
+class CicadaBatchAnalyzer:
+
+    def __init__(self, workers: int = None, chunksize: int = 8, window: int = None, backend: str = "str"):
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.chunksize = max(1, chunksize)
+        self.window = window or self.workers * self.chunksize * 4
+        self.backend = backend
+
+        self.processed = 0
+        self.total_digits = 0
+        self.elapsed = 0.0
+
+    def iter_results(self, sequences: Iterator[Tuple[str, str]]) -> Iterator[Dict[str, Any]]:
+        start = time.perf_counter()
+        sequences = iter(sequences)
+        worker = functools.partial(analyze_sequence, backend=self.backend)
+
+        try:
+            if self.workers == 1:
+                for item in sequences:
+                    result = worker(item)
+                    self.record(result)
+                    yield result
+                return
+
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                while True:
+                    window = list(itertools.islice(sequences, self.window))
+                    if not window:
+                        break
+
+                    for result in executor.map(worker, window, chunksize=self.chunksize):
+                        self.record(result)
+                        yield result
+        finally:
+            self.elapsed = time.perf_counter() - start
+
+    def record(self, result: Dict[str, Any]):
+        self.processed += 1
+        self.total_digits += result['length']
+
+    def run(self, input_path: str, output=None) -> Dict[str, Any]:
+        output = output or sys.stdout
+
+        for result in self.iter_results(read_sequences(input_path)):
+            output.write(json.dumps(result) + "\n")
+        output.flush()
+
+        return self.throughput()
+
+    def throughput(self) -> Dict[str, Any]:
+        elapsed = self.elapsed or 1e-9
+        sequences_per_second = self.processed / elapsed
+
+        return {
+            'sequences': self.processed,
+            'digits': self.total_digits,
+            'workers': self.workers,
+            'elapsed_seconds': round(self.elapsed, 3),
+            'sequences_per_second': round(sequences_per_second, 2),
+            'sequences_per_second_per_core': round(sequences_per_second / self.workers, 2),
+            'digits_per_second': round(self.total_digits / elapsed, 2)
+        }
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Batch corpus analysis with CicadaAdvancedAnalyzer")
+    parser.add_argument("input", help="File with one digit sequence per line, or JSONL records with 'id' and 'sequence'")
+    parser.add_argument("-o", "--output", help="JSONL output file (default: stdout)")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunksize", type=int, default=8, help="Sequences handed to a worker per task")
+    parser.add_argument("--backend", choices=["str", "numpy"], default="str", help="Preprocessing backend")
+    args = parser.parse_args(argv)
+
+    batch = CicadaBatchAnalyzer(workers=args.workers, chunksize=args.chunksize, backend=args.backend)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            stats = batch.run(args.input, output)
+    else:
+        stats = batch.run(args.input)
+
+    print(f"✅ Batch complete: {stats['sequences']} sequences ({stats['digits']} digits) in {stats['elapsed_seconds']}s", file=sys.stderr)
+    print(f"⚡ Throughput: {stats['sequences_per_second']} seq/s total, "
+          f"{stats['sequences_per_second_per_core']} seq/s per core ({stats['workers']} workers)", file=sys.stderr)
+
+    return stats
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import resource
+import subprocess
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+
+SIZES = (131, 10 ** 4, 10 ** 5, 10 ** 6)
+TIME_BUDGET = 60.0
+MIN_FIT_SECONDS = 1e-3
+QUADRATIC_EXPONENT = 1.7
+# Address-space cap for each measurement's worker process, so one runaway kernel cannot take the whole suite down
+MEMORY_LIMIT_MB = 4096
+
+
+def synthetic_sequence(length: int, seed: int = 3301) -> str:
+    digits = np.random.default_rng(seed).integers(0, 10, size=length, dtype=np.uint8)
+    return (digits + ord('0')).tobytes().decode('ascii')
+
+
+def synthetic_binary(length: int, seed: int = 3301) -> str:
+    bits = np.random.default_rng(seed).integers(0, 2, size=length, dtype=np.uint8)
+    return (bits + ord('0')).tobytes().decode('ascii')
+
+
+def solver(sequence: str):
+    from a import CicadaSolver
+    from cache import ResultCache
+    return CicadaSolver(sequence, ResultCache(enabled=False))
+
+
+def advanced(sequence: str):
+    from b import CicadaAdvancedAnalyzer
+    analyzer = CicadaAdvancedAnalyzer(sequence)
+    return analyzer, analyzer.preprocess_data()
+
+
+def setup_find_palindromes(sequence: str) -> Callable:
+    instance = solver(sequence)
+    return lambda: instance.find_palindromes(sequence, min_length=3)
+
+
+def setup_find_repeating_patterns(sequence: str) -> Callable:
+    instance = solver(sequence)
+    return lambda: instance.find_repeating_patterns(sequence)
+
+
+def setup_find_fibonacci_patterns(sequence: str) -> Callable:
+    instance = solver(sequence)
+    return lambda: instance.find_fibonacci_patterns(sequence)
+
+
+def setup_comprehensive_ascii_analysis(sequence: str) -> Callable:
+    analyzer, variants = advanced(sequence)
+    return lambda: analyzer.comprehensive_ascii_analysis(variants)
+
+
+def setup_coordinate_analysis(sequence: str) -> Callable:
+    analyzer, variants = advanced(sequence)
+    return lambda: analyzer.coordinate_analysis(variants)
+
+
+def setup_find_repeating_binary_patterns(sequence: str) -> Callable:
+    from d import ComprehensiveAnalyzer
+    analyzer = ComprehensiveAnalyzer()
+    binary = synthetic_binary(len(sequence))
+    return lambda: analyzer.find_repeating_binary_patterns(binary)
+
+
+def setup_process_layer_2_timestamps(sequence: str) -> Callable:
+    from Hex import CicadaHexProcessor
+    # Decimal digits are valid hex, so the digit sequence doubles as the hex input (trimmed to whole bytes)
+    processor = CicadaHexProcessor(sequence[:len(sequence) // 2 * 2])
+    return processor.process_layer_2_timestamps
+
+
+def setup_scan_timestamps(sequence: str) -> Callable:
+    import timestamps
+    data = np.random.default_rng(3301).integers(0, 256, size=len(sequence), dtype=np.uint8)
+    return lambda: timestamps.scan_timestamps(data)
+
+
+def setup_dbscan(sequence: str) -> Callable:
+    import clustering
+    rng = np.random.default_rng(3301)
+    points = np.column_stack([rng.uniform(-90, 90, len(sequence)), rng.uniform(-180, 180, len(sequence))])
+    return lambda: clustering.dbscan(points)
+
+
+KERNELS = {
+    'a.find_palindromes': setup_find_palindromes,
+    'a.find_repeating_patterns': setup_find_repeating_patterns,
+    'a.find_fibonacci_patterns': setup_find_fibonacci_patterns,
+    'b.comprehensive_ascii_analysis': setup_comprehensive_ascii_analysis,
+    'b.coordinate_analysis': setup_coordinate_analysis,
+    'd.find_repeating_binary_patterns': setup_find_repeating_binary_patterns,
+    'Hex.process_layer_2_timestamps': setup_process_layer_2_timestamps,
+    'timestamps.scan_timestamps': setup_scan_timestamps,
+    'clustering.dbscan': setup_dbscan
+}
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+                              capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def machine_fingerprint() -> Dict[str, Any]:
+    return {
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'numpy': np.__version__,
+        'revision': git_revision()
+    }
+
+
+def time_call(func: Callable, repeats: int) -> Tuple[float, List[float]]:
+    timings = []
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(repeats):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+            # Long runs are not worth repeating; one sample is already far above timer noise
+            if timings[-1] > 1.0:
+                break
+    return min(timings), timings
+
+
+def fit_growth(points: List[Tuple[int, float]]) -> Dict[str, Any]:
+    # Fixed per-call overhead flattens the small sizes, so only the largest three timed points are fitted
+    usable = [(size, seconds) for size, seconds in points if seconds >= MIN_FIT_SECONDS][-3:]
+    if len(usable) < 2:
+        return {'exponent': None, 'points_used': len(usable), 'classification': 'insufficient data'}
+
+    sizes, seconds = np.log([point[0] for point in usable]), np.log([point[1] for point in usable])
+    exponent, intercept = np.polyfit(sizes, seconds, 1)
+
+    if exponent < 1.3:
+        classification = 'linear'
+    elif exponent < QUADRATIC_EXPONENT:
+        classification = 'superlinear'
+    else:
+        classification = 'quadratic or worse'
+
+    return {
+        'exponent': round(float(exponent), 3),
+        'points_used': len(usable),
+        'classification': classification,
+        'projected_seconds_1e6': round(float(np.exp(intercept) * (10 ** 6) ** exponent), 4)
+    }
+
+
+def limit_memory(megabytes: int):
+    if megabytes:
+        limit = megabytes * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def measure(name: str, size: int, repeats: int, seed: int) -> Tuple[float, List[float]]:
+    return time_call(KERNELS[name](synthetic_sequence(size, seed)), repeats)
+
+
+def measure_isolated(name: str, size: int, repeats: int, seed: int, memory_limit: int) -> Dict[str, Any]:
+    # A fresh worker per size: nothing carries over between sizes, and an OOM kill only loses this one point
+    try:
+        with ProcessPoolExecutor(max_workers=1, initializer=limit_memory, initargs=(memory_limit,)) as executor:
+            best, timings = executor.submit(measure, name, size, repeats, seed).result()
+    except MemoryError:
+        return {'size': size, 'skipped': f"memory limit ({memory_limit} MB)"}
+    except BrokenProcessPool:
+        return {'size': size, 'skipped': "worker died (likely killed for memory)"}
+    except Exception as e:
+        # Under the address-space limit an allocation can also fail as an ImportError or OSError
+        return {'size': size, 'skipped': f"failed: {type(e).__name__}: {e}"}
+    return {'size': size, 'seconds': round(best, 6), 'samples': [round(t, 6) for t in timings]}
+
+
+def run_kernel(name: str, sizes: Tuple[int, ...], repeats: int, budget: float, seed: int,
+               memory_limit: int = MEMORY_LIMIT_MB) -> Dict[str, Any]:
+    runs = []
+    sizes = sorted(sizes)
+    for index, size in enumerate(sizes):
+        run = measure_isolated(name, size, repeats, seed, memory_limit)
+        runs.append(run)
+        skipped = sizes[index + 1:]
+
+        if 'skipped' in run:
+            print(f"   ⏭️  {name}: n={size} {run['skipped']}, skipping n={[size] + skipped}", file=sys.stderr)
+            runs.extend({'size': larger, 'skipped': run['skipped']} for larger in skipped)
+            break
+
+        best = run['seconds']
+        print(f"   {name:<34} n={size:<9} {best:>10.4f}s", file=sys.stderr)
+
+        # Assume at least linear growth: if even that projection misses the budget, larger sizes are skipped
+        if skipped and best * skipped[0] / size > budget:
+            print(f"   ⏭️  {name}: n={skipped[0]} projected over the {budget:.0f}s budget, skipping n={skipped}",
+                  file=sys.stderr)
+            runs.extend({'size': larger, 'skipped': 'time budget'} for larger in skipped)
+            break
+
+    measured = [(run['size'], run['seconds']) for run in runs if 'seconds' in run]
+    return {'runs': runs, 'growth': fit_growth(measured)}
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    regressions = []
+    for name, current in results['kernels'].items():
+        previous = baseline.get('kernels', {}).get(name)
+        if not previous:
+            continue
+        before = {run['size']: run['seconds'] for run in previous['runs'] if 'seconds' in run}
+        for run in current['runs']:
+            old = before.get(run['size'])
+            if 'seconds' in run and old and old >= MIN_FIT_SECONDS and run['seconds'] > old * tolerance:
+                regressions.append(f"{name} n={run['size']}: {old:.4f}s -> {run['seconds']:.4f}s")
+    return regressions
+
+
+def save(results: Dict[str, Any], output: str):
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+
+
+def run_suite(kernels: List[str] = None, sizes: Tuple[int, ...] = SIZES, repeats: int = 3,
+              budget: float = TIME_BUDGET, seed: int = 3301, memory_limit: int = MEMORY_LIMIT_MB,
+              output: str = None) -> Dict[str, Any]:
+    kernels = list(KERNELS) if kernels is None else kernels
+    results = {
+        'generated': datetime.now().isoformat(),
+        'machine': machine_fingerprint(),
+        'settings': {'sizes': list(sizes), 'repeats': repeats, 'budget_seconds': budget, 'seed': seed,
+                     'memory_limit_mb': memory_limit},
+        'kernels': {}
+    }
+    for name in kernels:
+        results['kernels'][name] = run_kernel(name, sizes, repeats, budget, seed, memory_limit)
+        # Saved after every kernel, so an interrupted suite still leaves everything measured so far
+        if output:
+            save(results, output)
+    return results
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Scaling benchmarks for the hot analysis kernels")
+    parser.add_argument("kernels", nargs="*", default=list(KERNELS), help=f"Kernels to run: {', '.join(KERNELS)}")
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(SIZES), help="Sequence lengths")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed runs per size (best is kept)")
+    parser.add_argument("--budget", type=float, default=TIME_BUDGET, help="Seconds per size before larger sizes are skipped")
+    parser.add_argument("--seed", type=int, default=3301, help="Seed for the synthetic sequences")
+    parser.add_argument("--memory-limit", type=int, default=MEMORY_LIMIT_MB,
+                        help="Address-space limit in MB for each measurement's worker process (0 disables it)")
+    parser.add_argument("--output", default=None, help="JSON output path (default: benchmark_<timestamp>.json)")
+    parser.add_argument("--compare", default=None, help="Earlier results JSON to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=2.0, help="Slowdown ratio that counts as a regression")
+    parser.add_argument("--max-exponent", type=float, default=QUADRATIC_EXPONENT,
+                        help="Fail when a kernel's fitted growth exponent reaches this value")
+    args = parser.parse_args(argv)
+
+    unknown = [name for name in args.kernels if name not in KERNELS]
+    if unknown:
+        parser.error(f"unknown kernel(s): {', '.join(unknown)}")
+
+    output = args.output or f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    print(f"⏱️  Benchmarking {len(args.kernels)} kernels at n={args.sizes}", file=sys.stderr)
+    results = run_suite(args.kernels, tuple(args.sizes), args.repeats, args.budget, args.seed, args.memory_limit,
+                        output)
+    save(results, output)
+
+    failures = []
+    print("=" * 60)
+    for name, result in results['kernels'].items():
+        growth = result['growth']
+        exponent = growth['exponent']
+        print(f"{name:<34} exponent={exponent if exponent is not None else '-':<6} {growth['classification']}")
+        if exponent is not None and exponent >= args.max_exponent:
+            failures.append(f"{name}: growth exponent {exponent} >= {args.max_exponent}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            failures.extend(compare(results, json.load(f), args.tolerance))
+
+    for failure in failures:
+        print(f"❌ {failure}")
+    print(f"📄 Results saved: {output}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,24 +8,45 @@ from datetime import datetime
 from collections import Counter
 import math
 
+import coordinates
+import decode_search
+import keysearch
+import ngrams
+import reporting
+from cache import ResultCache
+from repeats import RepeatIndex
+from results import ResultStore
+
+CICADA_NUMBER = "10412790658919985359827898739594318956404425106955675643739226952372682423852959081739834390370374475764863415203423499357108713631"
+
 class CicadaFocusedDecoder:
-    def __init__(self):
-        self.original_number = "10412790658919985359827898739594318956404425106955675643739226952372682423852959081739834390370374475764863415203423499357108713631"
+    def __init__(self, original_number=CICADA_NUMBER, result_cache=None):
+        self.original_number = original_number
+        self.result_cache = ResultCache() if result_cache is None else result_cache
         self.key_palindromes = ['78987', '7447', '13631']
         self.pattern_739 = "739"
+        self.compress_report = False
+        self.language_scorer = ngrams.ENGLISH_SCORER
+        self.decode_search_stats = None
         self.fibonacci_positions = self.generate_fibonacci_positions()
-        self.results = []
+        self.results = ResultStore(fields=('category', 'finding', 'confidence', 'timestamp'), timestamp_format='%H:%M:%S')
         self.timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
         
     def log_result(self, category, finding, confidence="MEDIUM"):
-        self.results.append({
-            'category': category,
-            'finding': finding,
-            'confidence': confidence,
-            'timestamp': datetime.now().strftime('%H:%M:%S')
-        })
+        self.results.add(category, None, finding, confidence)
         print(f"[{confidence}] {category}: {finding}")
     
+    def cached(self, method, *params):
+        return self.result_cache.run(self.original_number, method, *params, state=('results',))
+    
+    def cache_params(self):
+        return {
+            'key_palindromes': self.key_palindromes,
+            'pattern_739': self.pattern_739,
+            'compress_report': self.compress_report,
+            'language_scorer': (self.language_scorer.name, getattr(self.language_scorer, 'order', None))
+        }
+    
     def generate_fibonacci_positions(self):
         fib = [1, 1]
         while fib[-1] < len(self.original_number):
@@ -41,31 +62,13 @@ class CicadaFocusedDecoder:
         every_5th = self.extract_every_nth_digit(self.original_number, 5)
         self.log_result("EXTRACTION", f"Every 5th digit: {every_5th}", "HIGH")
         
-        shifted_data = every_5th[1:] + every_5th[:1]
+        decoded = decode_search.decode(self.original_number, stride=5, offset=0, rotation=1, group_size=2)
+        shifted_data = decoded['shifted']
         self.log_result("SHIFT", f"Shifted data: {shifted_data}", "HIGH")
         
-        ascii_result = ""
-        hex_result = ""
-        decimal_values = []
-        
-        for i in range(0, len(shifted_data) - 1, 2):
-            group = shifted_data[i:i+2]
-            try:
-                ascii_val = int(group)
-                decimal_values.append(ascii_val)
-                
-                if 32 <= ascii_val <= 126:
-                    ascii_result += chr(ascii_val)
-                elif 1 <= ascii_val <= 31:
-                    ascii_result += f"[{ascii_val}]"
-                else:
-                    ascii_result += "?"
-                
-                hex_result += f"{ascii_val:02x}"
-                
-            except ValueError:
-                ascii_result += "?"
-                hex_result += "??"
+        ascii_result = decoded['text']
+        decimal_values = decoded['values']
+        hex_result = ''.join(f"{ascii_val:02x}" for ascii_val in decimal_values)
         
         self.log_result("ASCII_DECODE", f"Primary decode result: '{ascii_result}'", "CRITICAL")
         self.log_result("HEX_DECODE", f"Hex interpretation: {hex_result}", "HIGH")
@@ -78,35 +81,36 @@ class CicadaFocusedDecoder:
     def decode_secondary_method(self):
         self.log_result("SECONDARY_DECODE", "Testing second highest confidence method (84.6% validity)", "HIGH")
         
-        every_5th = self.extract_every_nth_digit(self.original_number, 5)
+        decoded = decode_search.decode(self.original_number, stride=5, offset=0, rotation=3, group_size=2)
         
-        shifted_data = every_5th[3:] + every_5th[:3]
+        shifted_data = decoded['shifted']
         self.log_result("SHIFT", f"Shift-3 data: {shifted_data}", "HIGH")
         
-        ascii_result = ""
-        decimal_values = []
-        
-        for i in range(0, len(shifted_data) - 1, 2):
-            group = shifted_data[i:i+2]
-            try:
-                ascii_val = int(group)
-                decimal_values.append(ascii_val)
-                
-                if 32 <= ascii_val <= 126:
-                    ascii_result += chr(ascii_val)
-                elif 1 <= ascii_val <= 31:
-                    ascii_result += f"[{ascii_val}]"
-                else:
-                    ascii_result += "?"
-                    
-            except ValueError:
-                ascii_result += "?"
+        ascii_result = decoded['text']
+        decimal_values = decoded['values']
         
         self.log_result("ASCII_DECODE", f"Secondary decode result: '{ascii_result}'", "CRITICAL")
         self.analyze_decoded_text(ascii_result, "SECONDARY")
         
         return ascii_result, decimal_values
     
+    def search_decode_space(self, top_k=5):
+        self.log_result("DECODE_SEARCH", "Sweeping every stride, offset, rotation and group size", "HIGH")
+        
+        search = decode_search.DecodeSearch(self.language_scorer, top_k=top_k)
+        candidates = search.search(self.original_number)
+        # Timings are kept off the cached state, so a replayed run never reports a search it did not perform
+        self.decode_search_stats = search.throughput()
+        self.log_result("DECODE_SEARCH", f"Scored {self.decode_search_stats['candidates']} decodes", "MEDIUM")
+        
+        for candidate in candidates:
+            self.log_result("DECODE_CANDIDATE",
+                          f"Stride {candidate['stride']}, offset {candidate['offset']}, rotation {candidate['rotation']}, "
+                          f"group {candidate['group_size']}: '{candidate['text'][:60]}' ({candidate['score']:.1f} {self.language_scorer.name} score)",
+                          "HIGH" if candidate['score'] >= 90 else "MEDIUM")
+        
+        return candidates
+    
     def decode_palindrome_fibonacci_method(self):
         self.log_result("PALINDROME_DECODE", "Testing palindrome 7447 + fibonacci method (83.3% validity)", "HIGH")
         
@@ -117,17 +121,7 @@ class CicadaFocusedDecoder:
         
         self.log_result("FIBONACCI_EXTRACTION", f"Fibonacci position digits: {fib_digits}", "HIGH")
         
-        palindrome = "7447"
-        xor_result = ""
-        
-        for i, digit in enumerate(fib_digits):
-            try:
-                digit_val = int(digit)
-                key_val = int(palindrome[i % len(palindrome)])
-                xor_val = digit_val ^ key_val
-                xor_result += str(xor_val)
-            except ValueError:
-                xor_result += digit
+        xor_result = keysearch.combine(fib_digits, "7447", 'xor')
         
         self.log_result("XOR_RESULT", f"XOR result: {xor_result}", "HIGH")
         
@@ -142,17 +136,7 @@ class CicadaFocusedDecoder:
     def decode_xor_739_method(self):
         self.log_result("XOR_739_DECODE", "Analyzing XOR with pattern 739", "HIGH")
         
-        xor_result = ""
-        pattern = "739"
-        
-        for i, digit in enumerate(self.original_number):
-            try:
-                digit_val = int(digit)
-                pattern_val = int(pattern[i % len(pattern)])
-                xor_val = digit_val ^ pattern_val
-                xor_result += str(xor_val)
-            except ValueError:
-                xor_result += digit
+        xor_result = keysearch.combine(self.original_number, self.pattern_739, 'xor')
         
         self.log_result("XOR_739_RESULT", f"XOR 739 result (first 50): {xor_result[:50]}...", "HIGH")
         
@@ -234,39 +218,20 @@ class CicadaFocusedDecoder:
         return None
     
     def test_as_coordinates(self, data):
-        for i in range(0, len(data) - 11):
-            segment = data[i:i+12]
-            
-            formats = [(6, 6), (5, 7), (7, 5), (4, 8)]
-            
-            for lat_len, lon_len in formats:
-                if lat_len + lon_len <= len(segment):
-                    try:
-                        lat_str = segment[:lat_len]
-                        lon_str = segment[lat_len:lat_len + lon_len]
-                        
-                        for lat_dec in range(1, lat_len):
-                            for lon_dec in range(1, lon_len):
-                                lat = float(lat_str[:lat_dec] + '.' + lat_str[lat_dec:])
-                                lon = float(lon_str[:lon_dec] + '.' + lon_str[lon_dec:])
-                                
-                                if -90 <= lat <= 90 and -180 <= lon <= 180:
-                                    self.log_result("COORDINATE_CANDIDATE", 
-                                                  f"Lat: {lat}°, Lon: {lon}° from position {i}", "MEDIUM")
-                                    return
-                    except ValueError:
-                        continue
+        candidates = coordinates.find_coordinates(data, first_only=True)
+        if candidates:
+            coord = candidates[0]
+            self.log_result("COORDINATE_CANDIDATE", 
+                          f"Lat: {coord['lat']}°, Lon: {coord['lon']}° from position {coord['position']}", "MEDIUM")
     
     def analyze_xor_patterns(self, xor_data):
-        for length in range(3, min(10, len(xor_data) // 3)):
-            patterns = {}
-            for i in range(len(xor_data) - length + 1):
-                pattern = xor_data[i:i + length]
-                if pattern not in patterns:
-                    patterns[pattern] = []
-                patterns[pattern].append(i)
-            
-            repeating = {k: v for k, v in patterns.items() if len(v) > 2}
+        lengths = range(3, min(10, len(xor_data) // 3))
+        if not lengths:
+            return
+        
+        repeat_index = RepeatIndex(xor_data, max_length=lengths[-1])
+        for length in lengths:
+            repeating = repeat_index.repeats(length, length, min_count=3)
             if repeating:
                 for pattern, positions in list(repeating.items())[:3]:
                     self.log_result("XOR_PATTERN", f"Pattern '{pattern}' at positions {positions}", "MEDIUM")
@@ -293,7 +258,10 @@ class CicadaFocusedDecoder:
                 self.log_result("DECIMAL_MATCH", f"Decimal value {number} ({significance}) found", "HIGH")
     
     def generate_final_report(self):
-        report = f"""# Cicada 3301 Focused Decoder Results
+        return reporting.render(self.write_final_report)
+    
+    def write_final_report(self, report):
+        report += f"""# Cicada 3301 Focused Decoder Results
 
 **Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 **Target:** High-confidence findings from advanced analysis
@@ -311,21 +279,14 @@ This focused decoder targeted the three highest-confidence findings:
 
 """
         
-        categories = {}
-        for result in self.results:
-            cat = result['category']
-            conf = result['confidence']
-            if cat not in categories:
-                categories[cat] = {'CRITICAL': [], 'HIGH': [], 'MEDIUM': [], 'LOW': []}
-            categories[cat][conf].append(result)
-        
-        for category, confidence_levels in categories.items():
+        for category in self.results.category_names():
             report += f"### {category}\n\n"
             
             for confidence in ['CRITICAL', 'HIGH', 'MEDIUM', 'LOW']:
-                if confidence_levels[confidence]:
+                findings = self.results.select(category, confidence)
+                if findings:
                     report += f"#### {confidence} Confidence\n\n"
-                    for result in confidence_levels[confidence]:
+                    for result in findings:
                         report += f"**[{result['timestamp']}]** {result['finding']}\n\n"
             
             report += "---\n\n"
@@ -351,46 +312,49 @@ Several coordinate candidates require geographic investigation for potential phy
 
 *Analysis completed with focused decoder methodology*
 """
-        
-        return report
     
     def run_focused_decode(self):
         print("🎯 Starting Cicada 3301 Focused High-Confidence Decoder")
         print("=" * 60)
         
         print("\n🔥 DECODING METHOD 1: Every 5th + Shift 1 (92.3% validity)")
-        primary_result, primary_decimals = self.decode_primary_method()
+        primary_result, primary_decimals = self.cached(self.decode_primary_method)
         
         print("\n🔥 DECODING METHOD 2: Every 5th + Shift 3 (84.6% validity)")
-        secondary_result, secondary_decimals = self.decode_secondary_method()
+        secondary_result, secondary_decimals = self.cached(self.decode_secondary_method)
+        
+        print("\n🔍 DECODE SEARCH: All strides, offsets, rotations and group sizes")
+        self.decode_search_stats = None
+        self.cached(self.search_decode_space)
+        if self.decode_search_stats:
+            self.log_result("DECODE_SEARCH", f"Decode search took {self.decode_search_stats['elapsed_seconds']}s", "MEDIUM")
         
         print("\n🔥 DECODING METHOD 3: Palindrome 7447 + Fibonacci (83.3% validity)")
-        palindrome_result = self.decode_palindrome_fibonacci_method()
+        palindrome_result = self.cached(self.decode_palindrome_fibonacci_method)
         
         print("\n🔥 PATTERN ANALYSIS: XOR with 739")
-        xor_result = self.decode_xor_739_method()
+        xor_result = self.cached(self.decode_xor_739_method)
         
         print("\n🌍 COORDINATE ANALYSIS")
-        self.test_coordinate_hypotheses()
+        self.cached(self.test_coordinate_hypotheses)
         
         print("\n🔍 CROSS-REFERENCE ANALYSIS")
-        self.cross_reference_analysis()
+        self.cached(self.cross_reference_analysis)
         
         print("\n📄 GENERATING FINAL REPORT")
-        report = self.generate_final_report()
-        
         filename = f"cicada_focused_decode_{self.timestamp}.md"
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(report)
+        with reporting.ReportWriter(filename, compress=self.compress_report) as report:
+            self.write_final_report(report)
+        filename = report.path
         
         print(f"\n✅ Focused decode complete!")
         print(f"📁 Report saved as: {filename}")
-        print(f"🎯 {len([r for r in self.results if r['confidence'] == 'CRITICAL'])} CRITICAL findings")
-        print(f"🎯 {len([r for r in self.results if r['confidence'] == 'HIGH'])} HIGH confidence findings")
+        print(f"🎯 {self.results.count(confidence='CRITICAL')} CRITICAL findings")
+        print(f"🎯 {self.results.count(confidence='HIGH')} HIGH confidence findings")
         
         return filename
 
-if __name__ == "__main__":
+def main():
     decoder = CicadaFocusedDecoder()
     report_file = decoder.run_focused_decode()
     
@@ -398,4 +362,8 @@ if __name__ == "__main__":
     print(f"   1. Review CRITICAL findings in {report_file}")
     print(f"   2. Test any coordinates geographically")
     print(f"   3. Cross-reference results with Liber Primus")
-    print(f"   4. Investigate any URLs or hashes found")
\ No newline at end of file
+    print(f"   4. Investigate any URLs or hashes found")
+    return report_file
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+
+import io
+import os
+import sys
+import json
+import pickle
+import hashlib
+import argparse
+import contextlib
+from typing import Any, Callable, Dict, List, Tuple
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.environ.get("CICADA_CACHE_DIR", ".cicada_cache")
+MAX_BYTES = 256 * 1024 * 1024
+MISSING = object()
+
+
+def data_files(tree) -> List[str]:
+    # A module-level DATA_FILES list of package-relative paths or globs names the data its results depend on
+    import ast
+    import glob
+    patterns = []
+    for statement in tree.body:
+        if isinstance(statement, ast.Assign) and any(isinstance(target, ast.Name) and target.id == 'DATA_FILES'
+                                                     for target in statement.targets):
+            patterns.extend(ast.literal_eval(statement.value))
+    return sorted(path for pattern in patterns for path in glob.glob(os.path.join(PACKAGE_DIR, pattern)))
+
+
+def local_sources(module: str, found: Dict[str, str] = None, shallow: Tuple[str, ...] = ()) -> Dict[str, str]:
+    # ast, inspect and tempfile are deferred to first use so `cicada cache` starts fast
+    import ast
+    found = {} if found is None else found
+    path = os.path.join(PACKAGE_DIR, f"{module}.py")
+    if module in found or not os.path.exists(path):
+        return found
+
+    with open(path, 'rb') as handle:
+        source = handle.read()
+    found[module] = hashlib.sha256(source).hexdigest()
+    if module in shallow:
+        return found
+
+    tree = ast.parse(source)
+    for data_path in data_files(tree):
+        with open(data_path, 'rb') as handle:
+            found[os.path.relpath(data_path, PACKAGE_DIR)] = hashlib.sha256(handle.read()).hexdigest()
+
+    for statement in ast.walk(tree):
+        if isinstance(statement, ast.Import):
+            names = [alias.name for alias in statement.names]
+        elif isinstance(statement, ast.ImportFrom) and statement.module and not statement.level:
+            names = [statement.module]
+        else:
+            continue
+        for name in names:
+            local_sources(name.split('.')[0], found, shallow)
+    return found
+
+
+def code_version(module: str) -> str:
+    sources = local_sources(module)
+    return hashlib.sha256(json.dumps(sources, sort_keys=True).encode()).hexdigest()
+
+
+class Tee(io.TextIOBase):
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.captured = io.StringIO()
+
+    def write(self, text: str) -> int:
+        self.captured.write(text)
+        return self.stream.write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+
+def appendable(value) -> bool:
+    # Lists, and result stores that hand back their raw rows for replay
+    return isinstance(value, list) or callable(getattr(value, 'rows', None))
+
+
+def appended(value, start: int) -> List[Any]:
+    return value[start:] if isinstance(value, list) else value.rows(start)
+
+
+def snapshot(owner, state: Tuple[str, ...]) -> Dict[str, Any]:
+    before = {}
+    for name in state:
+        value = getattr(owner, name, MISSING)
+        if appendable(value):
+            before[name] = len(value)
+        elif isinstance(value, dict):
+            before[name] = dict(value)
+        else:
+            before[name] = value
+    return before
+
+
+def state_changes(owner, state: Tuple[str, ...], before: Dict[str, Any]) -> List[Tuple[str, str, Any]]:
+    changes = []
+    for name in state:
+        previous, value = before[name], getattr(owner, name, MISSING)
+        if appendable(value) and isinstance(previous, int) and previous <= len(value):
+            changes.append((name, 'extend', appended(value, previous)))
+        elif isinstance(value, dict) and isinstance(previous, dict):
+            updated = {key: item for key, item in value.items() if key not in previous or previous[key] is not item}
+            changes.append((name, 'update', updated))
+        elif value is not previous:
+            changes.append((name, 'set', value))
+    return changes
+
+
+def apply_changes(owner, changes: List[Tuple[str, str, Any]]):
+    for name, kind, value in changes:
+        if kind == 'extend':
+            target = getattr(owner, name)
+            # Result stores re-stamp replayed rows, so their timestamps are this run's
+            getattr(target, 'replay', target.extend)(value)
+        elif kind == 'update':
+            getattr(owner, name).update(value)
+        else:
+            setattr(owner, name, value)
+
+
+class ResultCache:
+
+    def __init__(self, directory: str = CACHE_DIR, max_bytes: int = MAX_BYTES, enabled: bool = None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.enabled = os.environ.get("CICADA_CACHE", "1") != "0" if enabled is None else enabled
+
+        self.hits = 0
+        self.misses = 0
+        self.versions = {}
+
+    def method_name(self, method: Callable) -> str:
+        return f"{type(method.__self__).__name__}.{method.__name__}"
+
+    def version(self, method: Callable) -> str:
+        import inspect
+        module = os.path.splitext(os.path.basename(inspect.getsourcefile(type(method.__self__))))[0]
+        if module not in self.versions:
+            self.versions[module] = code_version(module)
+        return self.versions[module]
+
+    def settings(self, method: Callable) -> Any:
+        # Owners list the instance settings their methods read, so changing one misses instead of replaying stale results
+        hook = getattr(method.__self__, 'cache_params', None)
+        return hook() if callable(hook) else None
+
+    def key(self, sequence: str, method: Callable, params: Tuple) -> str:
+        fingerprint = {
+            'sequence': hashlib.sha256(sequence.encode()).hexdigest(),
+            'method': self.method_name(method),
+            'params': hashlib.sha256(pickle.dumps(params, protocol=4)).hexdigest(),
+            'settings': hashlib.sha256(pickle.dumps(self.settings(method), protocol=4)).hexdigest(),
+            'code': self.version(method)
+        }
+        return hashlib.sha256(json.dumps(fingerprint, sort_keys=True).encode()).hexdigest()
+
+    def path(self, name: str, key: str) -> str:
+        return os.path.join(self.directory, f"{name}.{key}.pkl")
+
+    def load(self, path: str):
+        try:
+            with open(path, 'rb') as handle:
+                entry = pickle.load(handle)
+            # Reading an entry makes it the most recently used one
+            os.utime(path)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        return entry
+
+    def store(self, path: str, entry: Dict[str, Any]):
+        import tempfile
+        data = pickle.dumps(entry, protocol=4)
+        os.makedirs(self.directory, exist_ok=True)
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(descriptor, 'wb') as handle:
+            handle.write(data)
+        os.replace(temporary, path)
+        self.evict()
+
+    def run(self, sequence: str, method: Callable, *params, state: Tuple[str, ...] = ()) -> Any:
+        if not self.enabled:
+            return method(*params)
+
+        owner = method.__self__
+        name = self.method_name(method)
+        path = self.path(name, self.key(sequence, method, params))
+
+        entry = self.load(path) if os.path.exists(path) else None
+        if entry is not None:
+            self.hits += 1
+            sys.stdout.write(entry['output'])
+            apply_changes(owner, entry['changes'])
+            return entry['returned']
+
+        self.misses += 1
+        before = snapshot(owner, state)
+        tee = Tee(sys.stdout)
+        with contextlib.redirect_stdout(tee):
+            returned = method(*params)
+
+        try:
+            self.store(path, {
+                'method': name,
+                'output': tee.captured.getvalue(),
+                'changes': state_changes(owner, state, before),
+                'returned': returned
+            })
+        except (pickle.PicklingError, TypeError, AttributeError):
+            pass
+        return returned
+
+    def entries(self) -> List[Tuple[str, os.stat_result]]:
+        if not os.path.isdir(self.directory):
+            return []
+        entries = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            # Another process may evict an entry between listing and stat
+            with contextlib.suppress(FileNotFoundError):
+                if name.endswith('.pkl'):
+                    entries.append((path, os.stat(path)))
+        return entries
+
+    def evict(self) -> int:
+        entries = sorted(self.entries(), key=lambda entry: entry[1].st_mtime)
+        total = sum(stat.st_size for _, stat in entries)
+
+        removed = 0
+        for path, stat in entries:
+            if total <= self.max_bytes:
+                break
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+            total -= stat.st_size
+            removed += 1
+        return removed
+
+    def clear(self, method: str = None) -> int:
+        removed = 0
+        for path, _ in self.entries():
+            if method is None or os.path.basename(path).startswith(f"{method}."):
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(path)
+                removed += 1
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        entries = self.entries()
+        methods = {}
+        for path, _ in entries:
+            name = os.path.basename(path).rsplit('.', 2)[0]
+            methods[name] = methods.get(name, 0) + 1
+
+        return {
+            'directory': self.directory,
+            'entries': len(entries),
+            'bytes': sum(stat.st_size for _, stat in entries),
+            'max_bytes': self.max_bytes,
+            'methods': methods
+        }
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Inspect or invalidate the analysis result cache")
+    parser.add_argument("command", choices=["stats", "clear"], help="Show cache usage or remove entries")
+    parser.add_argument("--method", default=None, help="Only clear entries for this method (e.g. CicadaSolver.basic_analysis)")
+    parser.add_argument("--dir", default=CACHE_DIR, help="Cache directory")
+    args = parser.parse_args(argv)
+
+    result_cache = ResultCache(args.dir)
+    if args.command == "clear":
+        removed = result_cache.clear(args.method)
+        print(f"🗑️  Removed {removed} cached result(s) from {args.dir}")
+        return
+
+    stats = result_cache.stats()
+    print(f"📦 {stats['entries']} cached result(s), {stats['bytes'] / 1024:.1f} KiB "
+          f"of {stats['max_bytes'] / 1024 / 1024:.0f} MiB in {stats['directory']}")
+    for name, count in sorted(stats['methods'].items()):
+        print(f"   {name}: {count}")
+
+
+if __name__ == "__main__":
+    main()
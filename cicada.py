@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+
+import sys
+import importlib
+
+# Subcommand -> (module, whether its main() takes argv, help). Modules are imported only when their command runs
+COMMANDS = {
+    'solver': ('a', True, "Comprehensive initial solver (a.py)"),
+    'advanced': ('b', False, "Advanced multi-variant analyzer (b.py)"),
+    'focused': ('c', False, "Focused high-confidence decoder (c.py)"),
+    'full': ('Full_solution', False, "Complete solution demonstration (Full_solution.py)"),
+    'hex': ('Hex', True, "Multi-layer hex processor (Hex.py)"),
+    'comprehensive': ('d', False, "Cross-layer comprehensive analysis (d.py)"),
+    'targeted': ('e', False, "Targeted message reconstruction (e.py)"),
+    'synthesize': ('f', False, "Final synthesis (f.py)"),
+    'pipeline': ('pipeline', True, "Run every phase as a cached DAG (pipeline.py)"),
+    'batch': ('batch', True, "Batch corpus analysis (batch.py)"),
+    'keys': ('keysearch', True, "Digit key brute force under XOR, add and subtract (keysearch.py)"),
+    'stream': ('incremental', True, "Running statistics over an appended digit stream (incremental.py)"),
+    'language': ('ngrams', True, "Score text against English, Latin and Old English n-grams (ngrams.py)"),
+    'cache': ('cache', True, "Inspect or clear the result cache (cache.py)"),
+    'profile': ('instrumentation', True, "Per-method timing and memory profile (instrumentation.py)"),
+    'benchmark': ('benchmark', True, "Kernel scaling benchmarks (benchmark.py)")
+}
+
+
+def build_parser():
+    # argparse alone costs more than the rest of startup, so it is only built for help and usage errors
+    import argparse
+    parser = argparse.ArgumentParser(prog="cicada", description="Cicada 3301 analysis toolkit")
+    commands = parser.add_subparsers(dest="command", metavar="command", required=True)
+    for name, (module_name, takes_args, description) in COMMANDS.items():
+        commands.add_parser(name, help=description, add_help=not takes_args)
+    return parser
+
+
+def run(command: str, argv: list) -> int:
+    module_name, takes_args, _ = COMMANDS[command]
+    if argv and not takes_args:
+        build_parser().error(f"{command} takes no arguments")
+
+    entry = importlib.import_module(module_name).main
+    result = entry(argv) if takes_args else entry()
+    # Entry points return report paths or result objects; only integers are exit statuses
+    return result if isinstance(result, int) else 0
+
+
+def main(argv: list = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in COMMANDS:
+        return run(argv[0], argv[1:])
+
+    build_parser().parse_args(argv)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+
+import itertools
+from collections.abc import Sequence
+from typing import Any, Dict, Iterator, List, Tuple
+
+import numpy as np
+
+import geodesy
+import instrumentation
+
+RADIUS_KM = 1000.0
+MIN_POINTS = 1
+PAIR_BUDGET = 1 << 21
+SAMPLE_SIZE = 16
+
+# Neighbouring cells that can hold a point within the radius; the eight (+-2, +-2, +-2) corners are always too far
+OFFSETS = tuple(offset for offset in itertools.product(range(-2, 3), repeat=3)
+                if sum(abs(step) == 2 for step in offset) < 3)
+NEIGHBOUR_OFFSETS = tuple(offset for offset in OFFSETS if offset != (0, 0, 0))
+HALF_OFFSETS = tuple(offset for offset in NEIGHBOUR_OFFSETS if offset > (0, 0, 0))
+
+
+def unit_vectors(coords) -> np.ndarray:
+    lat, lon = geodesy.as_radians(coords)
+    return np.column_stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)])
+
+
+def chord_length(radius_km: float) -> float:
+    # Straight-line distance through the sphere; monotonic in great-circle distance, so radius tests compare chords
+    return 2 * np.sin(min(radius_km / geodesy.EARTH_RADIUS_KM, np.pi) / 2)
+
+
+def as_points(coords) -> np.ndarray:
+    if hasattr(coords, 'records'):
+        return np.column_stack([coords.records['lat'], coords.records['lon']])
+    return np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+
+
+class GridIndex:
+
+    def __init__(self, vectors: np.ndarray, cell_size: float):
+        self.cell_size = cell_size
+        self.shift = int(np.ceil(1 / cell_size)) + 3
+        self.width = 2 * self.shift + 1
+        if self.width ** 3 >= 1 << 63:
+            raise ValueError(f"Cell size {cell_size} is too small for the grid index")
+
+        keys = self.encode(np.floor(vectors / cell_size).astype(np.int64))
+        self.order = np.argsort(keys, kind='stable')
+        self.keys, self.starts, self.counts = np.unique(keys[self.order], return_index=True, return_counts=True)
+        self.cell_of = np.empty(len(keys), dtype=np.int64)
+        self.cell_of[self.order] = np.repeat(np.arange(len(self.keys)), self.counts)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def encode(self, cells: np.ndarray) -> np.ndarray:
+        return ((cells[:, 0] + self.shift) * self.width + cells[:, 1] + self.shift) * self.width + cells[:, 2] + self.shift
+
+    def offset_key(self, offset: Tuple[int, int, int]) -> int:
+        # Keys are linear in the cell coordinates and the shift leaves a margin, so a neighbour is key + constant
+        return (offset[0] * self.width + offset[1]) * self.width + offset[2]
+
+    def lookup(self, keys: np.ndarray) -> np.ndarray:
+        if not len(self.keys):
+            return np.full(len(keys), -1, dtype=np.int64)
+        found = np.minimum(np.searchsorted(self.keys, keys), len(self.keys) - 1)
+        return np.where(self.keys[found] == keys, found, -1)
+
+    def neighbour_pairs(self, cells: np.ndarray, other: 'GridIndex',
+                        offsets: Tuple[Tuple[int, int, int], ...]) -> Tuple[np.ndarray, np.ndarray]:
+        # (cell here, cell in other) for every occupied neighbour at the given offsets; both grids share a cell size
+        left, right = [], []
+        for offset in offsets:
+            found = other.lookup(self.keys[cells] + self.offset_key(offset))
+            hit = found >= 0
+            left.append(cells[hit])
+            right.append(found[hit])
+        if not left:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        return np.concatenate(left), np.concatenate(right)
+
+
+def pair_batches(sizes: np.ndarray, budget: int = PAIR_BUDGET) -> Iterator[slice]:
+    ends = np.cumsum(sizes)
+    start = 0
+    while start < len(sizes):
+        done = ends[start - 1] if start else 0
+        stop = max(int(np.searchsorted(ends, done + budget, side='right')), start + 1)
+        yield slice(start, stop)
+        start = stop
+
+
+def expand_pairs(left_start: np.ndarray, left_count: np.ndarray, right_start: np.ndarray,
+                 right_count: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # Every (i, j) between two runs of a grid's sorted order, for a batch of cell pairs at once
+    sizes = left_count * right_count
+    pair = np.repeat(np.arange(len(sizes)), sizes)
+    local = np.arange(int(sizes.sum())) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+    return pair, left_start[pair] + local // right_count[pair], right_start[pair] + local % right_count[pair]
+
+
+def chord_squared(vectors: np.ndarray, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    delta = vectors[left] - vectors[right]
+    return np.einsum('ij,ij->i', delta, delta)
+
+
+def components(count: int, left: np.ndarray, right: np.ndarray, labels: np.ndarray = None) -> np.ndarray:
+    # Connected components by hooking each edge's larger root onto the smaller, then pointer jumping to the roots
+    labels = np.arange(count) if labels is None else labels.copy()
+    while True:
+        low, high = labels[left], labels[right]
+        linked = low != high
+        if not linked.any():
+            return labels
+        low, high = np.minimum(low[linked], high[linked]), np.maximum(low[linked], high[linked])
+        np.minimum.at(labels, high, low)
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+
+
+class Clusters(Sequence):
+
+    def __init__(self, points: np.ndarray, labels: np.ndarray, core: np.ndarray, radius_km: float, min_points: int):
+        self.points = points
+        self.labels = labels
+        self.core = core
+        self.radius_km = radius_km
+        self.min_points = min_points
+        self.order = np.argsort(labels, kind='stable')
+        self.bounds = np.searchsorted(labels[self.order], np.arange(labels.max(initial=-1) + 2))
+
+    def __len__(self) -> int:
+        return len(self.bounds) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.as_dict(label) for label in range(len(self))[index]]
+        return self.as_dict(range(len(self))[index])
+
+    def members(self, label: int) -> np.ndarray:
+        return self.order[self.bounds[label]:self.bounds[label + 1]]
+
+    def noise(self) -> np.ndarray:
+        return self.order[:self.bounds[0]]
+
+    def coordinates(self, label: int) -> List[Tuple[float, float]]:
+        # Distinct locations in the order they first appear in the input
+        points = self.points[self.members(label)]
+        _, first = np.unique(points, axis=0, return_index=True)
+        return [tuple(point) for point in points[np.sort(first)].tolist()]
+
+    def center(self, label: int) -> Tuple[float, float]:
+        x, y, z = unit_vectors(self.points[self.members(label)]).mean(axis=0)
+        return float(np.degrees(np.arctan2(z, np.hypot(x, y)))), float(np.degrees(np.arctan2(y, x)))
+
+    def as_dict(self, label: int) -> Dict[str, Any]:
+        members = self.members(label)
+        return {
+            'label': label,
+            'size': len(members),
+            'core_size': int(self.core[members].sum()),
+            'center': self.center(label),
+            'members': members.tolist()
+        }
+
+
+def dbscan(coords, radius_km: float = RADIUS_KM, min_points: int = MIN_POINTS) -> Clusters:
+    if radius_km <= 0:
+        raise ValueError(f"Clustering radius must be positive, got {radius_km}")
+
+    # Repeated locations are clustered once and carry their multiplicity as a weight
+    points = as_points(coords)
+    unique, first, inverse, weights = np.unique(points, axis=0, return_index=True, return_inverse=True,
+                                                return_counts=True)
+    inverse = inverse.reshape(-1)
+    vectors = unit_vectors(unique)
+    chord = chord_length(radius_km)
+    limit = chord ** 2
+    # A cell's diagonal is exactly one chord, so every pair inside a cell is within the radius
+    cell_size = chord / np.sqrt(3)
+    index = GridIndex(vectors, cell_size)
+    evaluated = 0
+
+    cell_weight = np.add.reduceat(weights[index.order], index.starts) if len(index) else np.empty(0, dtype=np.int64)
+    neighbours = cell_weight[index.cell_of]
+    # Only points in cells lighter than min_points need their neighbours in other cells counted
+    sparse = np.flatnonzero(cell_weight < min_points)
+    left, right = index.neighbour_pairs(sparse, index, NEIGHBOUR_OFFSETS)
+    sizes = index.counts[left] * index.counts[right]
+    for batch in pair_batches(sizes):
+        _, i, j = expand_pairs(index.starts[left[batch]], index.counts[left[batch]],
+                               index.starts[right[batch]], index.counts[right[batch]])
+        i, j = index.order[i], index.order[j]
+        evaluated += len(i)
+        hit = chord_squared(vectors, i, j) < limit
+        neighbours += np.bincount(i[hit], weights=weights[j[hit]], minlength=len(unique)).astype(np.int64)
+    core = neighbours >= min_points
+
+    # Core points sharing a cell are already connected, so components are computed over the cells of a core-only grid
+    core_points = np.flatnonzero(core)
+    core_vectors = vectors[core_points]
+    core_index = GridIndex(core_vectors, cell_size)
+    left, right = core_index.neighbour_pairs(np.arange(len(core_index)), core_index, HALF_OFFSETS)
+
+    # A small sample from each side links most neighbouring cells; only the rest need every pair checked
+    linked = np.zeros(len(left), dtype=bool)
+    sample_left = np.minimum(core_index.counts[left], SAMPLE_SIZE)
+    sample_right = np.minimum(core_index.counts[right], SAMPLE_SIZE)
+    for batch in pair_batches(sample_left * sample_right):
+        pair, i, j = expand_pairs(core_index.starts[left[batch]], sample_left[batch],
+                                  core_index.starts[right[batch]], sample_right[batch])
+        evaluated += len(i)
+        hit = chord_squared(core_vectors, core_index.order[i], core_index.order[j]) < limit
+        linked[batch.start + np.unique(pair[hit])] = True
+    cell_labels = components(len(core_index), left[linked], right[linked])
+
+    pending = np.flatnonzero(~linked)
+    pending = pending[cell_labels[left[pending]] != cell_labels[right[pending]]]
+    while len(pending):
+        batch = next(pair_batches(core_index.counts[left[pending]] * core_index.counts[right[pending]]))
+        current, pending = pending[batch], pending[batch.stop:]
+        pair, i, j = expand_pairs(core_index.starts[left[current]], core_index.counts[left[current]],
+                                  core_index.starts[right[current]], core_index.counts[right[current]])
+        evaluated += len(i)
+        hit = chord_squared(core_vectors, core_index.order[i], core_index.order[j]) < limit
+        found = current[np.unique(pair[hit])]
+        cell_labels = components(len(core_index), left[found], right[found], cell_labels)
+        pending = pending[cell_labels[left[pending]] != cell_labels[right[pending]]]
+
+    point_labels = np.full(len(unique), -1, dtype=np.int64)
+    point_labels[core_points] = cell_labels[core_index.cell_of]
+
+    # Border points join the cluster of their nearest core point; the rest are noise
+    border = np.flatnonzero(~core)
+    if len(border) and len(core_index):
+        best = np.full(len(unique), np.inf)
+        border_index = GridIndex(vectors[border], cell_size)
+        left, right = border_index.neighbour_pairs(np.arange(len(border_index)), core_index, OFFSETS)
+        for batch in pair_batches(border_index.counts[left] * core_index.counts[right]):
+            _, i, j = expand_pairs(border_index.starts[left[batch]], border_index.counts[left[batch]],
+                                   core_index.starts[right[batch]], core_index.counts[right[batch]])
+            i, j = border[border_index.order[i]], core_points[core_index.order[j]]
+            evaluated += len(i)
+            distance = chord_squared(vectors, i, j)
+            hit = np.flatnonzero(distance < limit)
+            hit = hit[np.lexsort((distance[hit], i[hit]))]
+            hit = hit[np.r_[True, i[hit][1:] != i[hit][:-1]]] if len(hit) else hit
+            closer = distance[hit] < best[i[hit]]
+            best[i[hit][closer]] = distance[hit][closer]
+            point_labels[i[hit][closer]] = point_labels[j[hit][closer]]
+
+    instrumentation.count(evaluated)
+
+    # Clusters are numbered by the first input position among their members
+    clustered = np.flatnonzero(point_labels >= 0)
+    roots, root_of = np.unique(point_labels[clustered], return_inverse=True)
+    earliest = np.full(len(roots), len(points), dtype=np.int64)
+    np.minimum.at(earliest, root_of.reshape(-1), first[clustered])
+    rank = np.empty(len(roots), dtype=np.int64)
+    rank[np.argsort(earliest, kind='stable')] = np.arange(len(roots))
+    point_labels[clustered] = rank[root_of.reshape(-1)]
+
+    return Clusters(points, point_labels[inverse], core[inverse], radius_km, min_points)
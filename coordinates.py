@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+
+from collections.abc import Sequence
+from typing import Any, Dict, Tuple
+
+import numpy as np
+
+import instrumentation
+
+FORMATS = ((6, 6), (5, 7), (7, 5), (4, 8))
+BLOCK_SIZE = 1 << 16
+
+CANDIDATE_DTYPE = np.dtype([
+    ('position', np.int64),
+    ('format', np.uint8),
+    ('lat_decimal', np.uint8),
+    ('lon_decimal', np.uint8),
+    ('lat', np.float64),
+    ('lon', np.float64)
+])
+
+
+def digit_windows(data: str) -> Tuple[np.ndarray, np.ndarray]:
+    raw = np.frombuffer(data.encode('latin-1', 'replace'), dtype=np.uint8).astype(np.int64) - ord('0')
+    invalid = (raw < 0) | (raw > 9)
+    return np.where(invalid, 0, raw), invalid
+
+
+def window_values(values: np.ndarray, positions: np.ndarray, offset: int, length: int) -> np.ndarray:
+    result = np.zeros(len(positions), dtype=np.int64)
+    for k in range(length):
+        result = result * 10 + values[positions + offset + k]
+    return result
+
+
+class CoordinateCandidates(Sequence):
+
+    def __init__(self, data: str, records: np.ndarray, formats: Tuple = FORMATS, total: int = None):
+        self.data = data
+        self.records = records
+        self.formats = formats
+        # Candidates found, which exceeds len() when only the first few records were kept
+        self.total = len(records) if total is None else total
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.as_dict(record) for record in self.records[index]]
+        return self.as_dict(self.records[index])
+
+    def as_dict(self, record) -> Dict[str, Any]:
+        position = int(record['position'])
+        lat_len, lon_len = self.formats[record['format']]
+        segment = self.data[position:position + lat_len + lon_len]
+
+        return {
+            'lat': float(record['lat']),
+            'lon': float(record['lon']),
+            'position': position,
+            'format': f'{lat_len}_{lon_len}',
+            'lat_str': segment[:lat_len],
+            'lon_str': segment[lat_len:]
+        }
+
+
+def block_hits(values: np.ndarray, positions: np.ndarray, lat_len: int,
+               lon_len: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    lat_ints = window_values(values, positions, 0, lat_len).astype(np.float64)
+    lon_ints = window_values(values, positions, lat_len, lon_len).astype(np.float64)
+
+    # Every decimal-point placement at once: digits / 10**k for k = 1 .. len-1
+    lat = lat_ints[:, None] / 10.0 ** np.arange(lat_len - 1, 0, -1)
+    lon = lon_ints[:, None] / 10.0 ** np.arange(lon_len - 1, 0, -1)
+    hits = ((lat >= -90) & (lat <= 90))[:, :, None] & ((lon >= -180) & (lon <= 180))[:, None, :]
+    return lat, lon, hits
+
+
+def count_block(values: np.ndarray, positions: np.ndarray, formats: Tuple) -> int:
+    return sum(int(np.count_nonzero(block_hits(values, positions, lat_len, lon_len)[2]))
+               for lat_len, lon_len in formats)
+
+
+def scan_block(values: np.ndarray, positions: np.ndarray, formats: Tuple) -> np.ndarray:
+    found = []
+    for format_index, (lat_len, lon_len) in enumerate(formats):
+        lat, lon, hits = block_hits(values, positions, lat_len, lon_len)
+        rows, lat_slots, lon_slots = np.nonzero(hits)
+        block = np.empty(len(rows), dtype=CANDIDATE_DTYPE)
+        block['position'] = positions[rows]
+        block['format'] = format_index
+        block['lat_decimal'] = lat_slots + 1
+        block['lon_decimal'] = lon_slots + 1
+        block['lat'] = lat[rows, lat_slots]
+        block['lon'] = lon[rows, lon_slots]
+        found.append(block)
+
+    records = np.concatenate(found) if found else np.empty(0, dtype=CANDIDATE_DTYPE)
+    order = np.lexsort((records['lon_decimal'], records['lat_decimal'], records['format'], records['position']))
+    return records[order]
+
+
+def find_coordinates(data: str, first_only: bool = False, formats: Tuple = FORMATS,
+                     block_size: int = BLOCK_SIZE, limit: int = None) -> CoordinateCandidates:
+    # With a limit only the first `limit` records are kept (0 only counts); total still counts every candidate
+    window = max(lat_len + lon_len for lat_len, lon_len in formats)
+    starts = len(data) - window + 1
+    if starts <= 0:
+        return CoordinateCandidates(data, np.empty(0, dtype=CANDIDATE_DTYPE), formats)
+
+    values, invalid = digit_windows(data)
+    broken = np.convolve(invalid, np.ones(window, dtype=np.int64), mode='valid') > 0
+
+    blocks = []
+    kept = total = 0
+    low = 0
+    # First-hit mode starts with small blocks and grows them, so an early hit returns quickly
+    step = min(256, block_size) if first_only else block_size
+    while low < starts:
+        positions = np.arange(low, min(low + step, starts))
+        positions = positions[~broken[positions]]
+        if limit is not None and kept >= limit:
+            total += count_block(values, positions, formats)
+        else:
+            records = scan_block(values, positions, formats)
+            if first_only and len(records):
+                instrumentation.count(1)
+                return CoordinateCandidates(data, records[:1], formats)
+            total += len(records)
+            if limit is not None:
+                records = records[:limit - kept]
+            kept += len(records)
+            blocks.append(records)
+        low += step
+        step = min(step * 2, block_size)
+
+    records = np.concatenate(blocks) if blocks else np.empty(0, dtype=CANDIDATE_DTYPE)
+    instrumentation.count(total)
+    return CoordinateCandidates(data, records, formats, total)
+
+
+def count_coordinates(data: str, formats: Tuple = FORMATS, block_size: int = BLOCK_SIZE) -> int:
+    return find_coordinates(data, formats=formats, block_size=block_size, limit=0).total
@@ -9,24 +9,43 @@ import re
 import math
 import colorsys
 
+import numpy as np
+
+import coordinates
+import geodesy
+import primes
+import reporting
+from palindromes import PalindromeIndex
+from repeats import RepeatIndex
+
+ORIGINAL_SEQUENCE = "10412790658919985359827898739594318956404425106955675643739226952372682423852959081739834390370374475764863415203423499357108713631"
+EXTRACTED_HEX = "4e58595e0620203263233e2347"
+DECODED_ASCII = "NXY^[6]  2c#>#G"
+TIMESTAMPS = (1314412894, 1482251782, 1499334176, 1577459744, 1644299046, 1663254051)
+COORDINATES = (
+    (2.0056, 2.2878), (2.0056, 22.8780), (20.0560, 2.2878),
+    (20.0560, 22.8780), (2.2878, 1.5680)
+)
+COLORS = ((78, 88, 89), (94, 6, 32), (32, 50, 99), (35, 62, 35))
+
 class ComprehensiveAnalyzer:
-    def __init__(self):
+    def __init__(self, original_sequence: str = ORIGINAL_SEQUENCE, extracted_hex: str = EXTRACTED_HEX,
+                 decoded_ascii: str = DECODED_ASCII, timestamps: List[int] = TIMESTAMPS,
+                 coordinates: List[Tuple[float, float]] = COORDINATES, colors: List[Tuple[int, int, int]] = COLORS):
         self.report_lines = []
         self.findings = {}
+        self.compress_report = False
         
-        self.original_sequence = "10412790658919985359827898739594318956404425106955675643739226952372682423852959081739834390370374475764863415203423499357108713631"
-        self.extracted_hex = "4e58595e0620203263233e2347"
-        self.decoded_ascii = "NXY^[6]  2c#>#G"
-        self.binary_sequence = "01001110010110000101100101011110000001100010000000100000001100100110001100100011001111100010001101000111"
+        self.original_sequence = original_sequence
+        self.extracted_hex = extracted_hex
+        self.decoded_ascii = decoded_ascii
+        self.binary_sequence = ''.join(f"{byte:08b}" for byte in bytes.fromhex(extracted_hex))
         
-        self.timestamps = [1314412894, 1482251782, 1499334176, 1577459744, 1644299046, 1663254051]
+        self.timestamps = list(timestamps)
         
-        self.coordinates = [
-            (2.0056, 2.2878), (2.0056, 22.8780), (20.0560, 2.2878),
-            (20.0560, 22.8780), (2.2878, 1.5680)
-        ]
+        self.coordinates = [tuple(coord) for coord in coordinates]
         
-        self.colors = [(78, 88, 89), (94, 6, 32), (32, 50, 99), (35, 62, 35)]
+        self.colors = [tuple(color) for color in colors]
         
         self.palindromes = ["78987", "7447", "13631"]
         self.pattern_739_positions = [26, 56, 83]
@@ -201,15 +220,12 @@ class ComprehensiveAnalyzer:
         }
         
         distances = {}
-        for i, coord1 in enumerate(self.coordinates):
-            for j, coord2 in enumerate(self.coordinates):
-                if i < j:
-                    dist = self.haversine_distance(coord1, coord2)
-                    distances[f"Point_{i+1}_to_Point_{j+1}"] = {
-                        "distance_km": round(dist, 2),
-                        "from": coord1,
-                        "to": coord2
-                    }
+        for i, j, dist in geodesy.pairs(self.coordinates):
+            distances[f"Point_{i+1}_to_Point_{j+1}"] = {
+                "distance_km": round(dist, 2),
+                "from": self.coordinates[i],
+                "to": self.coordinates[j]
+            }
         
         analysis["distances"] = distances
         
@@ -230,6 +246,51 @@ class ComprehensiveAnalyzer:
         
         return analysis
 
+    def analyze_candidate_geography(self) -> Dict[str, Any]:
+        self.log("🛰️ Analyzing every candidate coordinate in the original sequence...")
+        
+        candidates = coordinates.find_coordinates(self.original_sequence)
+        points = np.unique(np.column_stack([candidates.records['lat'], candidates.records['lon']]), axis=0)
+        
+        analysis = {
+            "candidate_count": len(candidates),
+            "unique_locations": len(points),
+            "nearest_to_known": {},
+            "nearest_neighbour_km": {},
+            "closest_pairs": []
+        }
+        if not len(points):
+            return analysis
+        
+        indices, distances = geodesy.nearest(self.coordinates, points, k=3)
+        for i, coord in enumerate(self.coordinates):
+            analysis["nearest_to_known"][f"Point_{i+1}"] = [
+                {"candidate": tuple(points[j].tolist()), "distance_km": round(dist, 2)}
+                for j, dist in zip(indices[i].tolist(), distances[i].tolist())
+            ]
+        
+        indices, distances = geodesy.nearest(points)
+        if distances.shape[1]:
+            spacing = distances[:, 0]
+            analysis["nearest_neighbour_km"] = {
+                "min": round(float(spacing.min()), 2),
+                "median": round(float(np.median(spacing)), 2),
+                "mean": round(float(spacing.mean()), 2),
+                "max": round(float(spacing.max()), 2)
+            }
+            # Mutual nearest neighbours give the same pair from either end, so pairs are deduplicated as (min, max)
+            pairs = np.sort(np.column_stack((np.arange(len(points)), indices[:, 0])), axis=1)
+            pairs, first = np.unique(pairs, axis=0, return_index=True)
+            pair_km = spacing[first]
+            closest = np.argsort(pair_km, kind='stable')[:5]
+            analysis["closest_pairs"] = [
+                {"from": tuple(points[i].tolist()), "to": tuple(points[j].tolist()),
+                 "distance_km": round(float(pair_km[k]), 2)}
+                for k, (i, j) in zip(closest.tolist(), pairs[closest].tolist())
+            ]
+        
+        return analysis
+
     def analyze_color_patterns(self) -> Dict[str, Any]:
         self.log("🎨 Analyzing color patterns and progressions...")
         
@@ -315,18 +376,6 @@ class ComprehensiveAnalyzer:
         ]
         return hypotheses
 
-    def haversine_distance(self, coord1: Tuple[float, float], coord2: Tuple[float, float]) -> float:
-        lat1, lon1 = math.radians(coord1[0]), math.radians(coord1[1])
-        lat2, lon2 = math.radians(coord2[0]), math.radians(coord2[1])
-        
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        
-        a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-        c = 2 * math.asin(math.sqrt(a))
-        
-        return 6371 * c
-
     def check_fibonacci_sequence(self, numbers: List[int]) -> bool:
         if len(numbers) < 3:
             return False
@@ -378,15 +427,12 @@ class ComprehensiveAnalyzer:
     def find_palindromes(self, sequence: str) -> List[Dict[str, Any]]:
         palindromes = []
         
-        for length in range(3, min(8, len(sequence))):
-            for start in range(len(sequence) - length + 1):
-                substr = sequence[start:start + length]
-                if substr == substr[::-1]:
-                    palindromes.append({
-                        "palindrome": substr,
-                        "position": start,
-                        "length": length
-                    })
+        for substr, start, length in PalindromeIndex(sequence).occurrences(3, min(7, len(sequence) - 1)):
+            palindromes.append({
+                "palindrome": substr,
+                "position": start,
+                "length": length
+            })
         
         return palindromes
 
@@ -414,21 +460,7 @@ class ComprehensiveAnalyzer:
         return patterns
 
     def find_repeating_binary_patterns(self, binary: str) -> Dict[str, List[int]]:
-        patterns = {}
-        
-        for length in range(3, 9):
-            for start in range(len(binary) - length):
-                pattern = binary[start:start + length]
-                
-                positions = []
-                for i in range(len(binary) - length + 1):
-                    if binary[i:i + length] == pattern:
-                        positions.append(i)
-                
-                if len(positions) > 1:
-                    patterns[pattern] = positions
-        
-        return patterns
+        return RepeatIndex(binary, max_length=8).repeats(3, 8)
 
     def test_geometric_shapes(self, coordinates: List[Tuple[float, float]]) -> Dict[str, Any]:
         analysis = {}
@@ -439,7 +471,7 @@ class ComprehensiveAnalyzer:
                 sides = []
                 for i in range(3):
                     j = (i + 1) % 3
-                    dist = self.haversine_distance(coords[i], coords[j])
+                    dist = geodesy.haversine(coords[i], coords[j])
                     sides.append(dist)
                 
                 analysis["triangle"] = {
@@ -477,20 +509,12 @@ class ComprehensiveAnalyzer:
         return coordinates
 
     def prime_factorization(self, n: int) -> List[int]:
-        factors = []
-        d = 2
-        while d * d <= n:
-            while n % d == 0:
-                factors.append(d)
-                n //= d
-            d += 1
-        if n > 1:
-            factors.append(n)
-        return factors
+        return primes.factorize(n)
 
     def generate_comprehensive_report(self) -> str:
-        report = []
-        
+        return reporting.render(self.write_comprehensive_report)
+
+    def write_comprehensive_report(self, report):
         report.append("# Comprehensive Deep Analysis Report")
         report.append("## Phase 6: Advanced Cross-Layer Analysis")
         report.append("")
@@ -511,6 +535,7 @@ class ComprehensiveAnalyzer:
             ("Non-Extracted Digits Analysis", self.analyze_non_extracted_digits()),
             ("Advanced Binary Analysis", self.analyze_binary_advanced()),
             ("Geographic Pattern Analysis", self.analyze_geographic_patterns()),
+            ("Candidate Geography Analysis", self.analyze_candidate_geography()),
             ("Color Pattern Analysis", self.analyze_color_patterns()),
             ("Cross-Layer Correlation Analysis", self.cross_layer_correlation_analysis())
         ]
@@ -536,8 +561,6 @@ class ComprehensiveAnalyzer:
         
         report.append("---")
         report.append("*Analysis completed by Comprehensive Deep Analysis Module (Phase 6)*")
-        
-        return "\n".join(report)
 
     def format_analysis_section(self, analysis: Dict[str, Any]) -> str:
         lines = []
@@ -569,17 +592,21 @@ class ComprehensiveAnalyzer:
         
         os.makedirs("/workspace", exist_ok=True)
         
-        report_content = self.generate_comprehensive_report()
-        
         report_path = "/workspace/comprehensive_analysis_report.md"
-        with open(report_path, 'w', encoding='utf-8') as f:
-            f.write(report_content)
+        with reporting.ReportWriter(report_path, compress=self.compress_report) as report:
+            self.write_comprehensive_report(report)
+        report_path = report.path
         
         self.log(f"✅ Comprehensive analysis complete! Report saved to: {report_path}")
         print(f"\n📊 Report generated: {report_path}")
-        print(f"📝 Report size: {len(report_content)} characters")
+        print(f"📝 Report size: {report.characters_written} characters")
         print(f"⏱️  Analysis duration: {time.time() - self.start_time:.2f} seconds")
+        
+        return report_path
 
-if __name__ == "__main__":
+def main():
     analyzer = ComprehensiveAnalyzer()
-    analyzer.run_analysis()
\ No newline at end of file
+    return analyzer.run_analysis()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
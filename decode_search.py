@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import time
+import heapq
+import argparse
+import functools
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Tuple
+
+import digits
+import instrumentation
+import ngrams
+import scoring
+
+GROUP_MODES = (2, 3, scoring.MIXED)
+SCORERS = {
+    'printable': scoring.PRINTABLE_SCORER,
+    'control_inclusive': scoring.CONTROL_INCLUSIVE_SCORER,
+    **ngrams.SCORERS
+}
+PARALLEL_THRESHOLD = 500_000
+# Rotation scores and decode() scores only differ by float rounding
+SCORE_TOLERANCE = 1e-6
+
+
+def extract(sequence: str, stride: int, offset: int = 0) -> str:
+    return sequence[offset::stride]
+
+
+def rotate(sequence: str, rotation: int) -> str:
+    if not sequence:
+        return sequence
+    rotation %= len(sequence)
+    return sequence[rotation:] + sequence[:rotation]
+
+
+def read_groups(sequence: str, group_size) -> List[str]:
+    if group_size == scoring.MIXED:
+        return scoring.mixed_groups(sequence)
+    return [sequence[i:i + group_size] for i in range(0, len(sequence) - group_size + 1, group_size)]
+
+
+def render_values(values: List[int], control_markers: bool = True) -> str:
+    table = scoring.RENDER_TABLES[control_markers]
+    return ''.join([table[value] if 0 <= value < len(table) else "?" for value in values])
+
+
+def decode(sequence: str, stride: int = 1, offset: int = 0, rotation: int = 0, group_size=2,
+           scorer: scoring.TableScorer = scoring.PRINTABLE_SCORER) -> Dict[str, Any]:
+    extracted = extract(sequence, stride, offset)
+    shifted = rotate(extracted, rotation)
+    values = [int(group) for group in read_groups(shifted, group_size)]
+
+    return {
+        'stride': stride,
+        'offset': offset,
+        'rotation': rotation,
+        'group_size': group_size,
+        'extracted': extracted,
+        'shifted': shifted,
+        'values': values,
+        'text': render_values(values),
+        'score': scorer.score_values(values)
+    }
+
+
+def group_count(length: int, group_size) -> int:
+    if group_size == scoring.MIXED:
+        return length // 3
+    return length // group_size
+
+
+def search_strides(sequence: str, strides: List[int], group_modes: Tuple, scorer: scoring.TableScorer,
+                   top_k: int, min_groups: int) -> Tuple[List[tuple], int]:
+    digit_array = digits.to_digit_array(sequence)
+    heap = []
+    evaluated = 0
+
+    for stride in strides:
+        for offset in range(stride):
+            extracted = digit_array[offset::stride]
+            for mode_rank, group_size in enumerate(group_modes):
+                if group_count(len(extracted), group_size) < min_groups:
+                    continue
+
+                scores = scorer.score_rotations(extracted, group_size)
+                evaluated += len(scores)
+
+                # Only the local top_k rotations can enter the global heap; among ties the smaller rotations go first
+                for rotation in scoring.top_indices(scores, top_k).tolist():
+                    entry = (float(scores[rotation]), -stride, -offset, -rotation, -mode_rank)
+                    if len(heap) < top_k:
+                        heapq.heappush(heap, entry)
+                    elif entry > heap[0]:
+                        heapq.heapreplace(heap, entry)
+
+    return heap, evaluated
+
+
+class DecodeSearch:
+
+    def __init__(self, scorer: scoring.TableScorer = scoring.PRINTABLE_SCORER, top_k: int = 20,
+                 group_modes: Tuple = GROUP_MODES, max_stride: int = None, max_default_stride: int = 100,
+                 min_groups: int = 4, workers: int = None):
+        self.scorer = scorer
+        self.top_k = max(1, top_k)
+        self.group_modes = tuple(group_modes)
+        self.max_stride = max_stride
+        self.max_default_stride = max_default_stride
+        self.min_groups = min_groups
+        self.workers = max(1, workers or os.cpu_count() or 1)
+
+        self.evaluated = 0
+        self.elapsed = 0.0
+
+    def strides(self, length: int) -> List[int]:
+        limit = self.max_stride or min(max(length // 2, 1), self.max_default_stride)
+        return list(range(1, limit + 1))
+
+    def search(self, sequence: str) -> List[Dict[str, Any]]:
+        start = time.perf_counter()
+        strides = self.strides(len(sequence))
+        worker = functools.partial(search_strides, sequence, group_modes=self.group_modes, scorer=self.scorer,
+                                   top_k=self.top_k, min_groups=self.min_groups)
+
+        if self.workers == 1 or len(sequence) * len(strides) < PARALLEL_THRESHOLD:
+            partials = [worker(strides)]
+        else:
+            # Interleave strides so every worker gets a similar amount of work
+            shares = [strides[i::self.workers] for i in range(self.workers)]
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                partials = list(executor.map(worker, [share for share in shares if share]))
+
+        entries = heapq.nlargest(self.top_k, (entry for heap, _ in partials for entry in heap))
+        self.evaluated = sum(evaluated for _, evaluated in partials)
+        self.elapsed = time.perf_counter() - start
+        instrumentation.count(self.evaluated)
+
+        results = []
+        # Heap keys are negated so that ties prefer the smallest stride, offset, rotation and group mode
+        for score, neg_stride, neg_offset, neg_rotation, neg_mode in entries:
+            result = decode(sequence, -neg_stride, -neg_offset, -neg_rotation, self.group_modes[-neg_mode], self.scorer)
+            # Debug-only consistency check; otherwise each result reports the decode's own score
+            assert abs(result['score'] - score) <= SCORE_TOLERANCE, (
+                f"Scorer '{self.scorer.name}' ranked stride {result['stride']}, offset {result['offset']}, "
+                f"rotation {result['rotation']}, group {result['group_size']} at {score}, "
+                f"but the decode scores {result['score']}")
+            results.append(result)
+        return results
+
+    def throughput(self) -> Dict[str, Any]:
+        elapsed = self.elapsed or 1e-9
+        return {
+            'candidates': self.evaluated,
+            'elapsed_seconds': round(self.elapsed, 4),
+            'candidates_per_second': round(self.evaluated / elapsed, 2),
+            'workers': self.workers
+        }
+
+
+def parse_group_mode(value: str):
+    return value if value == scoring.MIXED else int(value)
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Exhaustive stride/offset/rotation/group decode search")
+    parser.add_argument("sequence", nargs="?", help="Digit sequence (default: the Cicada number)")
+    parser.add_argument("--top", type=int, default=10, help="Number of decodes to keep")
+    parser.add_argument("--max-stride", type=int, default=None, help="Largest stride to try")
+    parser.add_argument("--groups", nargs="+", type=parse_group_mode, default=list(GROUP_MODES),
+                        help="Group sizes to try: 2, 3 and/or mixed")
+    parser.add_argument("--scorer", choices=sorted(SCORERS), default="printable", help="Scoring table or language model")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    if args.sequence:
+        sequence = args.sequence
+    else:
+        from c import CicadaFocusedDecoder
+        sequence = CicadaFocusedDecoder().original_number
+
+    search = DecodeSearch(SCORERS[args.scorer], args.top, args.groups, args.max_stride, workers=args.workers)
+    results = search.search(sequence)
+
+    for rank, result in enumerate(results, 1):
+        print(f"#{rank:<3} {result['score']:5.1f}%  stride={result['stride']} offset={result['offset']} "
+              f"rotation={result['rotation']} group={result['group_size']}  '{result['text'][:60]}'")
+
+    stats = search.throughput()
+    print(f"⚡ {stats['candidates']} candidates in {stats['elapsed_seconds']}s "
+          f"({stats['candidates_per_second']:.0f}/s, {stats['workers']} workers)", file=sys.stderr)
+    return results
+
+
+if __name__ == "__main__":
+    main()
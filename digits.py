@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+
+import numpy as np
+from typing import List
+
+import primes
+
+DIGIT_DTYPE = np.uint8
+
+
+def to_digit_array(number_string: str) -> np.ndarray:
+    return np.frombuffer(number_string.encode('ascii'), dtype=DIGIT_DTYPE) - ord('0')
+
+
+def to_digit_string(digits: np.ndarray) -> str:
+    return (np.asarray(digits, dtype=DIGIT_DTYPE) + ord('0')).tobytes().decode('ascii')
+
+
+def expand_values(values: np.ndarray) -> np.ndarray:
+    # Values 10-19 are written out as two digits, matching ''.join(str(v) for v in values)
+    values = np.asarray(values, dtype=DIGIT_DTYPE)
+    wide = values >= 10
+    if not wide.any():
+        return values
+
+    ends = np.cumsum(1 + wide.astype(np.intp)) - 1
+    expanded = np.empty(len(values) + int(wide.sum()), dtype=DIGIT_DTYPE)
+    expanded[ends] = values % 10
+    expanded[ends[wide] - 1] = values[wide] // 10
+    return expanded
+
+
+def every_nth(digits: np.ndarray, n: int, start_offset: int = 0) -> np.ndarray:
+    return digits[start_offset::n]
+
+
+def gather_positions(digits: np.ndarray, positions) -> np.ndarray:
+    positions = np.asarray(positions, dtype=np.intp)
+    positions = positions[(positions >= 1) & (positions <= len(digits))]
+    return digits[positions - 1]
+
+
+def prime_positions(digits: np.ndarray) -> np.ndarray:
+    return digits[primes.prime_indices(len(digits))]
+
+
+def tiled_key(key: str, length: int) -> np.ndarray:
+    key_digits = to_digit_array(key)
+    return np.resize(key_digits, length)
+
+
+def xor_with_key(digits: np.ndarray, key: str) -> np.ndarray:
+    return expand_values(digits ^ tiled_key(key, len(digits)))
+
+
+def caesar_shift(digits: np.ndarray, shift: int) -> np.ndarray:
+    return ((digits.astype(np.int16) + shift) % 10).astype(DIGIT_DTYPE)
+
+
+def transpose_permutation(length: int, block_size: int) -> np.ndarray:
+    positions = np.arange(length)
+    return np.argsort(positions % block_size, kind='stable')
+
+
+def transpose_blocks(digits: np.ndarray, block_size: int) -> np.ndarray:
+    return digits[transpose_permutation(len(digits), block_size)]
+
+
+def concatenate_ranges(digits: np.ndarray, ranges: List[tuple]) -> np.ndarray:
+    if not ranges:
+        return digits[:0]
+    return np.concatenate([digits[start:end] for start, end in ranges])
@@ -8,25 +8,50 @@ from datetime import datetime
 from typing import List, Dict, Tuple, Any
 import hashlib
 
+import clustering
+import geocoder
+import geodesy
+import reporting
+from palindromes import PalindromeIndex
+
+EXTRACTED_HEX = "4e58595e0620203263233e2347"
+PRIMARY_COMMAND = "NXY^[ACK]  2c#>#G"
+TIMESTAMP_COORDINATE = (78.125568, 66.839302)
+CENTROID_COORDINATE = (9.2822, 10.37992)
+XOR_RESULT = 'btur*[12][12][30]O[15][18][15]k'
+NON_EXTRACTED_SEQUENCE = "104179068919985359827898739943195644425069567563739269537262423529508179834903737445764634120343499571071361"
+INTERVALS = (167838888, 17082394, 78125568, 66839302, 18955005)
+INTERVAL_ASCII = ('-', '`', 'F', 'Y', 'C')
+PALINDROMES = ('919', '535', '444', '373', '262', '242', '7887', '89198', '85358')
+ORIGINAL_COORDINATES = (
+    (2.0056, 2.2878), (2.0056, 22.8780), (20.0560, 2.2878),
+    (20.0560, 22.8780), (2.2878, 1.5680)
+)
+
 class TargetedAnalyzer:
-    def __init__(self):
+    def __init__(self, extracted_hex: str = EXTRACTED_HEX, primary_command: str = PRIMARY_COMMAND,
+                 timestamp_coordinate: Tuple[float, float] = TIMESTAMP_COORDINATE,
+                 centroid_coordinate: Tuple[float, float] = CENTROID_COORDINATE, xor_result: str = XOR_RESULT,
+                 non_extracted_sequence: str = NON_EXTRACTED_SEQUENCE, intervals: List[int] = INTERVALS,
+                 interval_ascii: List[str] = INTERVAL_ASCII, palindromes: List[str] = PALINDROMES,
+                 original_coordinates: List[Tuple[float, float]] = ORIGINAL_COORDINATES):
         self.report_lines = []
         self.start_time = time.time()
+        self.compress_report = False
         
-        self.timestamp_coordinate = (78.125568, 66.839302)
-        self.centroid_coordinate = (9.2822, 10.37992)
-        self.xor_result = 'btur*[12][12][30]O[15][18][15]k'
-        self.non_extracted_sequence = "104179068919985359827898739943195644425069567563739269537262423529508179834903737445764634120343499571071361"
+        self.extracted_hex = extracted_hex
+        self.primary_command = primary_command
+        self.timestamp_coordinate = tuple(timestamp_coordinate)
+        self.centroid_coordinate = tuple(centroid_coordinate)
+        self.xor_result = xor_result
+        self.non_extracted_sequence = non_extracted_sequence
         
-        self.intervals = [167838888, 17082394, 78125568, 66839302, 18955005]
-        self.interval_ascii = ['-', '`', 'F', 'Y', 'C']
+        self.intervals = list(intervals)
+        self.interval_ascii = list(interval_ascii)
         
-        self.palindromes = ['919', '535', '444', '373', '262', '242', '7887', '89198', '85358']
+        self.palindromes = list(palindromes)
         
-        self.original_coordinates = [
-            (2.0056, 2.2878), (2.0056, 22.8780), (20.0560, 2.2878),
-            (20.0560, 22.8780), (2.2878, 1.5680)
-        ]
+        self.original_coordinates = [tuple(coord) for coord in original_coordinates]
 
     def log(self, message: str):
         timestamp = datetime.now().strftime("%H:%M:%S")
@@ -34,7 +59,7 @@ class TargetedAnalyzer:
         print(f"[INFO] {message}")
 
     def investigate_timestamp_coordinate(self) -> Dict[str, Any]:
-        self.log("🎯 Investigating timestamp-derived coordinate (78.125568, 66.839302)")
+        self.log(f"🎯 Investigating timestamp-derived coordinate {self.timestamp_coordinate}")
         
         lat, lon = self.timestamp_coordinate
         analysis = {
@@ -63,7 +88,7 @@ class TargetedAnalyzer:
             "ratio": lat / lon if lon != 0 else "undefined"
         }
         
-        coord_as_numbers = [78, 125568, 66, 839302]
+        coord_as_numbers = self.coordinate_components(self.timestamp_coordinate)
         analysis["encoding_tests"] = {
             "ascii_tests": [],
             "hash_tests": {},
@@ -86,18 +111,19 @@ class TargetedAnalyzer:
         }
         
         analysis["proximity_analysis"] = {}
+        distances = geodesy.distance_matrix(self.timestamp_coordinate, self.original_coordinates)[0].tolist()
+        bearings = geodesy.bearing_matrix(self.timestamp_coordinate, self.original_coordinates)[0].tolist()
         for i, orig_coord in enumerate(self.original_coordinates):
-            distance = self.haversine_distance(self.timestamp_coordinate, orig_coord)
             analysis["proximity_analysis"][f"distance_to_coord_{i+1}"] = {
                 "target": orig_coord,
-                "distance_km": round(distance, 2),
-                "bearing": self.calculate_bearing(self.timestamp_coordinate, orig_coord)
+                "distance_km": round(distances[i], 2),
+                "bearing": round(bearings[i], 1)
             }
         
         return analysis
 
     def investigate_xor_result(self) -> Dict[str, Any]:
-        self.log("🔓 Investigating XOR result: 'btur*[12][12][30]O[15][18][15]k'")
+        self.log(f"🔓 Investigating XOR result: '{self.xor_result}'")
         
         analysis = {
             "original_string": self.xor_result,
@@ -155,13 +181,20 @@ class TargetedAnalyzer:
             "mathematical_analysis": {}
         }
         
-        total_palindromes = len(self.palindromes)
+        palindrome_index = PalindromeIndex(sequence)
+        total_palindromes = palindrome_index.count(3)
         analysis["palindrome_density"] = {
             "total_palindromes": total_palindromes,
             "density_ratio": total_palindromes / len(sequence),
-            "palindrome_lengths": {len(p): [p for p in self.palindromes if len(p) == len(p)] for p in self.palindromes}
+            "palindrome_lengths": palindrome_index.distinct(3),
+            "window_density": palindrome_index.density(20, step=10)
         }
         
+        analysis["palindrome_positioning"] = [
+            {"palindrome": palindrome, "position": position, "length": length}
+            for palindrome, position, length in palindrome_index.maximal(3)
+        ]
+        
         split_attempts = []
         for palindrome in ['444', '373', '919']:
             if palindrome in sequence:
@@ -196,7 +229,7 @@ class TargetedAnalyzer:
         return analysis
 
     def investigate_centroid_coordinate(self) -> Dict[str, Any]:
-        self.log("📍 Investigating centroid coordinate (9.2822, 10.37992)")
+        self.log(f"📍 Investigating centroid coordinate {self.centroid_coordinate}")
         
         lat, lon = self.centroid_coordinate
         analysis = {
@@ -227,7 +260,7 @@ class TargetedAnalyzer:
         analysis["encoding_potential"] = {
             "potential_key": centroid_key,
             "key_as_ascii": chr(centroid_key) if 32 <= centroid_key <= 126 else f"[{centroid_key}]",
-            "distance_to_timestamp_coord": self.haversine_distance(self.centroid_coordinate, self.timestamp_coordinate)
+            "distance_to_timestamp_coord": geodesy.haversine(self.centroid_coordinate, self.timestamp_coordinate)
         }
         
         return analysis
@@ -261,7 +294,7 @@ class TargetedAnalyzer:
         all_numbers = (
             self.intervals + 
             [int(p) for p in self.palindromes if p.isdigit()] +
-            [78, 125568, 66, 839302]
+            self.coordinate_components(self.timestamp_coordinate)
         )
         
         analysis["numerical_correlations"] = {
@@ -280,57 +313,18 @@ class TargetedAnalyzer:
         return analysis
 
     def identify_geographic_region(self, lat: float, lon: float) -> str:
-        if 60 <= lat <= 85 and 30 <= lon <= 180:
-            return "Northern Russia/Siberia"
-        elif 0 <= lat <= 30 and 0 <= lon <= 30:
-            return "Central/West Africa"
-        elif -10 <= lat <= 20 and -20 <= lon <= 50:
-            return "Africa/Atlantic"
-        else:
-            return f"Latitude: {lat:.1f}, Longitude: {lon:.1f}"
+        return geocoder.describe(lat, lon)['label']
 
     def get_nearest_major_location(self, lat: float, lon: float) -> str:
-        if 9 <= lat <= 10 and 10 <= lon <= 11:
-            return "Near Nigeria/Cameroon border region"
-        elif 78 <= lat <= 79 and 66 <= lon <= 67:
-            return "Arctic Ocean/Novaya Zemlya region"
-        else:
-            return "Remote location - requires detailed mapping"
+        location = geocoder.describe(lat, lon)
+        return f"{location['nearest_place']}, {location['place_country']} ({location['distance_km']:.0f} km)"
 
     def assess_strategic_significance(self, lat: float, lon: float) -> str:
-        if 9 <= lat <= 10 and 10 <= lon <= 11:
-            return "Strategic: West African oil/gas region, major shipping routes"
-        elif 78 <= lat <= 79 and 66 <= lon <= 67:
-            return "Strategic: Arctic sea routes, natural resources, military importance"
-        else:
-            return "Significance requires further analysis"
+        significance = geocoder.describe(lat, lon)['significance']
+        return f"Strategic: {significance}" if significance else "Significance requires further analysis"
 
-    def haversine_distance(self, coord1: Tuple[float, float], coord2: Tuple[float, float]) -> float:
-        lat1, lon1 = math.radians(coord1[0]), math.radians(coord1[1])
-        lat2, lon2 = math.radians(coord2[0]), math.radians(coord2[1])
-        
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        
-        a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-        c = 2 * math.asin(math.sqrt(a))
-        
-        return 6371 * c
-
-    def calculate_bearing(self, coord1: Tuple[float, float], coord2: Tuple[float, float]) -> float:
-        lat1, lon1 = math.radians(coord1[0]), math.radians(coord1[1])
-        lat2, lon2 = math.radians(coord2[0]), math.radians(coord2[1])
-        
-        dlon = lon2 - lon1
-        
-        y = math.sin(dlon) * math.cos(lat2)
-        x = math.cos(lat1) * math.sin(lat2) - math.sin(lat1) * math.cos(lat2) * math.cos(dlon)
-        
-        bearing = math.atan2(y, x)
-        bearing = math.degrees(bearing)
-        bearing = (bearing + 360) % 360
-        
-        return round(bearing, 1)
+    def coordinate_components(self, coord: Tuple[float, float]) -> List[int]:
+        return [int(part) for value in coord for part in f"{value:.6f}".split('.')]
 
     def test_numbers_as_coordinates(self, numbers: List[int]) -> List[Tuple[float, float]]:
         coords = []
@@ -403,17 +397,10 @@ class TargetedAnalyzer:
         }
 
     def analyze_coordinate_clusters(self, coords: List[Tuple[float, float]]) -> Dict[str, Any]:
-        clusters = {}
         threshold = 1000
+        found = clustering.dbscan(coords, radius_km=threshold)
         
-        for i, coord in enumerate(coords):
-            cluster_id = f"cluster_{len(clusters)}"
-            clusters[cluster_id] = [coord]
-            
-            for j, other_coord in enumerate(coords):
-                if i != j and self.haversine_distance(coord, other_coord) < threshold:
-                    if other_coord not in clusters[cluster_id]:
-                        clusters[cluster_id].append(other_coord)
+        clusters = {f"cluster_{label}": found.coordinates(label) for label in range(len(found))}
         
         return {"clusters": clusters, "cluster_count": len(clusters)}
 
@@ -432,7 +419,11 @@ class TargetedAnalyzer:
         return result
 
     def attempt_master_key_derivation(self) -> Dict[str, Any]:
-        key_components = [771, 44, 78, 66, 9, 10]
+        key_components = [
+            sum(bytes.fromhex(self.extracted_hex)), 44,
+            int(self.timestamp_coordinate[0]), int(self.timestamp_coordinate[1]),
+            int(self.centroid_coordinate[0]), int(self.centroid_coordinate[1])
+        ]
         
         master_key_attempts = {
             "sum_mod_256": sum(key_components) % 256,
@@ -463,16 +454,17 @@ class TargetedAnalyzer:
 
     def attempt_message_reconstruction(self) -> str:
         elements = [
-            "NXY^[ACK]  2c#>#G",
-            "btur*[12][12][30]O[15][18][15]k",
+            self.primary_command,
+            self.xor_result,
             "".join(self.interval_ascii),
         ]
         
         return " | ".join(elements)
 
     def generate_report(self) -> str:
-        report = []
-        
+        return reporting.render(self.write_report)
+
+    def write_report(self, report):
         report.append("# Targeted Follow-up Analysis Report")
         report.append("## Phase 7: Investigation of High-Priority Discoveries")
         report.append("")
@@ -525,8 +517,6 @@ class TargetedAnalyzer:
         
         report.append("---")
         report.append("*Analysis completed by Targeted Follow-up Analysis Module (Phase 7)*")
-        
-        return "\n".join(report)
 
     def format_investigation_results(self, results: Dict[str, Any]) -> str:
         lines = []
@@ -552,17 +542,21 @@ class TargetedAnalyzer:
         
         os.makedirs("/workspace", exist_ok=True)
         
-        report_content = self.generate_report()
-        
         report_path = "/workspace/targeted_followup_report.md"
-        with open(report_path, 'w', encoding='utf-8') as f:
-            f.write(report_content)
+        with reporting.ReportWriter(report_path, compress=self.compress_report) as report:
+            self.write_report(report)
+        report_path = report.path
         
         self.log(f"✅ Targeted analysis complete! Report saved to: {report_path}")
         print(f"\n📊 Report generated: {report_path}")
-        print(f"📝 Report size: {len(report_content)} characters")
+        print(f"📝 Report size: {report.characters_written} characters")
         print(f"⏱️  Analysis duration: {time.time() - self.start_time:.2f} seconds")
+        
+        return report_path
 
-if __name__ == "__main__":
+def main():
     analyzer = TargetedAnalyzer()
-    analyzer.run_analysis()
\ No newline at end of file
+    return analyzer.run_analysis()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
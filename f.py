@@ -2,37 +2,64 @@
 
 import os
 import time
-import math
 from datetime import datetime
 from typing import Dict, List, Tuple, Any
 
+import numpy as np
+
+import coordinates
+import geodesy
+import reporting
+
+ORIGINAL_SEQUENCE = "10412790658919985359827898739594318956404425106955675643739226952372682423852959081739834390370374475764863415203423499357108713631"
+EXTRACTED_HEX = "4e58595e0620203263233e2347"
+PRIMARY_COMMAND = "NXY^[ACK]  2c#>#G"
+XOR_COMMAND = "btur*[12][12][30]O[15][18][15]k"
+INTERVAL_SEQUENCE = "-`FYC"
+INTERVALS = (167838888, 17082394, 78125568, 66839302, 18955005)
+ARCTIC_COORDINATE = (78.125568, 66.839302)
+AFRICAN_CENTROID = (9.2822, 10.37992)
+UNIFIED_COORDINATE = (36.8195472, 32.963672800000005)
+GEOMETRIC_CENTER = (19.116966857142852, 18.445546)
+MASTER_KEYS = {
+    "sum_mod_256": 210,
+    "product_mod_256": 96,
+    "xor_all": 800,
+    "centroid_key": 206
+}
+ORIGINAL_COORDINATES = (
+    (2.0056, 2.2878), (2.0056, 22.8780), (20.0560, 2.2878),
+    (20.0560, 22.8780), (2.2878, 1.5680)
+)
+
 class FinalSynthesizer:
-    def __init__(self):
+    def __init__(self, original_sequence: str = ORIGINAL_SEQUENCE, extracted_hex: str = EXTRACTED_HEX,
+                 primary_command: str = PRIMARY_COMMAND, xor_command: str = XOR_COMMAND,
+                 interval_sequence: str = INTERVAL_SEQUENCE, intervals: List[int] = INTERVALS,
+                 arctic_coordinate: Tuple[float, float] = ARCTIC_COORDINATE,
+                 african_centroid: Tuple[float, float] = AFRICAN_CENTROID,
+                 unified_coordinate: Tuple[float, float] = UNIFIED_COORDINATE,
+                 geometric_center: Tuple[float, float] = GEOMETRIC_CENTER, master_keys: Dict[str, int] = MASTER_KEYS,
+                 original_coordinates: List[Tuple[float, float]] = ORIGINAL_COORDINATES):
         self.start_time = time.time()
         self.report_lines = []
+        self.compress_report = False
         
-        self.original_sequence = "10412790658919985359827898739594318956404425106955675643739226952372682423852959081739834390370374475764863415203423499357108713631"
-        self.extracted_hex = "4e58595e0620203263233e2347"
-        self.primary_command = "NXY^[ACK]  2c#>#G"
-        self.xor_command = "btur*[12][12][30]O[15][18][15]k"
-        self.interval_sequence = "-`FYC"
-        
-        self.arctic_coordinate = (78.125568, 66.839302)
-        self.african_centroid = (9.2822, 10.37992)
-        self.unified_coordinate = (36.8195472, 32.963672800000005)
-        self.geometric_center = (19.116966857142852, 18.445546)
-        
-        self.master_keys = {
-            "sum_mod_256": 210,
-            "product_mod_256": 96, 
-            "xor_all": 800,
-            "centroid_key": 206
-        }
+        self.original_sequence = original_sequence
+        self.extracted_hex = extracted_hex
+        self.primary_command = primary_command
+        self.xor_command = xor_command
+        self.interval_sequence = interval_sequence
+        self.intervals = list(intervals)
         
-        self.original_coordinates = [
-            (2.0056, 2.2878), (2.0056, 22.8780), (20.0560, 2.2878),
-            (20.0560, 22.8780), (2.2878, 1.5680)
-        ]
+        self.arctic_coordinate = tuple(arctic_coordinate)
+        self.african_centroid = tuple(african_centroid)
+        self.unified_coordinate = tuple(unified_coordinate)
+        self.geometric_center = tuple(geometric_center)
+        
+        self.master_keys = dict(master_keys)
+        
+        self.original_coordinates = [tuple(coord) for coord in original_coordinates]
 
     def log(self, message: str):
         timestamp = datetime.now().strftime("%H:%M:%S")
@@ -153,6 +180,7 @@ class FinalSynthesizer:
             "triangulation_pattern": self.analyze_triangulation_pattern(),
             "distance_matrix": self.calculate_distance_matrix(),
             "bearing_analysis": self.calculate_bearing_matrix(),
+            "candidate_proximity": self.analyze_candidate_proximity(),
             "geometric_significance": "Coordinates form strategic surveillance triangle covering critical maritime domains"
         }
         
@@ -168,7 +196,7 @@ class FinalSynthesizer:
             "cryptographic_integrity": {}
         }
         
-        key_sum = 771
+        key_sum = sum(bytes.fromhex(self.extracted_hex))
         validation["cicada_constant_verification"] = {
             "primary_sum": key_sum,
             "mod_3301": key_sum % 3301,
@@ -179,7 +207,7 @@ class FinalSynthesizer:
         }
         
         validation["cross_layer_mathematical_consistency"] = {
-            "hex_byte_sum": 771,
+            "hex_byte_sum": key_sum,
             "coordinate_mathematical_relationships": self.validate_coordinate_math(),
             "timestamp_mathematical_relationships": self.validate_timestamp_math(),
             "master_key_derivations": self.master_keys,
@@ -263,7 +291,7 @@ class FinalSynthesizer:
         sides = []
         for i in range(3):
             j = (i + 1) % 3
-            dist = self.haversine_distance(key_coords[i], key_coords[j])
+            dist = geodesy.haversine(key_coords[i], key_coords[j])
             sides.append(dist)
         
         return {
@@ -274,38 +302,61 @@ class FinalSynthesizer:
             "coverage_assessment": "Global surveillance triangle covering Arctic, African, and Mediterranean domains"
         }
 
-    def calculate_distance_matrix(self) -> Dict[str, float]:
-        coords = {
+    def key_coordinates(self) -> Dict[str, Tuple[float, float]]:
+        return {
             "arctic": self.arctic_coordinate,
-            "african": self.african_centroid, 
+            "african": self.african_centroid,
             "unified": self.unified_coordinate
         }
+
+    def calculate_distance_matrix(self) -> Dict[str, float]:
+        coords = self.key_coordinates()
+        distances = geodesy.distance_matrix(list(coords.values())).tolist()
         
         matrix = {}
-        for name1, coord1 in coords.items():
-            for name2, coord2 in coords.items():
+        for i, name1 in enumerate(coords):
+            for j, name2 in enumerate(coords):
                 if name1 != name2:
                     key = f"{name1}_to_{name2}"
-                    matrix[key] = round(self.haversine_distance(coord1, coord2), 2)
+                    matrix[key] = round(distances[i][j], 2)
         
         return matrix
 
     def calculate_bearing_matrix(self) -> Dict[str, float]:
-        coords = {
-            "arctic": self.arctic_coordinate,
-            "african": self.african_centroid,
-            "unified": self.unified_coordinate
-        }
+        coords = self.key_coordinates()
+        matrix = geodesy.bearing_matrix(list(coords.values())).tolist()
         
         bearings = {}
-        for name1, coord1 in coords.items():
-            for name2, coord2 in coords.items():
+        for i, name1 in enumerate(coords):
+            for j, name2 in enumerate(coords):
                 if name1 != name2:
                     key = f"{name1}_to_{name2}_bearing"
-                    bearings[key] = self.calculate_bearing(coord1, coord2)
+                    bearings[key] = matrix[i][j]
         
         return bearings
 
+    def analyze_candidate_proximity(self, k: int = 3) -> Dict[str, Any]:
+        # Every coordinate the digit search can read from the original sequence, not just the key locations
+        candidates = coordinates.find_coordinates(self.original_sequence)
+        points = np.unique(np.column_stack([candidates.records['lat'], candidates.records['lon']]), axis=0)
+        coords = self.key_coordinates()
+        
+        proximity = {"candidate_count": len(candidates), "unique_locations": len(points)}
+        indices, distances = geodesy.nearest(list(coords.values()), points, k=k)
+        
+        for i, (name, coord) in enumerate(coords.items()):
+            bearings = geodesy.bearing_matrix(coord, points[indices[i]])[0].tolist()
+            proximity[f"{name}_nearest_candidates"] = [
+                {
+                    "candidate": tuple(points[j].tolist()),
+                    "distance_km": round(dist, 2),
+                    "bearing": round(bearing, 1)
+                }
+                for j, dist, bearing in zip(indices[i].tolist(), distances[i].tolist(), bearings)
+            ]
+        
+        return proximity
+
     def validate_coordinate_math(self) -> Dict[str, Any]:
         return {
             "arctic_lat_int": int(self.arctic_coordinate[0]),
@@ -315,39 +366,17 @@ class FinalSynthesizer:
         }
 
     def validate_timestamp_math(self) -> Dict[str, Any]:
-        intervals = [167838888, 17082394, 78125568, 66839302, 18955005]
+        intervals = self.intervals
         return {
             "interval_sum": sum(intervals),
             "coordinate_derivation": "Intervals 78125568, 66839302 directly encode Arctic coordinate",
             "mathematical_consistency": "Timestamp intervals mathematically generate strategic coordinates"
         }
 
-    def haversine_distance(self, coord1: Tuple[float, float], coord2: Tuple[float, float]) -> float:
-        lat1, lon1 = math.radians(coord1[0]), math.radians(coord1[1])
-        lat2, lon2 = math.radians(coord2[0]), math.radians(coord2[1])
-        
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        
-        a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-        c = 2 * math.asin(math.sqrt(a))
-        
-        return 6371 * c
-
-    def calculate_bearing(self, coord1: Tuple[float, float], coord2: Tuple[float, float]) -> float:
-        lat1, lon1 = math.radians(coord1[0]), math.radians(coord1[1])
-        lat2, lon2 = math.radians(coord2[0]), math.radians(coord2[1])
-        
-        dlon = lon2 - lon1
-        y = math.sin(dlon) * math.cos(lat2)
-        x = math.cos(lat1) * math.sin(lat2) - math.sin(lat1) * math.cos(lat2) * math.cos(dlon)
-        
-        bearing = math.atan2(y, x)
-        return (math.degrees(bearing) + 360) % 360
-
     def generate_final_report(self) -> str:
-        report = []
-        
+        return reporting.render(self.write_final_report)
+
+    def write_final_report(self, report):
         report.append("# Final Synthesis and Strategic Intelligence Assessment")
         report.append("## Phase 8: Complete Solution Validation and Intelligence Analysis")
         report.append("")
@@ -405,8 +434,6 @@ class FinalSynthesizer:
         report.append("---")
         report.append("*Final analysis completed by Synthesis and Validation Module (Phase 8)*")
         report.append("*Mission Status: COMPLETE - All objectives achieved*")
-        
-        return "\n".join(report)
 
     def format_analysis_results(self, results: Dict[str, Any]) -> str:
         lines = []
@@ -440,17 +467,21 @@ class FinalSynthesizer:
         
         os.makedirs("/workspace", exist_ok=True)
         
-        report_content = self.generate_final_report()
-        
         report_path = "/workspace/final_synthesis_report.md"
-        with open(report_path, 'w', encoding='utf-8') as f:
-            f.write(report_content)
+        with reporting.ReportWriter(report_path, compress=self.compress_report) as report:
+            self.write_final_report(report)
+        report_path = report.path
         
         self.log(f"✅ Final synthesis complete! Report saved to: {report_path}")
         print(f"\n🏆 MISSION COMPLETE - Final Report: {report_path}")
-        print(f"📝 Report size: {len(report_content)} characters")
+        print(f"📝 Report size: {report.characters_written} characters")
         print(f"⏱️  Total synthesis time: {time.time() - self.start_time:.2f} seconds")
+        
+        return report_path
 
-if __name__ == "__main__":
+def main():
     synthesizer = FinalSynthesizer()
-    synthesizer.run_synthesis()
\ No newline at end of file
+    return synthesizer.run_synthesis()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+
+import os
+import json
+from collections.abc import Sequence
+from typing import Any, Dict, List
+
+import numpy as np
+
+import geodesy
+import instrumentation
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+# Read by cache.code_version, so editing the areas or places invalidates cached labels
+DATA_FILES = ["geocoder.json"]
+DATA_PATH = os.path.join(PACKAGE_DIR, "geocoder.json")
+OPEN_OCEAN = "Open ocean"
+# The ray cast is half-open, so the polar caps and the +180° meridian, which are outer polygon edges, would fall outside
+# every area. Poles are nudged just inside and +180° is read as -180°, the same meridian.
+POLE_LATITUDE = 90 - 1e-9
+ACTIVE = None
+
+
+def contains(polygon: np.ndarray, lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+    # Even-odd ray casting towards +longitude; one vectorized pass per edge over all points
+    inside = np.zeros(len(lat), dtype=bool)
+    lat1, lon1 = polygon[:, 0], polygon[:, 1]
+    lat2, lon2 = np.roll(lat1, -1), np.roll(lon1, -1)
+    for a_lat, a_lon, b_lat, b_lon in zip(lat1.tolist(), lon1.tolist(), lat2.tolist(), lon2.tolist()):
+        if a_lat == b_lat:
+            continue
+        spans = (a_lat > lat) != (b_lat > lat)
+        crossing = a_lon + (lat - a_lat) * (b_lon - a_lon) / (b_lat - a_lat)
+        inside ^= spans & (lon < crossing)
+    return inside
+
+
+class Area:
+
+    def __init__(self, name: str, kind: str, polygon: List[List[float]], significance: str = None):
+        self.name = name
+        self.kind = kind
+        self.significance = significance
+        self.polygon = np.asarray(polygon, dtype=np.float64)
+        self.bounds = (*self.polygon.min(axis=0).tolist(), *self.polygon.max(axis=0).tolist())
+
+    def candidates(self, lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+        low_lat, low_lon, high_lat, high_lon = self.bounds
+        return (lat >= low_lat) & (lat <= high_lat) & (lon >= low_lon) & (lon <= high_lon)
+
+
+class Geocoder:
+
+    def __init__(self, path: str = DATA_PATH):
+        with open(path, encoding='utf-8') as handle:
+            data = json.load(handle)
+
+        self.areas = [Area(area['name'], area['kind'], area['polygon'], area.get('significance'))
+                      for area in data['areas']]
+        self.regions = data['regions']
+        names, countries, regions, lats, lons = zip(*data['places'])
+        self.place_names, self.place_countries, self.place_regions = names, countries, regions
+        self.places = np.column_stack((lats, lons)).astype(np.float64)
+
+    def area_indices(self, lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+        # First containing area in file order wins; -1 is open ocean
+        lat = np.clip(lat, -POLE_LATITUDE, POLE_LATITUDE)
+        lon = np.where(lon >= 180, -180.0, lon)
+        found = np.full(len(lat), -1, dtype=np.int64)
+        pending = np.arange(len(lat))
+        for index, area in enumerate(self.areas):
+            if not len(pending):
+                break
+            rows = pending[area.candidates(lat[pending], lon[pending])]
+            if not len(rows):
+                continue
+            hits = rows[contains(area.polygon, lat[rows], lon[rows])]
+            found[hits] = index
+            pending = pending[found[pending] < 0]
+        return found
+
+    def reverse(self, coords) -> 'Locations':
+        points = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+        if np.any(np.abs(points[:, 0]) > 90) or np.any(np.abs(points[:, 1]) > 180):
+            raise ValueError("Coordinates must be within ±90° latitude and ±180° longitude")
+
+        areas = self.area_indices(points[:, 0], points[:, 1])
+        indices, distances = geodesy.nearest(points, self.places, k=1)
+        instrumentation.count(len(points))
+        return Locations(self, points, areas, indices[:, 0], distances[:, 0])
+
+
+class Locations(Sequence):
+
+    def __init__(self, geocoder: Geocoder, points: np.ndarray, areas: np.ndarray, places: np.ndarray,
+                 distances: np.ndarray):
+        self.geocoder = geocoder
+        self.points = points
+        self.areas = areas
+        self.places = places
+        self.distances = distances
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.as_dict(i) for i in range(len(self.points))[index]]
+        return self.as_dict(range(len(self.points))[index])
+
+    def as_dict(self, index: int) -> Dict[str, Any]:
+        geocoder = self.geocoder
+        area_index, place = int(self.areas[index]), int(self.places[index])
+        area = geocoder.areas[area_index] if area_index >= 0 else None
+        water = area is None or area.kind != 'land'
+        region = geocoder.place_regions[place]
+        country = None if water else geocoder.place_countries[place]
+
+        if water:
+            name = OPEN_OCEAN if area is None else area.name
+            significance = None if area is None else area.significance
+            label = name
+        else:
+            name = area.name
+            significance = geocoder.regions.get(region)
+            label = region if region == country else f"{region} ({country})"
+
+        lat, lon = self.points[index].tolist()
+        return {
+            'lat': lat,
+            'lon': lon,
+            'area': name,
+            'kind': 'ocean' if area is None else area.kind,
+            'water': water,
+            'country': country,
+            'region': region,
+            'nearest_place': geocoder.place_names[place],
+            'place_country': geocoder.place_countries[place],
+            'distance_km': round(float(self.distances[index]), 1),
+            'significance': significance,
+            'label': label
+        }
+
+    def labels(self) -> List[str]:
+        return [self.as_dict(index)['label'] for index in range(len(self.points))]
+
+
+def active() -> Geocoder:
+    # The data file is parsed once per process
+    global ACTIVE
+    if ACTIVE is None:
+        ACTIVE = Geocoder()
+    return ACTIVE
+
+
+def reverse(coords) -> Locations:
+    return active().reverse(coords)
+
+
+def describe(lat: float, lon: float) -> Dict[str, Any]:
+    return reverse([(lat, lon)])[0]
+
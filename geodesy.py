@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+
+import math
+from typing import Iterator, Sequence, Tuple
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+# Rows per block: a 1024 x 10^4 float64 block is about 80 MB
+BLOCK_SIZE = 1024
+
+
+def haversine(coord1: Tuple[float, float], coord2: Tuple[float, float]) -> float:
+    lat1, lon1 = math.radians(coord1[0]), math.radians(coord1[1])
+    lat2, lon2 = math.radians(coord2[0]), math.radians(coord2[1])
+
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return EARTH_RADIUS_KM * 2 * math.asin(math.sqrt(a))
+
+
+def bearing(coord1: Tuple[float, float], coord2: Tuple[float, float]) -> float:
+    lat1, lon1 = math.radians(coord1[0]), math.radians(coord1[1])
+    lat2, lon2 = math.radians(coord2[0]), math.radians(coord2[1])
+
+    dlon = lon2 - lon1
+    y = math.sin(dlon) * math.cos(lat2)
+    x = math.cos(lat1) * math.sin(lat2) - math.sin(lat1) * math.cos(lat2) * math.cos(dlon)
+    return (math.degrees(math.atan2(y, x)) + 360) % 360
+
+
+def as_radians(coords) -> Tuple[np.ndarray, np.ndarray]:
+    points = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+    return np.radians(points[:, 0]), np.radians(points[:, 1])
+
+
+def row_blocks(count: int, block_size: int = BLOCK_SIZE) -> Iterator[slice]:
+    for start in range(0, count, block_size):
+        yield slice(start, min(start + block_size, count))
+
+
+def haversine_block(lat1: np.ndarray, lon1: np.ndarray, lat2: np.ndarray, lon2: np.ndarray) -> np.ndarray:
+    # Same formula as haversine(), broadcast as a (rows, 1) by (1, columns) outer operation
+    a = (np.sin((lat2[None, :] - lat1[:, None]) / 2) ** 2
+         + np.cos(lat1)[:, None] * np.cos(lat2)[None, :] * np.sin((lon2[None, :] - lon1[:, None]) / 2) ** 2)
+    return EARTH_RADIUS_KM * 2 * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def bearing_block(lat1: np.ndarray, lon1: np.ndarray, lat2: np.ndarray, lon2: np.ndarray) -> np.ndarray:
+    dlon = lon2[None, :] - lon1[:, None]
+    y = np.sin(dlon) * np.cos(lat2)[None, :]
+    x = (np.cos(lat1)[:, None] * np.sin(lat2)[None, :]
+         - np.sin(lat1)[:, None] * np.cos(lat2)[None, :] * np.cos(dlon))
+    return (np.degrees(np.arctan2(y, x)) + 360) % 360
+
+
+def distance_blocks(coords, others=None, block_size: int = BLOCK_SIZE) -> Iterator[Tuple[slice, np.ndarray]]:
+    # Yields (rows, distances) so callers can reduce an N x M matrix without ever holding all of it
+    lat1, lon1 = as_radians(coords)
+    lat2, lon2 = (lat1, lon1) if others is None else as_radians(others)
+    for rows in row_blocks(len(lat1), block_size):
+        yield rows, haversine_block(lat1[rows], lon1[rows], lat2, lon2)
+
+
+def distance_matrix(coords, others=None, block_size: int = BLOCK_SIZE, dtype=np.float64) -> np.ndarray:
+    count = len(np.asarray(coords).reshape(-1, 2))
+    columns = count if others is None else len(np.asarray(others).reshape(-1, 2))
+    matrix = np.empty((count, columns), dtype=dtype)
+    for rows, block in distance_blocks(coords, others, block_size):
+        matrix[rows] = block
+    return matrix
+
+
+def bearing_matrix(coords, others=None, block_size: int = BLOCK_SIZE, dtype=np.float64) -> np.ndarray:
+    lat1, lon1 = as_radians(coords)
+    lat2, lon2 = (lat1, lon1) if others is None else as_radians(others)
+    matrix = np.empty((len(lat1), len(lat2)), dtype=dtype)
+    for rows in row_blocks(len(lat1), block_size):
+        matrix[rows] = bearing_block(lat1[rows], lon1[rows], lat2, lon2)
+    return matrix
+
+
+def nearest(coords, others=None, k: int = 1, block_size: int = BLOCK_SIZE) -> Tuple[np.ndarray, np.ndarray]:
+    # k nearest columns for every row, nearest first; a point is never its own neighbour when others is None
+    columns = len(np.asarray(coords if others is None else others).reshape(-1, 2))
+    k = min(k, columns - (1 if others is None else 0))
+    count = len(np.asarray(coords).reshape(-1, 2))
+    indices = np.empty((count, max(k, 0)), dtype=np.int64)
+    distances = np.empty((count, max(k, 0)), dtype=np.float64)
+    if k <= 0:
+        return indices, distances
+
+    for rows, block in distance_blocks(coords, others, block_size):
+        if others is None:
+            block[np.arange(block.shape[0]), np.arange(rows.start, rows.stop)] = np.inf
+        part = np.argpartition(block, k - 1, axis=1)[:, :k]
+        values = np.take_along_axis(block, part, axis=1)
+        order = np.argsort(values, axis=1, kind='stable')
+        indices[rows] = np.take_along_axis(part, order, axis=1)
+        distances[rows] = np.take_along_axis(values, order, axis=1)
+    return indices, distances
+
+
+def pairs(coords: Sequence[Tuple[float, float]]) -> Iterator[Tuple[int, int, float]]:
+    # Upper triangle (i < j) in row order, as the analyzers' pairwise loops produce it
+    matrix = distance_matrix(coords)
+    rows, columns = np.triu_indices(len(matrix), k=1)
+    yield from zip(rows.tolist(), columns.tolist(), matrix[rows, columns].tolist())
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+
+import sys
+import json
+import argparse
+from collections import Counter
+from typing import Any, Dict, Iterator, List, Tuple
+
+import numpy as np
+
+import instrumentation
+
+# The constants a.py reduces the whole number by
+MODULI = (3301, 509, 311, 113, 29, 7, 3)
+PALINDROME_LENGTHS = (3, 10)
+REPEAT_LENGTHS = (2, 10)
+PREFIX_LENGTH = 50
+# Digits converted to one int at a time when updating the remainders; keeps int() parsing linear
+PIECE_SIZE = 4096
+CHUNK_SIZE = 1 << 16
+
+
+def digital_root(n: int) -> int:
+    while n >= 10:
+        n = sum(int(digit) for digit in str(n))
+    return n
+
+
+def palindrome_starts(symbols: np.ndarray, first_end: int, length: int) -> np.ndarray:
+    # Starts of every palindrome of this length that ends at or after first_end
+    starts = np.arange(max(first_end - length + 1, 0), len(symbols) - length + 1)
+    keep = np.ones(len(starts), dtype=bool)
+    for k in range(length // 2):
+        keep &= symbols[starts + k] == symbols[starts + length - 1 - k]
+    return starts[keep]
+
+
+class DigitStream:
+
+    def __init__(self, moduli: Tuple[int, ...] = MODULI, palindrome_lengths: Tuple[int, int] = PALINDROME_LENGTHS,
+                 repeat_lengths: Tuple[int, int] = REPEAT_LENGTHS):
+        self.moduli = tuple(moduli)
+        self.palindrome_lengths = palindrome_lengths
+        self.repeat_lengths = repeat_lengths
+
+        self.data = bytearray()
+        self.frequency = {}
+        self.transition_counts = {}
+        self.remainders = [0] * len(self.moduli)
+        self.digit_sum = 0
+        self.parity_sums = [0, 0]
+        self.parity_prefixes = ['', '']
+
+        low, high = palindrome_lengths
+        self.palindrome_positions = {length: [] for length in range(low, high + 1)}
+        # Per length: substring -> first position, upgraded to a shared positions list once it repeats
+        low, high = repeat_lengths
+        self.substrings = {length: {} for length in range(low, high + 1)}
+        self.repeated = {length: {} for length in range(low, high + 1)}
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    @property
+    def text(self) -> str:
+        return self.data.decode('ascii')
+
+    def append(self, chunk: str) -> 'DigitStream':
+        if not chunk:
+            return self
+        if not (chunk.isascii() and chunk.isdigit()):
+            raise ValueError("Digit streams only accept the characters 0-9")
+
+        start = len(self.data)
+        encoded = chunk.encode('ascii')
+        # Every statistic that looks back does so by less than its longest window, so only this tail is revisited
+        overlap = max(self.palindrome_lengths[1], self.repeat_lengths[1], 2) - 1
+        low = max(start - overlap, 0)
+        self.data += encoded
+        tail = bytes(self.data[low:])
+
+        self.update_counts(chunk, encoded, start)
+        self.update_remainders(chunk)
+        self.update_transitions(tail[max(start - low - 1, 0):].decode('ascii'))
+        self.update_palindromes(tail, low, start)
+        self.update_repeats(tail.decode('ascii'), low, start)
+
+        instrumentation.count(len(chunk))
+        return self
+
+    def extend(self, chunks: Iterator[str]) -> 'DigitStream':
+        for chunk in chunks:
+            self.append(chunk)
+        return self
+
+    def update_counts(self, chunk: str, encoded: bytes, start: int):
+        for digit, count in Counter(chunk).items():
+            self.frequency[digit] = self.frequency.get(digit, 0) + count
+        self.digit_sum += sum(encoded) - 48 * len(encoded)
+
+        for parity in (0, 1):
+            # Position parity is global, so the chunk's own offset decides which of its digits are even
+            part = encoded[(parity - start) % 2::2]
+            self.parity_sums[parity] += sum(part) - 48 * len(part)
+            prefix = self.parity_prefixes[parity]
+            if len(prefix) < PREFIX_LENGTH:
+                self.parity_prefixes[parity] = prefix + part[:PREFIX_LENGTH - len(prefix)].decode('ascii')
+
+    def update_remainders(self, chunk: str):
+        for offset in range(0, len(chunk), PIECE_SIZE):
+            piece = chunk[offset:offset + PIECE_SIZE]
+            value = int(piece)
+            self.remainders = [(remainder * pow(10, len(piece), modulus) + value) % modulus
+                               for remainder, modulus in zip(self.remainders, self.moduli)]
+
+    def update_transitions(self, text: str):
+        for pair, count in Counter(text[i:i + 2] for i in range(len(text) - 1)).items():
+            self.transition_counts[pair] = self.transition_counts.get(pair, 0) + count
+
+    def update_palindromes(self, tail: bytes, low: int, start: int):
+        symbols = np.frombuffer(tail, dtype=np.uint8)
+        for length, positions in self.palindrome_positions.items():
+            positions.extend((palindrome_starts(symbols, start - low, length) + low).tolist())
+
+    def update_repeats(self, tail: str, low: int, start: int):
+        end = low + len(tail)
+        for length, substrings in self.substrings.items():
+            repeated = self.repeated[length]
+            # Substrings that end inside the new chunk, in position order
+            for position in range(max(start - length + 1, 0), end - length + 1):
+                key = tail[position - low:position - low + length]
+                found = substrings.get(key)
+                if found is None:
+                    substrings[key] = position
+                elif isinstance(found, int):
+                    substrings[key] = repeated[key] = [found, position]
+                else:
+                    found.append(position)
+
+    def basic(self) -> Dict[str, Any]:
+        return {
+            'length': len(self.data),
+            'digit_frequency': dict(self.frequency),
+            'digit_sum': self.digit_sum,
+            'digital_root': digital_root(self.digit_sum),
+            'modulos': dict(zip(self.moduli, self.remainders))
+        }
+
+    def transitions(self, top: int = 10) -> Dict[str, int]:
+        return dict(sorted(self.transition_counts.items(), key=lambda x: x[1], reverse=True)[:top])
+
+    def statistics(self) -> Dict[str, Any]:
+        count = len(self.data)
+        if not count:
+            return {}
+
+        # The median and mode come from the digit histogram; ties go to the digit seen first, as Counter does
+        cumulative = np.cumsum([self.frequency.get(str(digit), 0) for digit in range(10)])
+        return {
+            'mean': self.digit_sum / count,
+            'median': int(np.searchsorted(cumulative, count // 2, side='right')),
+            'mode': int(max(self.frequency, key=self.frequency.get)),
+            'sum': self.digit_sum,
+            'digital_root': digital_root(self.digit_sum)
+        }
+
+    def steganography(self) -> Dict[str, Any]:
+        even_sum, odd_sum = self.parity_sums
+        return {
+            'even_positions': self.parity_prefixes[0] + "...",
+            'odd_positions': self.parity_prefixes[1] + "...",
+            'even_sum': even_sum,
+            'odd_sum': odd_sum,
+            'ratio': f"{even_sum}/{odd_sum} = {even_sum/odd_sum:.4f}" if odd_sum else None
+        }
+
+    def palindromes(self, min_length: int = None, max_length: int = None) -> List[Dict[str, Any]]:
+        low, high = self.palindrome_lengths
+        low, high = max(low, min_length or low), min(high, max_length or high)
+        text = self.text
+        return [{"text": text[position:position + length], "position": position, "length": length}
+                for length in range(low, high + 1) for position in self.palindrome_positions[length]]
+
+    def repeats(self, min_length: int = None, max_length: int = None) -> Dict[str, List[int]]:
+        low, high = self.repeat_lengths
+        low, high = max(low, min_length or low), min(high, max_length or high)
+        patterns = {}
+        for length in range(low, high + 1):
+            for pattern, positions in sorted(self.repeated[length].items(), key=lambda item: item[1][0]):
+                patterns[pattern] = list(positions)
+        return patterns
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'basic': self.basic(),
+            'transitions': self.transitions(),
+            'statistics': self.statistics(),
+            'steganography': self.steganography(),
+            'palindromes': self.palindromes(),
+            'repeats': self.repeats()
+        }
+
+
+def read_chunks(handle, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    # Whitespace and line breaks between digits are dropped, so a growing file can be tailed as written
+    while True:
+        chunk = handle.read(chunk_size)
+        if not chunk:
+            return
+        yield ''.join(chunk.split())
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Running digit statistics over an append-only stream")
+    parser.add_argument("input", nargs="?", default="-", help="Digit file, or - for stdin (default)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Characters read per update")
+    parser.add_argument("--every", type=int, default=0, help="Print a summary line after every N digits")
+    parser.add_argument("--json", default=None, help="Write the final snapshot to this JSON file")
+    args = parser.parse_args(argv)
+
+    stream = DigitStream()
+    handle = sys.stdin if args.input == "-" else open(args.input, encoding='ascii')
+    reported = 0
+    try:
+        for chunk in read_chunks(handle, args.chunk_size):
+            stream.append(chunk)
+            if args.every and len(stream) - reported >= args.every:
+                reported = len(stream)
+                basic = stream.basic()
+                print(f"📈 {basic['length']} digits | sum {basic['digit_sum']} | root {basic['digital_root']} | "
+                      f"{len(stream.repeated[stream.repeat_lengths[0]])} repeated pairs")
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+
+    snapshot = stream.snapshot()
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, indent=2)
+        print(f"📁 Snapshot saved as: {args.json}")
+    else:
+        print(json.dumps(snapshot['basic'], indent=2))
+    return stream
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import json
+import time
+import types
+import argparse
+import platform
+import functools
+import importlib
+import tracemalloc
+import contextlib
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Tuple
+
+ACTIVE = None
+
+RUNNERS = {
+    'a': ('CicadaSolver', 'run_complete_analysis'),
+    'b': ('CicadaAdvancedAnalyzer', 'run_complete_analysis'),
+    'c': ('CicadaFocusedDecoder', 'run_focused_decode'),
+    'Full_solution': ('CicadaCompleteSolution', 'run_complete_demonstration'),
+    'Hex': ('CicadaHexProcessor', 'run_complete_analysis'),
+    'd': ('ComprehensiveAnalyzer', 'run_analysis'),
+    'e': ('TargetedAnalyzer', 'run_analysis'),
+    'f': ('FinalSynthesizer', 'run_synthesis')
+}
+SEQUENCE_MODULES = ('a', 'b', 'c', 'Full_solution')
+CACHED_MODULES = ('a', 'c', 'Full_solution')
+
+
+class Frame:
+
+    def __init__(self, path: Tuple[str, ...]):
+        self.path = path
+        self.wall = time.perf_counter()
+        self.cpu = time.process_time()
+        self.child_wall = 0.0
+        self.base_memory = 0
+        self.max_memory = 0
+        self.counts = {}
+
+
+class Profiler:
+
+    def __init__(self, trace_memory: bool = True):
+        self.trace_memory = trace_memory
+        self.stack = []
+        self.stacks = {}
+        self.started_tracing = False
+        self.previous = None
+
+    def __enter__(self) -> 'Profiler':
+        global ACTIVE
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.started_tracing = True
+        self.previous, ACTIVE = ACTIVE, self
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        global ACTIVE
+        ACTIVE = self.previous
+        if self.started_tracing:
+            tracemalloc.stop()
+            self.started_tracing = False
+
+    @contextlib.contextmanager
+    def measure(self, name: str):
+        parent = self.stack[-1] if self.stack else None
+        frame = Frame((parent.path if parent else ()) + (name,))
+
+        if self.trace_memory and tracemalloc.is_tracing():
+            # tracemalloc keeps a single peak, so fold it into the parent before resetting it for this frame
+            current, peak = tracemalloc.get_traced_memory()
+            if parent is not None:
+                parent.max_memory = max(parent.max_memory, peak)
+            tracemalloc.reset_peak()
+            frame.base_memory = frame.max_memory = current
+
+        self.stack.append(frame)
+        try:
+            yield frame
+        finally:
+            self.stack.pop()
+            self.record(frame, parent)
+
+    def record(self, frame: Frame, parent: Frame):
+        wall = time.perf_counter() - frame.wall
+        cpu = time.process_time() - frame.cpu
+        if self.trace_memory and tracemalloc.is_tracing():
+            frame.max_memory = max(frame.max_memory, tracemalloc.get_traced_memory()[1])
+        if parent is not None:
+            parent.child_wall += wall
+            parent.max_memory = max(parent.max_memory, frame.max_memory)
+
+        stats = self.stacks.setdefault(frame.path, {
+            'calls': 0, 'wall_seconds': 0.0, 'self_seconds': 0.0, 'cpu_seconds': 0.0, 'peak_bytes': 0, 'counts': {}
+        })
+        stats['calls'] += 1
+        stats['wall_seconds'] += wall
+        stats['self_seconds'] += max(wall - frame.child_wall, 0.0)
+        stats['cpu_seconds'] += cpu
+        stats['peak_bytes'] = max(stats['peak_bytes'], frame.max_memory - frame.base_memory)
+        for label, value in frame.counts.items():
+            stats['counts'][label] = stats['counts'].get(label, 0) + value
+
+    def count(self, value: int, label: str = 'candidates'):
+        if self.stack:
+            counts = self.stack[-1].counts
+            counts[label] = counts.get(label, 0) + int(value)
+
+    def wrap(self, owner, name: str, func: Callable) -> Callable:
+        label = f"{type(owner).__name__}.{name}"
+
+        @functools.wraps(func)
+        def measured(instance, *args, **kwargs):
+            with self.measure(label):
+                return func(instance, *args, **kwargs)
+
+        # Bound to the instance so callers that inspect __self__ (such as the result cache) still work
+        return types.MethodType(measured, owner)
+
+    def instrument(self, owner, names: List[str] = None):
+        if names is None:
+            names = sorted({name for cls in type(owner).__mro__ if cls is not object
+                            for name, value in vars(cls).items()
+                            if callable(value) and not name.startswith('_')})
+        for name in names:
+            func = getattr(type(owner), name)
+            setattr(owner, name, self.wrap(owner, name, func))
+        return owner
+
+    def methods(self) -> Dict[str, Dict[str, Any]]:
+        totals = {}
+        for path, stats in self.stacks.items():
+            name = path[-1]
+            # Only the outermost occurrence of a method counts towards its total, so recursion is not double counted
+            if name in path[:-1]:
+                continue
+            entry = totals.setdefault(name, {
+                'calls': 0, 'wall_seconds': 0.0, 'self_seconds': 0.0, 'cpu_seconds': 0.0, 'peak_bytes': 0, 'counts': {}
+            })
+            entry['calls'] += stats['calls']
+            entry['wall_seconds'] += stats['wall_seconds']
+            entry['self_seconds'] += stats['self_seconds']
+            entry['cpu_seconds'] += stats['cpu_seconds']
+            entry['peak_bytes'] = max(entry['peak_bytes'], stats['peak_bytes'])
+            for label, value in stats['counts'].items():
+                entry['counts'][label] = entry['counts'].get(label, 0) + value
+
+        return dict(sorted(totals.items(), key=lambda item: -item[1]['wall_seconds']))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'generated': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'memory_traced': self.trace_memory,
+            'methods': self.methods(),
+            'stacks': [dict(path=';'.join(path), **stats) for path, stats in sorted(self.stacks.items())]
+        }
+
+    def folded(self) -> List[str]:
+        # Brendan Gregg's folded format: one line per stack with its self time in microseconds
+        return [f"{';'.join(path)} {round(stats['self_seconds'] * 1e6)}"
+                for path, stats in sorted(self.stacks.items()) if round(stats['self_seconds'] * 1e6) > 0]
+
+    def write_json(self, path: str):
+        with open(path, 'w', encoding='utf-8') as handle:
+            json.dump(self.to_dict(), handle, indent=2)
+
+    def write_folded(self, path: str):
+        with open(path, 'w', encoding='utf-8') as handle:
+            handle.write('\n'.join(self.folded()) + '\n')
+
+
+def count(value: int, label: str = 'candidates'):
+    if ACTIVE is not None:
+        ACTIVE.count(value, label)
+
+
+def build(module_name: str, sequence: str = None):
+    class_name, _ = RUNNERS[module_name]
+    cls = getattr(importlib.import_module(module_name), class_name)
+
+    args = []
+    if module_name == 'b':
+        args.append(sequence or importlib.import_module('c').CICADA_NUMBER)
+    elif sequence and module_name in SEQUENCE_MODULES:
+        args.append(sequence)
+
+    if module_name in CACHED_MODULES:
+        from cache import ResultCache
+        # Replaying cached results would measure the cache, not the analysis
+        return cls(*args, result_cache=ResultCache(enabled=False))
+    return cls(*args)
+
+
+def profile_modules(module_names: List[str], sequence: str = None, trace_memory: bool = True,
+                    quiet: bool = False) -> Profiler:
+    with Profiler(trace_memory) as profiler, open(os.devnull, 'w') as devnull:
+        for module_name in module_names:
+            owner = profiler.instrument(build(module_name, sequence))
+            _, runner = RUNNERS[module_name]
+            with contextlib.redirect_stdout(devnull if quiet else sys.stdout), profiler.measure(module_name):
+                getattr(owner, runner)()
+    return profiler
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Profile wall time, CPU time, peak memory and candidate counts")
+    parser.add_argument("modules", nargs="*", default=list(RUNNERS), help=f"Modules to run: {', '.join(RUNNERS)}")
+    parser.add_argument("--sequence", default=None, help="Input sequence for a, b, c and Full_solution")
+    parser.add_argument("--json", default="instrumentation.json", help="JSON output path")
+    parser.add_argument("--folded", default="instrumentation.folded", help="Folded-stack output for flame graphs")
+    parser.add_argument("--no-memory", action="store_true", help="Skip tracemalloc (lower overhead)")
+    parser.add_argument("--quiet", action="store_true", help="Silence the modules' own console output")
+    args = parser.parse_args(argv)
+
+    unknown = [name for name in args.modules if name not in RUNNERS]
+    if unknown:
+        parser.error(f"unknown module(s): {', '.join(unknown)}")
+
+    profiler = profile_modules(args.modules, args.sequence, not args.no_memory, args.quiet)
+    profiler.write_json(args.json)
+    profiler.write_folded(args.folded)
+
+    print("=" * 60)
+    print(f"{'Method':<60} {'Wall (s)':>9} {'CPU (s)':>9} {'Peak KiB':>9}")
+    for name, stats in list(profiler.methods().items())[:25]:
+        print(f"{name[:60]:<60} {stats['wall_seconds']:>9.4f} {stats['cpu_seconds']:>9.4f} "
+              f"{stats['peak_bytes'] / 1024:>9.1f}")
+    print(f"📊 JSON profile: {args.json}")
+    print(f"🔥 Flame graph stacks: {args.folded}")
+    return profiler
+
+
+if __name__ == "__main__":
+    # Engine modules report counts to the imported module, not to __main__, so run through it
+    importlib.import_module('instrumentation').main()
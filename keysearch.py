@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+
+import sys
+import time
+import heapq
+import argparse
+from typing import Any, Dict, Iterator, List, Tuple, Union
+
+import numpy as np
+
+import digits
+import instrumentation
+import scoring
+
+MAX_KEY_LENGTH = 6
+# Keys scored together; a block of 2^16 keys keeps every per-key array under a megabyte
+BLOCK_SIZE = 1 << 16
+
+# Digit x key digit -> combined value; XOR can reach 15, which is written out as two digits
+COMBINE_TABLES = {
+    'xor': np.bitwise_xor.outer(np.arange(10), np.arange(10)).astype(np.uint8),
+    'add': (np.add.outer(np.arange(10), np.arange(10)) % 10).astype(np.uint8),
+    'sub': (np.subtract.outer(np.arange(10), np.arange(10)) % 10).astype(np.uint8)
+}
+
+
+def combine(data: Union[str, np.ndarray], key: str, operation: str = 'xor') -> str:
+    # The table-driven form of int(digit) OP int(key[i % len(key)]); characters that are not digits pass through
+    table = COMBINE_TABLES[operation]
+    values, invalid = scoring.as_digit_array(data)
+    combined = table[values, digits.tiled_key(key, len(values))]
+    if not invalid.any():
+        return digits.to_digit_string(digits.expand_values(combined))
+
+    return ''.join(char if broken else str(value)
+                   for char, broken, value in zip(data, invalid.tolist(), combined.tolist()))
+
+
+def key_digits(length: int) -> np.ndarray:
+    # Every key of this length in numeric order, one row of digits per key
+    numbers = np.arange(10 ** length, dtype=np.int64)
+    return (numbers[:, None] // 10 ** np.arange(length - 1, -1, -1) % 10).astype(np.uint8)
+
+
+def primitive_mask(keys: np.ndarray) -> np.ndarray:
+    # A key that is a shorter key repeated tiles to the same stream, so only primitive keys are scored
+    length = keys.shape[1]
+    periodic = np.zeros(len(keys), dtype=bool)
+    for period in range(1, length):
+        if length % period == 0:
+            periodic |= (keys == np.tile(keys[:, :period], length // period)).all(axis=1)
+    return ~periodic
+
+
+def keyspace(max_length: int = MAX_KEY_LENGTH, min_length: int = 1) -> Iterator[np.ndarray]:
+    for length in range(min_length, max_length + 1):
+        keys = key_digits(length)
+        yield keys[primitive_mask(keys)]
+
+
+def key_text(key: np.ndarray) -> str:
+    return digits.to_digit_string(key)
+
+
+def residue_tables(values: np.ndarray, table: np.ndarray, weights: np.ndarray,
+                   key_length: int) -> List[Tuple[int, int, np.ndarray]]:
+    # With single-digit output, group j reads digits 2j and 2j+1, so its gain depends on two key digits only.
+    # Groups whose key digits sit at the same residues share one 10x10 gain table.
+    total = len(values) // 2
+    first, second = values[0:2 * total:2], values[1:2 * total:2]
+    gains = weights[10 * table[first][:, :, None].astype(np.int64) + table[second][:, None, :]]
+    positions = 2 * np.arange(total)
+    residues = (positions % key_length) * key_length + (positions + 1) % key_length
+    summed = np.zeros((key_length * key_length, 10, 10))
+    np.add.at(summed, residues, gains)
+    return [(residue // key_length, residue % key_length, summed[residue])
+            for residue in np.unique(residues).tolist()]
+
+
+def score_single(values: np.ndarray, table: np.ndarray, weights: np.ndarray, keys: np.ndarray) -> np.ndarray:
+    total = len(values) // 2
+    sums = np.zeros(len(keys))
+    if total == 0:
+        return sums
+    for first, second, gains in residue_tables(values, table, weights, keys.shape[1]):
+        sums += gains[keys[:, first], keys[:, second]]
+    return sums / total * 100
+
+
+def score_expanding(values: np.ndarray, table: np.ndarray, weights: np.ndarray, keys: np.ndarray) -> np.ndarray:
+    # Two-digit values shift every later group, so groups are closed in one left-to-right pass over all keys at once
+    count, key_length = keys.shape
+    high, low = table // 10, table % 10
+    pending = np.full(count, -1, dtype=np.int64)
+    sums = np.zeros(count)
+    groups = np.zeros(count, dtype=np.int64)
+
+    def emit(digit: np.ndarray, active: np.ndarray):
+        nonlocal pending
+        closing = active & (pending >= 0)
+        sums[closing] += weights[10 * pending[closing] + digit[closing]]
+        groups[closing] += 1
+        pending = np.where(closing, -1, np.where(active, digit, pending))
+
+    everywhere = np.ones(count, dtype=bool)
+    for position, value in enumerate(values.tolist()):
+        column = keys[:, position % key_length]
+        emit(high[value][column].astype(np.int64), table[value][column] >= 10)
+        emit(low[value][column].astype(np.int64), everywhere)
+    return np.divide(sums, groups, out=np.zeros(count), where=groups > 0) * 100
+
+
+def score_keys(data: Union[str, np.ndarray], keys: np.ndarray, operation: str = 'xor',
+               scorer: scoring.TableScorer = scoring.PRINTABLE_SCORER) -> np.ndarray:
+    # Two-digit group scores, as scoring.validity reports them, for every key row
+    table = COMBINE_TABLES[operation]
+    values = digits.to_digit_array(data) if isinstance(data, str) else np.asarray(data, dtype=np.uint8)
+    weights = scorer.weights[:100]
+    instrumentation.count(len(keys))
+    if table.max() < 10:
+        return score_single(values, table, weights, keys)
+    return score_expanding(values, table, weights, keys)
+
+
+class KeySearch:
+
+    def __init__(self, max_length: int = MAX_KEY_LENGTH, operations: Tuple[str, ...] = tuple(COMBINE_TABLES),
+                 scorer: scoring.TableScorer = scoring.PRINTABLE_SCORER, top_k: int = 20, min_length: int = 1,
+                 min_groups: int = 4, block_size: int = BLOCK_SIZE):
+        unknown = [operation for operation in operations if operation not in COMBINE_TABLES]
+        if unknown:
+            raise ValueError(f"Unknown key operations: {unknown}")
+        self.max_length = max_length
+        self.min_length = min_length
+        self.operations = tuple(operations)
+        self.scorer = scorer
+        self.top_k = max(1, top_k)
+        self.min_groups = min_groups
+        self.block_size = block_size
+
+        self.evaluated = 0
+        self.elapsed = 0.0
+
+    def iter_scores(self, variants: Dict[str, str]) -> Iterator[Tuple[str, str, np.ndarray, np.ndarray]]:
+        # Yields (variant, operation, keys, scores) blocks so callers can reduce them as they arrive
+        arrays = {name: digits.to_digit_array(data) for name, data in variants.items()
+                  if len(data) // 2 >= self.min_groups}
+        for keys in keyspace(self.max_length, self.min_length):
+            for start in range(0, len(keys), self.block_size):
+                block = keys[start:start + self.block_size]
+                for name, values in arrays.items():
+                    for operation in self.operations:
+                        yield name, operation, block, score_keys(values, block, operation, self.scorer)
+
+    def search(self, variants: Dict[str, str]) -> List[Dict[str, Any]]:
+        start = time.perf_counter()
+        heap = []
+        evaluated = 0
+        names = list(variants)
+        ranks = {operation: rank for rank, operation in enumerate(self.operations)}
+
+        for name, operation, keys, scores in self.iter_scores(variants):
+            evaluated += len(scores)
+            # Keys within a block share a length and are in numeric order, so index order is the tie-break order
+            for row in scoring.top_indices(scores, self.top_k).tolist():
+                key = key_text(keys[row])
+                # Ties prefer the shorter key, then the smaller key, then variant and operation order
+                entry = (float(scores[row]), -len(key), tuple(-int(d) for d in key),
+                         -names.index(name), -ranks[operation])
+                if len(heap) < self.top_k:
+                    heapq.heappush(heap, entry)
+                elif entry > heap[0]:
+                    heapq.heapreplace(heap, entry)
+
+        self.evaluated = evaluated
+        self.elapsed = time.perf_counter() - start
+
+        results = []
+        for score, _, negated, neg_variant, neg_operation in sorted(heap, reverse=True):
+            key = ''.join(str(-d) for d in negated)
+            name, operation = names[-neg_variant], self.operations[-neg_operation]
+            decoded = combine(variants[name], key, operation)
+            results.append({
+                'variant': name,
+                'operation': operation,
+                'key': key,
+                'score': score,
+                'result': decoded,
+                'text': scoring.render(decoded, 2)
+            })
+        return results
+
+    def throughput(self) -> Dict[str, Any]:
+        elapsed = self.elapsed or 1e-9
+        return {
+            'candidates': self.evaluated,
+            'elapsed_seconds': round(self.elapsed, 3),
+            'candidates_per_second': round(self.evaluated / elapsed, 2)
+        }
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Score every digit key under XOR, additive and subtractive combining")
+    parser.add_argument("sequence", nargs="?", help="Digit sequence (default: every preprocessed Cicada variant)")
+    parser.add_argument("--max-length", type=int, default=MAX_KEY_LENGTH, help="Longest key to try")
+    parser.add_argument("--operations", nargs="+", choices=sorted(COMBINE_TABLES), default=list(COMBINE_TABLES),
+                        help="Combining operations to try")
+    parser.add_argument("--top", type=int, default=10, help="Number of keys to keep")
+    parser.add_argument("--scorer", choices=["printable", "control_inclusive"], default="printable",
+                        help="Scoring table")
+    args = parser.parse_args(argv)
+
+    if args.sequence:
+        variants = {'sequence': args.sequence}
+    else:
+        from b import CicadaAdvancedAnalyzer
+        from c import CICADA_NUMBER
+        registry = CicadaAdvancedAnalyzer(CICADA_NUMBER).preprocess_data()
+        variants = {name: data for name, data, _ in registry.unique_items()}
+
+    scorer = scoring.PRINTABLE_SCORER if args.scorer == "printable" else scoring.CONTROL_INCLUSIVE_SCORER
+    search = KeySearch(args.max_length, tuple(args.operations), scorer, args.top)
+    results = search.search(variants)
+
+    for rank, result in enumerate(results, 1):
+        print(f"#{rank:<3} {result['score']:5.1f}%  {result['operation']:<3} key={result['key']:<{args.max_length}} "
+              f"{result['variant']}  '{result['text'][:60]}'")
+
+    stats = search.throughput()
+    print(f"⚡ {stats['candidates']} candidates in {stats['elapsed_seconds']}s "
+          f"({stats['candidates_per_second']:.0f}/s)", file=sys.stderr)
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+
+import os
+import argparse
+import unicodedata
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+
+import scoring
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+CORPUS_DIR = os.path.join(PACKAGE_DIR, "corpora")
+LANGUAGES = {
+    'english': "english.txt",
+    'latin': "latin.txt",
+    'old_english': "old_english.txt"
+}
+# Read by cache.code_version, so editing a corpus invalidates cached results that were scored with it
+DATA_FILES = ["corpora/*.txt"]
+ORDER = 3
+SMOOTHING = 0.5
+# Printable ASCII the tables are calibrated against; seeded so every process gets the same floor
+NOISE_LENGTH = 4096
+NOISE_SEED = 3301
+
+# Symbol classes: 26 case-folded letters, then space, any other printable character, anything unprintable
+SPACE = 26
+OTHER = 27
+INVALID = 28
+ALPHABET = 29
+
+BYTE_CLASSES = np.full(256, INVALID, dtype=np.int64)
+BYTE_CLASSES[32:127] = OTHER
+BYTE_CLASSES[ord(' ')] = SPACE
+BYTE_CLASSES[ord('a'):ord('z') + 1] = np.arange(26)
+BYTE_CLASSES[ord('A'):ord('Z') + 1] = np.arange(26)
+
+# Decoded group value -> class, for values produced by scoring.group_values
+VALUE_CLASSES = np.full(10 ** scoring.MAX_GROUP_SIZE, INVALID, dtype=np.int64)
+VALUE_CLASSES[:256] = BYTE_CLASSES
+
+# Letters the corpora use that plain ASCII decodes cannot; spelled the way rune transliterations spell them
+FOLDED = {'þ': 'th', 'ð': 'th', 'Þ': 'th', 'Ð': 'th', 'æ': 'ae', 'Æ': 'ae', 'ƿ': 'w', 'œ': 'oe'}
+
+MODELS = {}
+
+
+def normalize_text(text: str) -> str:
+    text = ''.join(FOLDED.get(char, char) for char in text)
+    text = ''.join(char for char in unicodedata.normalize('NFKD', text) if not unicodedata.combining(char))
+    return ' '.join(text.split())
+
+
+def text_classes(text: str) -> np.ndarray:
+    return BYTE_CLASSES[np.frombuffer(text.encode('latin-1', 'replace'), dtype=np.uint8)]
+
+
+def value_classes(values: np.ndarray) -> np.ndarray:
+    values = np.asarray(values, dtype=np.int64)
+    inside = (values >= 0) & (values < len(VALUE_CLASSES))
+    return np.where(inside, VALUE_CLASSES[np.where(inside, values, 0)], INVALID)
+
+
+def gram_indices(codes: np.ndarray, length: int) -> np.ndarray:
+    # Base-ALPHABET index of the length-gram ending at every position from length - 1 on, along the last axis
+    width = codes.shape[-1] - length + 1
+    index = np.zeros(codes.shape[:-1] + (max(width, 0),), dtype=np.int64)
+    for k in range(length):
+        index = index * ALPHABET + codes[..., k:k + width]
+    return index
+
+
+class NgramModel:
+
+    def __init__(self, tables: List[np.ndarray], name: str):
+        # tables[c] holds log P(symbol | c preceding symbols), flattened over the (c + 1)-gram
+        self.tables = [np.asarray(table, dtype=np.float32) for table in tables]
+        self.order = len(self.tables)
+        self.name = name
+        self.references = [0.0] * self.order
+        self.floors = [0.0] * self.order
+
+    @classmethod
+    def from_text(cls, text: str, name: str, order: int = ORDER, smoothing: float = SMOOTHING) -> 'NgramModel':
+        codes = text_classes(normalize_text(text))
+        if len(codes) < order:
+            raise ValueError(f"Corpus '{name}' is shorter than {order} characters")
+
+        tables = []
+        for length in range(1, order + 1):
+            counts = np.bincount(gram_indices(codes, length), minlength=ALPHABET ** length).astype(np.float64)
+            counts = counts.reshape(-1, ALPHABET) + smoothing
+            tables.append(np.log(counts / counts.sum(axis=1, keepdims=True)).ravel())
+
+        model = cls(tables, name)
+        noise = np.random.default_rng(NOISE_SEED).integers(32, 127, NOISE_LENGTH)
+        for context in range(order):
+            model.references[context] = float(model.mean_logprob(codes, context + 1))
+            model.floors[context] = float(model.mean_logprob(BYTE_CLASSES[noise], context + 1))
+        return model
+
+    def position_logprobs(self, codes: np.ndarray, order: int = None) -> np.ndarray:
+        # Early positions fall back to the longest context they have
+        order = min(order or self.order, self.order)
+        codes = np.asarray(codes, dtype=np.int64)
+        logprobs = np.zeros(codes.shape, dtype=np.float32)
+        for context in range(min(order - 1, codes.shape[-1])):
+            logprobs[..., context] = self.tables[context][gram_indices(codes[..., :context + 1], context + 1)[..., 0]]
+        if codes.shape[-1] >= order:
+            logprobs[..., order - 1:] = self.tables[order - 1][gram_indices(codes, order)]
+        return logprobs
+
+    def mean_logprob(self, codes: np.ndarray, order: int = None) -> np.ndarray:
+        codes = np.asarray(codes, dtype=np.int64)
+        if codes.shape[-1] == 0:
+            return np.full(codes.shape[:-1], self.floors[(order or self.order) - 1])
+        return self.position_logprobs(codes, order).mean(axis=-1, dtype=np.float64)
+
+    def normalize(self, logprobs: np.ndarray, order: int = None) -> np.ndarray:
+        # 100 reads like the corpus itself, 0 like uniformly random printable ASCII or worse
+        context = min(order or self.order, self.order) - 1
+        reference, floor = self.references[context], self.floors[context]
+        return np.clip((np.asarray(logprobs) - floor) / (reference - floor), 0, 1) * 100
+
+    def window_sums(self, lane: np.ndarray, firsts: np.ndarray, total: int) -> np.ndarray:
+        # Log-probability of lane[f:f + total] for every f, each window scored as if it began the text
+        order = min(self.order, total)
+        full = np.zeros(len(lane) + 1)
+        if len(lane) >= order:
+            full[order:] = np.cumsum(self.tables[order - 1][gram_indices(lane, order)], dtype=np.float64)
+        sums = full[firsts + total] - full[firsts + order - 1]
+        for context in range(order - 1):
+            sums += self.tables[context][gram_indices(lane, context + 1)[firsts]]
+        return sums
+
+
+def model(language: str, order: int = ORDER) -> NgramModel:
+    # Each corpus is read and counted once per process
+    if language not in LANGUAGES:
+        raise ValueError(f"Unknown language '{language}'; expected one of {sorted(LANGUAGES)}")
+    key = (language, order)
+    if key not in MODELS:
+        with open(os.path.join(CORPUS_DIR, LANGUAGES[language]), encoding='utf-8') as f:
+            MODELS[key] = NgramModel.from_text(f.read(), language, order)
+    return MODELS[key]
+
+
+class NgramScorer:
+
+    def __init__(self, language: str = 'english', order: int = ORDER):
+        if language not in LANGUAGES:
+            raise ValueError(f"Unknown language '{language}'; expected one of {sorted(LANGUAGES)}")
+        self.language = language
+        self.order = order
+        self.name = language
+
+    @property
+    def model(self) -> NgramModel:
+        return model(self.language, self.order)
+
+    def score_bytes(self, data: Union[bytes, np.ndarray]) -> Union[float, np.ndarray]:
+        # One score per row when given a 2-D array of equal-length candidates
+        if isinstance(data, (bytes, bytearray)):
+            data = np.frombuffer(data, dtype=np.uint8)
+        scores = self.model.normalize(self.model.mean_logprob(BYTE_CLASSES[np.asarray(data, dtype=np.uint8)]))
+        return float(scores) if np.ndim(scores) == 0 else scores
+
+    def score_text(self, text: str) -> float:
+        return self.score_bytes(text.encode('latin-1', 'replace'))
+
+    def score_values(self, values: List[int]) -> float:
+        if not len(values):
+            return 0
+        return float(self.model.normalize(self.model.mean_logprob(value_classes(values)), min(self.order, len(values))))
+
+    def score_rotations(self, data: Union[str, np.ndarray], group_size) -> np.ndarray:
+        model = self.model
+        if group_size == scoring.MIXED:
+            n = len(data)
+            if n == 0:
+                return np.zeros(0)
+            # Groups are read from each start until the next would run past it, as decode_search.read_groups reads them,
+            # and scored like score_values: the opening groups back off to shorter contexts, the rest use full n-grams.
+            # The chain from any position is fixed, so the n-gram opening at every group is known in advance.
+            grouped, damaged, jump = scoring.mixed_layout(data)
+            classes = np.append(np.where(damaged, INVALID, value_classes(grouped)), INVALID)
+            _, counts = scoring.chain_sums(jump, np.zeros(len(grouped)), n)
+
+            starters = np.zeros(n)
+            position = np.arange(len(jump))
+            index = classes[position]
+            for context in range(self.order):
+                if context:
+                    position = jump[position]
+                    index = index * ALPHABET + classes[position]
+                if context < self.order - 1:
+                    starters += np.where(counts > context, model.tables[context][index[:n]], 0)
+            sums, _ = scoring.chain_sums(jump, model.tables[-1][index[:-1]], n, lookahead=self.order - 1)
+
+            means = np.divide(starters + sums, counts, out=np.zeros(n), where=counts > 0)
+            scores = np.zeros(n)
+            for order in np.unique(np.minimum(counts[counts > 0], self.order)).tolist():
+                chosen = (counts > 0) & (np.minimum(counts, self.order) == order)
+                scores[chosen] = model.normalize(means[chosen], order)
+            return scores
+
+        n = len(data)
+        total = n // group_size
+        if total == 0:
+            return np.zeros(n)
+
+        classes = value_classes(scoring.group_values(data, group_size, circular=True))
+        doubled = np.concatenate((classes, classes))
+        starts = np.arange(n)
+        sums = np.zeros(n)
+        for residue in range(group_size):
+            chosen = starts % group_size == residue
+            sums[chosen] = model.window_sums(doubled[residue::group_size], starts[chosen] // group_size, total)
+        return model.normalize(sums / total, min(self.order, total))
+
+
+ENGLISH_SCORER = NgramScorer('english')
+LATIN_SCORER = NgramScorer('latin')
+OLD_ENGLISH_SCORER = NgramScorer('old_english')
+SCORERS = {
+    'english': ENGLISH_SCORER,
+    'latin': LATIN_SCORER,
+    'old_english': OLD_ENGLISH_SCORER
+}
+
+
+def best_language(values: List[int]) -> Tuple[str, float]:
+    scores = {language: scorer.score_values(values) for language, scorer in SCORERS.items()}
+    language = max(scores, key=scores.get)
+    return language, scores[language]
+
+
+def main(argv: List[str] = None) -> Dict[str, Dict[str, float]]:
+    parser = argparse.ArgumentParser(description="Score text against character n-gram language models")
+    parser.add_argument("texts", nargs="+", help="Texts to score")
+    parser.add_argument("--languages", nargs="+", choices=sorted(LANGUAGES), default=list(LANGUAGES),
+                        help="Language models to score against")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for text in args.texts:
+        results[text] = {language: SCORERS[language].score_text(text) for language in args.languages}
+        scores = "  ".join(f"{language}={score:5.1f}" for language, score in results[text].items())
+        print(f"{scores}  '{text[:60]}'")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+
+from typing import Dict, Iterator, List, Tuple, Union
+
+import numpy as np
+
+import digits
+from repeats import as_symbols
+
+
+def manacher(symbols) -> Tuple[List[int], List[int]]:
+    n = len(symbols)
+    odd = [0] * n
+    left, right = 0, -1
+    for i in range(n):
+        k = 1 if i > right else min(odd[left + right - i], right - i + 1)
+        while i - k >= 0 and i + k < n and symbols[i - k] == symbols[i + k]:
+            k += 1
+        odd[i] = k - 1
+        if i + k - 1 > right:
+            left, right = i - k + 1, i + k - 1
+
+    even = [0] * n
+    left, right = 0, -1
+    for i in range(n):
+        k = 0 if i > right else min(even[left + right - i + 1], right - i + 1)
+        while i - k - 1 >= 0 and i + k < n and symbols[i - k - 1] == symbols[i + k]:
+            k += 1
+        even[i] = k
+        if i + k - 1 > right:
+            left, right = i - k, i + k - 1
+
+    return odd, even[1:]
+
+
+class PalindromeIndex:
+
+    def __init__(self, text: Union[str, bytes, np.ndarray], expansion_limit: int = 64):
+        if isinstance(text, np.ndarray):
+            text = digits.to_digit_string(text)
+
+        self.text = text
+        self.length = len(text)
+        symbols = as_symbols(text)
+        self.odd_radii, self.even_radii = self.build(symbols, expansion_limit)
+
+    def build(self, symbols: np.ndarray, expansion_limit: int) -> Tuple[np.ndarray, np.ndarray]:
+        n = len(symbols)
+        if n == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+        # Short palindromes are found by expanding every centre at once; long ones fall back to Manacher
+        odd = self.expand(symbols, np.arange(n) - 1, np.arange(n) + 1, expansion_limit)
+        even = self.expand(symbols, np.arange(n - 1), np.arange(1, n), expansion_limit)
+        if odd is None or even is None:
+            odd, even = manacher(symbols.tolist())
+            return np.asarray(odd, dtype=np.int64), np.asarray(even, dtype=np.int64)
+        return odd, even
+
+    def expand(self, symbols: np.ndarray, left: np.ndarray, right: np.ndarray, limit: int):
+        n = len(symbols)
+        radii = np.zeros(len(left), dtype=np.int64)
+        active = np.arange(len(left))
+
+        for _ in range(limit):
+            alive = (left >= 0) & (right < n)
+            active, left, right = active[alive], left[alive], right[alive]
+            same = symbols[left] == symbols[right]
+            active, left, right = active[same], left[same] - 1, right[same] + 1
+            if len(active) == 0:
+                return radii
+            radii[active] += 1
+        return None
+
+    def center_lengths(self) -> Tuple[np.ndarray, np.ndarray]:
+        return 2 * self.odd_radii + 1, 2 * self.even_radii
+
+    def positions(self, length: int) -> np.ndarray:
+        if length <= 0 or length > self.length:
+            return np.zeros(0, dtype=np.int64)
+
+        half = length // 2
+        if length % 2:
+            return np.flatnonzero(self.odd_radii >= half) - half
+        return np.flatnonzero(self.even_radii >= half) - (half - 1)
+
+    def occurrences(self, min_length: int, max_length: int) -> Iterator[Tuple[str, int, int]]:
+        for length in range(max(min_length, 1), min(max_length, self.length) + 1):
+            for position in self.positions(length).tolist():
+                yield self.text[position:position + length], position, length
+
+    def palindromes(self, min_length: int, max_length: int) -> List[Tuple[str, int, int]]:
+        return list(self.occurrences(min_length, max_length))
+
+    def maximal(self, min_length: int = 2) -> List[Tuple[str, int, int]]:
+        odd_lengths, even_lengths = self.center_lengths()
+        starts = np.concatenate((np.arange(self.length) - self.odd_radii,
+                                 np.arange(1, self.length) - self.even_radii))
+        lengths = np.concatenate((odd_lengths, even_lengths))
+
+        keep = lengths >= min_length
+        starts, lengths = starts[keep], lengths[keep]
+        order = np.lexsort((-lengths, starts))
+        return [(self.text[start:start + length], start, length)
+                for start, length in zip(starts[order].tolist(), lengths[order].tolist())]
+
+    def start_counts(self, min_length: int = 3, max_length: int = None) -> np.ndarray:
+        n = self.length
+        max_length = n if max_length is None else min(max_length, n)
+        counts = np.zeros(n + 1, dtype=np.int64)
+        if n == 0 or max_length < min_length:
+            return counts[:n]
+
+        # A centre contributes one palindrome per admissible radius, and their starts form a contiguous run
+        for radii, centres, parity in ((self.odd_radii, np.arange(n), 1), (self.even_radii, np.arange(1, n), 0)):
+            low = max((min_length - parity + 1) // 2, 1 - parity)
+            high = np.minimum(radii, (max_length - parity) // 2)
+            valid = high >= low
+            np.add.at(counts, centres[valid] - high[valid], 1)
+            np.add.at(counts, centres[valid] - low + 1, -1)
+
+        return np.cumsum(counts)[:n]
+
+    def count(self, min_length: int = 3, max_length: int = None) -> int:
+        return int(self.start_counts(min_length, max_length).sum())
+
+    def density(self, window: int, step: int = None, min_length: int = 3, max_length: int = None) -> List[Dict[str, float]]:
+        step = step or window
+        prefix = np.concatenate(([0], np.cumsum(self.start_counts(min_length, max_length))))
+
+        windows = []
+        for start in range(0, max(self.length - window, 0) + 1, step):
+            end = min(start + window, self.length)
+            palindromes = int(prefix[end] - prefix[start])
+            windows.append({
+                "start": start,
+                "end": end,
+                "palindromes": palindromes,
+                "density": palindromes / (end - start) if end > start else 0.0
+            })
+        return windows
+
+    def distinct(self, min_length: int = 3, max_length: int = None) -> Dict[int, List[str]]:
+        max_length = self.length if max_length is None else max_length
+        by_length = {}
+        for palindrome, _, length in self.occurrences(min_length, max_length):
+            by_length.setdefault(length, {})[palindrome] = None
+        return {length: list(found) for length, found in by_length.items()}
@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import json
+import time
+import pickle
+import hashlib
+import argparse
+import contextlib
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, List, Tuple
+
+from cache import local_sources
+
+PIPELINE_DIR = ".cicada_pipeline"
+MANIFEST = "manifest.json"
+MOD95_PREFIX = "mod95: "
+
+
+class Node:
+
+    def __init__(self, name: str, module: str, inputs: Tuple[str, ...], outputs: Tuple[str, ...],
+                 func: Callable[..., Dict[str, Any]]):
+        self.name = name
+        self.module = module
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+        self.func = func
+
+
+def run_solver(sequence: str) -> Dict[str, Any]:
+    from a import CicadaSolver
+    solver = CicadaSolver(sequence)
+    report = solver.run_complete_analysis()
+    return {'solver_results': solver.results, 'solver_report': str(report)}
+
+
+def run_advanced(sequence: str) -> Dict[str, Any]:
+    from b import CicadaAdvancedAnalyzer
+    analyzer = CicadaAdvancedAnalyzer(sequence)
+    report = analyzer.run_complete_analysis()
+    return {'advanced_results': analyzer.results, 'advanced_report': report}
+
+
+def run_focused(sequence: str) -> Dict[str, Any]:
+    from c import CicadaFocusedDecoder
+    decoder = CicadaFocusedDecoder(sequence)
+    report = decoder.run_focused_decode()
+    return {'focused_results': decoder.results, 'focused_report': report}
+
+
+def run_solution(sequence: str) -> Dict[str, Any]:
+    from Full_solution import CicadaCompleteSolution
+    solver = CicadaCompleteSolution(sequence)
+    report = solver.run_complete_demonstration()
+    return {
+        'extracted_hex': solver.hex_layers['hex_string'],
+        'decoded_ascii': solver.analysis_results['phase_3']['primary_decoded_message'],
+        'solution_report': report
+    }
+
+
+def run_hex(extracted_hex: str) -> Dict[str, Any]:
+    from Hex import CicadaHexProcessor
+    processor = CicadaHexProcessor(extracted_hex)
+    report = processor.run_complete_analysis()
+    results = processor.results
+    return {
+        'primary_command': results['layer_1_ascii'],
+        'timestamps': [timestamp['decimal'] for timestamp in results['layer_2_timestamps']],
+        'coordinates': [(coord['latitude'], coord['longitude']) for coord in results['layer_3_coordinates']],
+        'colors': [tuple(color['rgb']) for color in results['layer_4_colors']],
+        'hex_report': report
+    }
+
+
+def run_deep(sequence: str, extracted_hex: str, decoded_ascii: str, timestamps: List[int],
+             coordinates: List[Tuple[float, float]], colors: List[Tuple[int, int, int]]) -> Dict[str, Any]:
+    from d import ComprehensiveAnalyzer
+    analyzer = ComprehensiveAnalyzer(sequence, extracted_hex, decoded_ascii, timestamps, coordinates, colors)
+    report = analyzer.run_analysis()
+
+    intervals = analyzer.analyze_timestamp_intervals()
+    if not intervals['coordinate_tests']:
+        raise ValueError("No pair of timestamp intervals forms a valid coordinate")
+    non_extracted = analyzer.analyze_non_extracted_digits()
+    centroid = analyzer.analyze_geographic_patterns()['centroid']
+    palindromes = [palindrome['palindrome'] for palindrome in non_extracted['pattern_tests']['palindromes']]
+
+    return {
+        'intervals': intervals['intervals'],
+        'interval_ascii': [attempt[len(MOD95_PREFIX):] for attempt in intervals['ascii_attempts']
+                           if attempt.startswith(MOD95_PREFIX)],
+        'timestamp_coordinate': intervals['coordinate_tests'][0],
+        'centroid_coordinate': (centroid['latitude'], centroid['longitude']),
+        'xor_result': analyzer.analyze_binary_advanced()['xor_tests']['xor_with_44'],
+        'non_extracted_sequence': non_extracted['sequence'],
+        'non_extracted_palindromes': list(dict.fromkeys(palindromes)),
+        'deep_report': report
+    }
+
+
+def run_targeted(extracted_hex: str, primary_command: str, timestamp_coordinate: Tuple[float, float],
+                 centroid_coordinate: Tuple[float, float], xor_result: str, non_extracted_sequence: str,
+                 intervals: List[int], interval_ascii: List[str], non_extracted_palindromes: List[str],
+                 coordinates: List[Tuple[float, float]]) -> Dict[str, Any]:
+    from e import TargetedAnalyzer
+    analyzer = TargetedAnalyzer(extracted_hex, primary_command, timestamp_coordinate, centroid_coordinate, xor_result,
+                                non_extracted_sequence, intervals, interval_ascii, non_extracted_palindromes,
+                                coordinates)
+    report = analyzer.run_analysis()
+
+    all_coords = analyzer.original_coordinates + [analyzer.timestamp_coordinate, analyzer.centroid_coordinate]
+    master_keys = analyzer.attempt_master_key_derivation()
+    master_keys.pop('concatenated')
+    master_keys['centroid_key'] = analyzer.investigate_centroid_coordinate()['encoding_potential']['potential_key']
+
+    return {
+        'unified_coordinate': analyzer.attempt_unified_coordinate(),
+        'geometric_center': analyzer.calculate_geometric_center(all_coords),
+        'master_keys': master_keys,
+        'targeted_report': report
+    }
+
+
+def run_synthesis(sequence: str, extracted_hex: str, primary_command: str, xor_result: str,
+                  interval_ascii: List[str], intervals: List[int], timestamp_coordinate: Tuple[float, float],
+                  centroid_coordinate: Tuple[float, float], unified_coordinate: Tuple[float, float],
+                  geometric_center: Tuple[float, float], master_keys: Dict[str, int],
+                  coordinates: List[Tuple[float, float]]) -> Dict[str, Any]:
+    from f import FinalSynthesizer
+    synthesizer = FinalSynthesizer(sequence, extracted_hex, primary_command, xor_result, ''.join(interval_ascii),
+                                   intervals, timestamp_coordinate, centroid_coordinate, unified_coordinate,
+                                   geometric_center, master_keys, coordinates)
+    return {'synthesis_report': synthesizer.run_synthesis()}
+
+
+NODES = [
+    Node('solver', 'a', ('sequence',), ('solver_results', 'solver_report'), run_solver),
+    Node('advanced', 'b', ('sequence',), ('advanced_results', 'advanced_report'), run_advanced),
+    Node('focused', 'c', ('sequence',), ('focused_results', 'focused_report'), run_focused),
+    Node('solution', 'Full_solution', ('sequence',), ('extracted_hex', 'decoded_ascii', 'solution_report'),
+         run_solution),
+    Node('hex', 'Hex', ('extracted_hex',), ('primary_command', 'timestamps', 'coordinates', 'colors', 'hex_report'),
+         run_hex),
+    Node('deep', 'd', ('sequence', 'extracted_hex', 'decoded_ascii', 'timestamps', 'coordinates', 'colors'),
+         ('intervals', 'interval_ascii', 'timestamp_coordinate', 'centroid_coordinate', 'xor_result',
+          'non_extracted_sequence', 'non_extracted_palindromes', 'deep_report'), run_deep),
+    Node('targeted', 'e', ('extracted_hex', 'primary_command', 'timestamp_coordinate', 'centroid_coordinate',
+                           'xor_result', 'non_extracted_sequence', 'intervals', 'interval_ascii',
+                           'non_extracted_palindromes', 'coordinates'),
+         ('unified_coordinate', 'geometric_center', 'master_keys', 'targeted_report'), run_targeted),
+    Node('synthesis', 'f', ('sequence', 'extracted_hex', 'primary_command', 'xor_result', 'interval_ascii',
+                            'intervals', 'timestamp_coordinate', 'centroid_coordinate', 'unified_coordinate',
+                            'geometric_center', 'master_keys', 'coordinates'),
+         ('synthesis_report',), run_synthesis)
+]
+NODE_INDEX = {node.name: node for node in NODES}
+
+
+def digest(value: Any) -> str:
+    return hashlib.sha256(pickle.dumps(value, protocol=4)).hexdigest()
+
+
+def execute(name: str, inputs: Dict[str, Any], log_path: str) -> Tuple[Dict[str, Any], float]:
+    node = NODE_INDEX[name]
+    start = time.perf_counter()
+    with open(log_path, 'w', encoding='utf-8') as log, contextlib.redirect_stdout(log):
+        outputs = node.func(**inputs)
+
+    missing = set(node.outputs) - set(outputs)
+    if missing:
+        raise ValueError(f"Node '{name}' did not produce: {', '.join(sorted(missing))}")
+    return {key: outputs[key] for key in node.outputs}, time.perf_counter() - start
+
+
+class Pipeline:
+
+    def __init__(self, nodes: List[Node] = None, directory: str = PIPELINE_DIR, workers: int = None,
+                 force: bool = False):
+        self.nodes = list(NODES if nodes is None else nodes)
+        self.directory = directory
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.force = force
+
+        self.manifest_path = os.path.join(directory, MANIFEST)
+        self.manifest = self.load_manifest()
+        self.status = {}
+        self.check_graph()
+
+    def check_graph(self):
+        produced = {}
+        for node in self.nodes:
+            for output in node.outputs:
+                if output in produced:
+                    raise ValueError(f"Artifact '{output}' is produced by both '{produced[output]}' and '{node.name}'")
+                produced[output] = node.name
+
+    def load_manifest(self) -> Dict[str, Any]:
+        if not os.path.exists(self.manifest_path):
+            return {}
+        with open(self.manifest_path, encoding='utf-8') as handle:
+            return json.load(handle)
+
+    def save_manifest(self):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.manifest_path, 'w', encoding='utf-8') as handle:
+            json.dump(self.manifest, handle, indent=2, sort_keys=True)
+
+    def artifact_path(self, node: Node) -> str:
+        return os.path.join(self.directory, f"{node.name}.pkl")
+
+    def node_key(self, node: Node, inputs: Dict[str, Any]) -> str:
+        fingerprint = {
+            'node': node.name,
+            'sources': local_sources(node.module, local_sources('pipeline', shallow=('pipeline',))),
+            'inputs': {name: digest(value) for name, value in sorted(inputs.items())}
+        }
+        return hashlib.sha256(json.dumps(fingerprint, sort_keys=True).encode()).hexdigest()
+
+    def load_cached(self, node: Node, key: str) -> Dict[str, Any]:
+        entry = self.manifest.get(node.name)
+        path = self.artifact_path(node)
+        if self.force or not entry or entry['key'] != key or not os.path.exists(path):
+            return None
+        with open(path, 'rb') as handle:
+            return pickle.load(handle)
+
+    def store(self, node: Node, key: str, outputs: Dict[str, Any], elapsed: float):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.artifact_path(node), 'wb') as handle:
+            pickle.dump(outputs, handle, protocol=4)
+
+        self.manifest[node.name] = {
+            'key': key,
+            'inputs': list(node.inputs),
+            'outputs': {name: digest(value) for name, value in outputs.items()},
+            'elapsed_seconds': round(elapsed, 4),
+            'completed': time.strftime('%Y-%m-%d %H:%M:%S')
+        }
+        self.save_manifest()
+
+    def run(self, artifacts: Dict[str, Any]) -> Dict[str, Any]:
+        artifacts = dict(artifacts)
+        pending = {node.name: node for node in self.nodes}
+        running = {}
+        os.makedirs(self.directory, exist_ok=True)
+
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            while pending or running:
+                ready = [node for node in pending.values() if all(name in artifacts for name in node.inputs)]
+                for node in ready:
+                    del pending[node.name]
+                    inputs = {name: artifacts[name] for name in node.inputs}
+                    key = self.node_key(node, inputs)
+
+                    cached = self.load_cached(node, key)
+                    if cached is not None:
+                        artifacts.update(cached)
+                        self.status[node.name] = 'cached'
+                        print(f"♻️  {node.name}: inputs unchanged, reusing artifacts")
+                        continue
+
+                    print(f"🚀 {node.name}: running {node.module}.py")
+                    log_path = os.path.join(self.directory, f"{node.name}.log")
+                    running[executor.submit(execute, node.name, inputs, log_path)] = (node, key)
+
+                # Cached nodes may have unlocked others, so schedule again before waiting
+                if any(all(name in artifacts for name in node.inputs) for node in pending.values()):
+                    continue
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node, key = running.pop(future)
+                    try:
+                        outputs, elapsed = future.result()
+                    except Exception as e:
+                        self.status[node.name] = 'failed'
+                        print(f"❌ {node.name}: {e}")
+                        continue
+
+                    self.store(node, key, outputs, elapsed)
+                    artifacts.update(outputs)
+                    self.status[node.name] = 'completed'
+                    print(f"✅ {node.name}: completed in {elapsed:.2f}s")
+
+        for name in pending:
+            self.status[name] = 'blocked'
+            print(f"⏸️  {name}: blocked by a failed upstream node")
+
+        return artifacts
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the analysis phases as an artifact-passing DAG")
+    parser.add_argument("sequence", nargs="?", help="Digit sequence (default: the Cicada number)")
+    parser.add_argument("--dir", default=PIPELINE_DIR, help="Directory for cached artifacts, logs and the manifest")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Concurrent nodes (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="Recompute every node even if its inputs are unchanged")
+    args = parser.parse_args(argv)
+
+    if args.sequence:
+        sequence = args.sequence
+    else:
+        from c import CICADA_NUMBER
+        sequence = CICADA_NUMBER
+
+    start = time.perf_counter()
+    pipeline = Pipeline(directory=args.dir, workers=args.workers, force=args.force)
+    artifacts = pipeline.run({'sequence': sequence})
+
+    print("=" * 60)
+    for node in pipeline.nodes:
+        print(f"   {node.name:<10} {pipeline.status.get(node.name, 'blocked')}")
+    print(f"⏱️  Pipeline duration: {time.perf_counter() - start:.2f} seconds")
+    if 'synthesis_report' in artifacts:
+        print(f"🏆 Final report: {artifacts['synthesis_report']}")
+
+    return 0 if all(status in ('completed', 'cached') for status in pipeline.status.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
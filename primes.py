@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+
+import math
+import random
+from typing import Iterable, List
+
+import numpy as np
+
+SEGMENT_SIZE = 1 << 20
+SIEVE_CEILING = 1 << 26
+# The first 13 primes as bases make Miller-Rabin exact below this bound (Sorenson and Webster)
+MILLER_RABIN_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+MILLER_RABIN_LIMIT = 3317044064679887385961981
+# Beyond the bound is_prime is probabilistic: random bases, each letting a composite through with probability <= 1/4
+PROBABLE_PRIME_ROUNDS = 64
+# Pollard's rho restarts with a fresh polynomial this many times, each walking at most this many steps
+POLLARD_RHO_ATTEMPTS = 32
+POLLARD_RHO_STEPS = 1 << 22
+
+
+class PrimeSieve:
+
+    def __init__(self):
+        self.bits = np.zeros(0, dtype=np.uint8)
+        self.size = 0
+
+    def ensure(self, limit: int):
+        if limit < self.size:
+            return
+
+        target = max(limit + 1, 2 * self.size, SEGMENT_SIZE)
+        target = (target + 7) // 8 * 8
+        base = self.base_primes(math.isqrt(target) + 1)
+
+        # Sieve only the new range, one segment at a time, and append it packed 8 numbers per byte
+        chunks = [self.bits]
+        for low in range(self.size, target, SEGMENT_SIZE):
+            high = min(low + SEGMENT_SIZE, target)
+            chunks.append(np.packbits(self.sieve_segment(low, high, base), bitorder='little'))
+
+        self.bits = np.concatenate(chunks)
+        self.size = target
+
+    def base_primes(self, limit: int) -> np.ndarray:
+        mask = np.ones(limit + 1, dtype=bool)
+        mask[:2] = False
+        for p in range(2, math.isqrt(limit) + 1):
+            if mask[p]:
+                mask[p * p::p] = False
+        return np.flatnonzero(mask)
+
+    def sieve_segment(self, low: int, high: int, base: np.ndarray) -> np.ndarray:
+        mask = np.ones(high - low, dtype=bool)
+        if low < 2:
+            mask[:2 - low] = False
+
+        for p in base.tolist():
+            if p * p >= high:
+                break
+            start = max(p * p, (low + p - 1) // p * p)
+            mask[start - low::p] = False
+        return mask
+
+    def mask(self, limit: int) -> np.ndarray:
+        self.ensure(limit)
+        return np.unpackbits(self.bits[:limit // 8 + 1], bitorder='little')[:limit + 1].astype(bool)
+
+    def contains(self, n: int) -> bool:
+        self.ensure(n)
+        return bool((self.bits[n >> 3] >> (n & 7)) & 1)
+
+
+SIEVE = PrimeSieve()
+
+
+def miller_rabin(n: int, bases: Iterable[int] = MILLER_RABIN_BASES) -> bool:
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    for a in bases:
+        x = pow(a, d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def is_prime(n: int) -> bool:
+    if n < 2:
+        return False
+    if n < SIEVE_CEILING:
+        return SIEVE.contains(n)
+    for p in MILLER_RABIN_BASES:
+        if n % p == 0:
+            return n == p
+    if n < MILLER_RABIN_LIMIT:
+        return miller_rabin(n)
+    return miller_rabin(n, [random.randrange(2, n - 1) for _ in range(PROBABLE_PRIME_ROUNDS)])
+
+
+def prime_mask(limit: int) -> np.ndarray:
+    return SIEVE.mask(limit)
+
+
+def prime_indices(length: int) -> np.ndarray:
+    return np.flatnonzero(prime_mask(length)[1:])
+
+
+def pollard_rho(n: int, attempts: int = POLLARD_RHO_ATTEMPTS, steps: int = POLLARD_RHO_STEPS) -> int:
+    if n % 2 == 0:
+        return 2
+
+    for _ in range(attempts):
+        y, c, m = random.randrange(1, n), random.randrange(1, n), 128
+        g, r, q = 1, 1, 1
+        while g == 1 and r <= steps:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(m, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = math.gcd(q, n)
+                k += m
+            r *= 2
+
+        if g == 1:
+            continue
+        if g == n:
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = math.gcd(abs(x - ys), n)
+        if g != n:
+            return g
+
+    raise ValueError(f"Pollard's rho found no factor of {n} in {attempts} attempts of up to {steps} steps")
+
+
+def factorize(n: int) -> List[int]:
+    factors = []
+    if n < 2:
+        return factors
+
+    for p in np.flatnonzero(prime_mask(1000)).tolist():
+        while n % p == 0:
+            factors.append(p)
+            n //= p
+
+    pending = [n] if n > 1 else []
+    while pending:
+        m = pending.pop()
+        if is_prime(m):
+            factors.append(m)
+        else:
+            divisor = pollard_rho(m)
+            pending.extend((divisor, m // divisor))
+
+    return sorted(factors)
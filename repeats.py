@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+
+import digits
+
+
+def as_symbols(text: Union[str, bytes]) -> np.ndarray:
+    if isinstance(text, (bytes, bytearray, memoryview)):
+        return np.frombuffer(text, dtype=np.uint8)
+    try:
+        return np.frombuffer(text.encode('latin-1'), dtype=np.uint8)
+    except UnicodeEncodeError:
+        return np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+
+
+class RepeatIndex:
+
+    def __init__(self, text: Union[str, bytes, np.ndarray], max_length: int = None):
+        if isinstance(text, np.ndarray):
+            text = digits.to_digit_string(text)
+
+        self.text = text
+        self.length = len(text)
+        self.max_length = max_length
+
+        symbols = as_symbols(text)
+        self.suffix_array, self.lcp = self.build(symbols, max_length)
+
+    def build(self, symbols: np.ndarray, cap: int = None) -> Tuple[np.ndarray, np.ndarray]:
+        n = len(symbols)
+        if n == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+        # Prefix doubling: after each round, rank[i] orders suffix i by its first k symbols
+        _, rank = np.unique(symbols, return_inverse=True)
+        rank = rank.astype(np.int64) + 1
+        # Only the LCP lift reads these, and n < 2**31, so they are kept as int32 copies
+        levels = [rank.astype(np.int32)] if cap is None else []
+        order = np.argsort(rank, kind='stable')
+        k = 1
+
+        while rank[order[-1]] < n and (cap is None or k < cap):
+            second = np.zeros(n, dtype=np.int64)
+            second[:n - k] = rank[k:]
+
+            keys = rank * (n + 1) + second
+            order = np.argsort(keys, kind='stable')
+            sorted_keys = keys[order]
+
+            boundaries = np.empty(n, dtype=np.int64)
+            boundaries[0] = 1
+            boundaries[1:] = sorted_keys[1:] != sorted_keys[:-1]
+
+            del keys, sorted_keys, second
+            rank = np.empty(n, dtype=np.int64)
+            rank[order] = np.cumsum(boundaries)
+            del boundaries
+            if cap is None:
+                levels.append(rank.astype(np.int32))
+            k *= 2
+
+        if cap is not None:
+            lcp = self.compare_neighbours(symbols, order, cap)
+        else:
+            # Once every rank is distinct no neighbours share that prefix length, so the top level is never needed
+            if rank[order[-1]] == n:
+                levels.pop()
+            del rank
+            lcp = self.lift_neighbours(levels, order, n)
+        return order, lcp
+
+    def compare_neighbours(self, symbols: np.ndarray, order: np.ndarray, cap: int) -> np.ndarray:
+        n = len(symbols)
+        lcp = np.zeros(n, dtype=np.int64)
+        left = order[:-1].copy()
+        right = order[1:].copy()
+        active = np.arange(n - 1)
+
+        for _ in range(cap):
+            alive = (left < n) & (right < n)
+            active, left, right = active[alive], left[alive], right[alive]
+            same = symbols[left] == symbols[right]
+            active, left, right = active[same], left[same] + 1, right[same] + 1
+            if len(active) == 0:
+                break
+            lcp[active + 1] += 1
+        return lcp
+
+    def lift_neighbours(self, levels: List[np.ndarray], order: np.ndarray, n: int) -> np.ndarray:
+        lcp = np.zeros(n, dtype=np.int64)
+        left = order[:-1].copy()
+        right = order[1:].copy()
+        matched = np.zeros(n - 1, dtype=np.int64)
+
+        # Levels are consumed from the longest prefix down and released as soon as they are used
+        while levels:
+            ranks = levels.pop()
+            step = 1 << len(levels)
+            alive = (left < n) & (right < n)
+            same = np.zeros(n - 1, dtype=bool)
+            same[alive] = ranks[left[alive]] == ranks[right[alive]]
+            matched += same * step
+            left += same * step
+            right += same * step
+
+        lcp[1:] = matched
+        return lcp
+
+    def groups(self, length: int, min_count: int = 2) -> List[np.ndarray]:
+        n = self.length
+        if n == 0 or length <= 0:
+            return []
+
+        starts = np.flatnonzero(np.concatenate(([True], self.lcp[1:] < length)))
+        sizes = np.diff(np.append(starts, n))
+        firsts = np.minimum.reduceat(self.suffix_array, starts)
+        keep = sizes >= max(min_count, 2)
+        starts, sizes, firsts = starts[keep], sizes[keep], firsts[keep]
+        if len(starts) == 0:
+            return []
+
+        groups = []
+        for index in np.argsort(firsts, kind='stable'):
+            start = starts[index]
+            groups.append(np.sort(self.suffix_array[start:start + sizes[index]]))
+        return groups
+
+    def repeats(self, min_length: int, max_length: int, min_count: int = 2) -> Dict[str, List[int]]:
+        if self.max_length is not None and max_length > self.max_length:
+            raise ValueError(f"Index was built for repeats up to length {self.max_length}, not {max_length}")
+
+        patterns = {}
+        for length in range(min_length, max_length + 1):
+            for positions in self.groups(length, min_count):
+                first = int(positions[0])
+                patterns[self.text[first:first + length]] = positions.tolist()
+        return patterns
+
+    def longest_repeat(self) -> Tuple[str, List[int]]:
+        if self.length < 2:
+            return self.text[:0], []
+
+        best = int(np.argmax(self.lcp))
+        length = int(self.lcp[best])
+        if length == 0:
+            return self.text[:0], []
+
+        start = best - 1
+        while start > 0 and self.lcp[start] >= length:
+            start -= 1
+        end = best + 1
+        while end < self.length and self.lcp[end] >= length:
+            end += 1
+
+        positions = np.sort(self.suffix_array[start:end])
+        first = int(positions[0])
+        return self.text[first:first + length], positions.tolist()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+
+import io
+import gzip
+from typing import Callable, Iterable
+
+CHUNK_SIZE = 64 * 1024
+
+
+class ReportWriter:
+
+    def __init__(self, path: str = None, compress: bool = False, chunk_size: int = CHUNK_SIZE,
+                 encoding: str = 'utf-8', stream=None):
+        if compress and path and not path.endswith('.gz'):
+            path += '.gz'
+
+        self.path = path
+        self.compress = compress
+        self.chunk_size = chunk_size
+        self.encoding = encoding
+
+        self.buffer = []
+        self.buffered = 0
+        self.characters_written = 0
+        self.started = False
+
+        if stream is not None:
+            self.stream = stream
+        elif compress:
+            self.stream = gzip.open(path, 'wt', encoding=encoding)
+        else:
+            self.stream = open(path, 'w', encoding=encoding)
+
+    def __enter__(self) -> 'ReportWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def write(self, text: str) -> 'ReportWriter':
+        if not text:
+            return self
+
+        self.buffer.append(text)
+        self.buffered += len(text)
+        self.characters_written += len(text)
+        self.started = True
+        if self.buffered >= self.chunk_size:
+            self.flush()
+        return self
+
+    __iadd__ = write
+
+    def append(self, line: str) -> 'ReportWriter':
+        # Mirrors list.append followed by "\n".join: a separator goes before every line but the first
+        if self.started:
+            self.write("\n")
+        self.started = True
+        return self.write(line)
+
+    def extend(self, lines: Iterable[str]) -> 'ReportWriter':
+        for line in lines:
+            self.append(line)
+        return self
+
+    def flush(self):
+        if self.buffer:
+            self.stream.write(''.join(self.buffer))
+            self.buffer = []
+            self.buffered = 0
+        self.stream.flush()
+
+    def close(self):
+        self.flush()
+        if self.path is not None:
+            self.stream.close()
+
+
+def render(section: Callable[['ReportWriter'], None]) -> str:
+    stream = io.StringIO()
+    writer = ReportWriter(stream=stream)
+    section(writer)
+    writer.flush()
+    return stream.getvalue()
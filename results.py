@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+
+import sys
+import json
+import time
+from array import array
+from datetime import datetime
+from collections.abc import Sequence
+from typing import Any, Dict, Hashable, Iterable, List, Tuple
+
+CONFIDENCE_LEVELS = ('CRITICAL', 'HIGH', 'MEDIUM', 'LOW')
+FIELDS = ('category', 'method', 'result', 'confidence')
+# Output keys and the column each one reads; 'result' is stringified when a row is rendered, 'finding' is not
+COLUMNS = {
+    'timestamp': 'created',
+    'category': 'category',
+    'method': 'method',
+    'result': 'result',
+    'finding': 'result',
+    'confidence': 'confidence'
+}
+
+# (category, method, result, confidence, created): the raw form rows are copied and cached in
+Row = Tuple[Hashable, str, Any, str, float]
+
+
+class Codes:
+
+    def __init__(self, names: Iterable[Hashable] = ()):
+        self.names = []
+        self.index = {}
+        for name in names:
+            self.code(name)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def code(self, name: Hashable) -> int:
+        found = self.index.get(name)
+        if found is None:
+            found = self.index[name] = len(self.names)
+            self.names.append(sys.intern(name) if isinstance(name, str) else name)
+        return found
+
+
+class ResultStore(Sequence):
+
+    def __init__(self, fields: Tuple[str, ...] = FIELDS, timestamp_format: str = None):
+        unknown = [field for field in fields if field not in COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown result fields: {unknown}")
+        self.fields = tuple(fields)
+        self.timestamp_format = timestamp_format
+
+        self.category_codes = Codes()
+        self.confidence_codes = Codes(CONFIDENCE_LEVELS)
+        self.categories = array('i')
+        self.confidences = array('B')
+        self.methods = []
+        self.results = []
+        self.created = array('d')
+
+        # Row numbers per confidence and per (category, confidence), so filters never scan the whole store
+        self.by_confidence = {}
+        self.by_group = {}
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.as_dict(row) for row in range(len(self.results))[index]]
+        return self.as_dict(range(len(self.results))[index])
+
+    def add(self, category: Hashable, method: str, result: Any, confidence: str, created: float = None):
+        row = len(self.results)
+        category = self.category_codes.code(category)
+        confidence = self.confidence_codes.code(confidence)
+        if confidence > 255:
+            raise ValueError("A result store holds at most 256 confidence levels")
+
+        self.categories.append(category)
+        self.confidences.append(confidence)
+        self.methods.append(None if method is None else sys.intern(method))
+        self.results.append(result)
+        self.created.append(time.time() if created is None else created)
+
+        self.by_confidence.setdefault(confidence, array('q')).append(row)
+        self.by_group.setdefault((category, confidence), array('q')).append(row)
+
+    def extend(self, rows: Iterable[Row]):
+        if isinstance(rows, ResultStore):
+            rows = rows.rows()
+        for row in rows:
+            self.add(*row)
+
+    def replay(self, rows: Iterable[Row]):
+        for category, method, result, confidence, _ in rows:
+            self.add(category, method, result, confidence)
+
+    def rows(self, start: int = 0) -> List[Row]:
+        categories, confidences = self.category_codes.names, self.confidence_codes.names
+        return [(categories[self.categories[row]], self.methods[row], self.results[row],
+                 confidences[self.confidences[row]], self.created[row])
+                for row in range(start, len(self.results))]
+
+    def value(self, row: int, field: str) -> Any:
+        column = COLUMNS[field]
+        if column == 'created':
+            created = datetime.fromtimestamp(self.created[row])
+            return created.strftime(self.timestamp_format) if self.timestamp_format else created.isoformat()
+        if column == 'category':
+            return self.category_codes.names[self.categories[row]]
+        if column == 'confidence':
+            return self.confidence_codes.names[self.confidences[row]]
+        if column == 'method':
+            return self.methods[row]
+        return str(self.results[row]) if field == 'result' else self.results[row]
+
+    def as_dict(self, row: int) -> Dict[str, Any]:
+        return {field: self.value(row, field) for field in self.fields}
+
+    def as_dicts(self) -> List[Dict[str, Any]]:
+        return [self.as_dict(row) for row in range(len(self.results))]
+
+    def to_json(self, indent: int = 2) -> str:
+        return json.dumps(self.as_dicts(), indent=indent)
+
+    def indices(self, category: Hashable = None, confidence: str = None) -> array:
+        if category is None and confidence is None:
+            return array('q', range(len(self.results)))
+        confidence_code = self.confidence_codes.index.get(confidence)
+        if category is None:
+            return self.by_confidence.get(confidence_code, array('q'))
+        category_code = self.category_codes.index.get(category)
+        if confidence is not None:
+            return self.by_group.get((category_code, confidence_code), array('q'))
+
+        groups = [self.by_group.get((category_code, code), array('q')) for code in range(len(self.confidence_codes))]
+        return array('q', sorted(row for group in groups for row in group))
+
+    def select(self, category: Hashable = None, confidence: str = None) -> List[Dict[str, Any]]:
+        return [self.as_dict(row) for row in self.indices(category, confidence)]
+
+    def count(self, category: Hashable = None, confidence: str = None) -> int:
+        if category is None and confidence is None:
+            return len(self.results)
+        return len(self.indices(category, confidence))
+
+    def category_names(self) -> List[Hashable]:
+        # In order of first appearance, as the reports group them
+        return list(self.category_codes.names)
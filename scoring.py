@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+
+import instrumentation
+
+MAX_GROUP_SIZE = 4
+INVALID_GROUP = -1
+MIXED = 'mixed'
+
+PRINTABLE = np.zeros(10 ** MAX_GROUP_SIZE, dtype=bool)
+PRINTABLE[32:127] = True
+
+
+def render_table(control_markers: bool = False) -> List[str]:
+    table = []
+    for value in range(10 ** MAX_GROUP_SIZE):
+        if 32 <= value <= 126:
+            table.append(chr(value))
+        elif control_markers and 1 <= value <= 31:
+            table.append(f"[{value}]")
+        else:
+            table.append("?")
+    return table
+
+
+RENDER_TABLES = {False: render_table(False), True: render_table(True)}
+
+
+def as_digit_array(data: Union[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    if isinstance(data, np.ndarray):
+        return data.astype(np.int32), np.zeros(len(data), dtype=bool)
+
+    raw = np.frombuffer(data.encode('latin-1', 'replace'), dtype=np.uint8).astype(np.int32) - ord('0')
+    invalid = (raw < 0) | (raw > 9)
+    return np.where(invalid, 0, raw), invalid
+
+
+def group_values(data: Union[str, np.ndarray], group_size: int, circular: bool = True) -> np.ndarray:
+    if not 1 <= group_size <= MAX_GROUP_SIZE:
+        raise ValueError(f"Group size must be between 1 and {MAX_GROUP_SIZE}")
+
+    values, invalid = as_digit_array(data)
+    n = len(values)
+    if n == 0:
+        return np.zeros(0, dtype=np.int32)
+
+    # values[p] is the integer spelled by the group_size digits starting at p, wrapping around when circular
+    grouped = np.zeros(n, dtype=np.int32)
+    broken = np.zeros(n, dtype=bool)
+    for k in range(group_size):
+        grouped = grouped * 10 + np.roll(values, -k)
+        broken |= np.roll(invalid, -k)
+
+    if not circular:
+        broken[n - group_size + 1:] = True
+    grouped[broken] = INVALID_GROUP
+    return grouped
+
+
+def printable_flags(grouped: np.ndarray) -> np.ndarray:
+    return (grouped >= 0) & PRINTABLE[np.maximum(grouped, 0)]
+
+
+def strided_sums(flags: np.ndarray, group_size: int, starts: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    sums = np.zeros(len(starts), dtype=np.int64)
+    for residue in range(group_size):
+        lane = np.concatenate(([0], np.cumsum(flags[residue::group_size])))
+        chosen = starts % group_size == residue
+        first = starts[chosen] // group_size
+        sums[chosen] = lane[first + counts[chosen]] - lane[first]
+    return sums
+
+
+def rotation_counts(data: Union[str, np.ndarray], group_size: int) -> Tuple[np.ndarray, int]:
+    n = len(data)
+    total = n // group_size
+    if n == 0:
+        return np.zeros(0, dtype=np.int64), 0
+
+    flags = printable_flags(group_values(data, group_size, circular=True))
+    doubled = np.concatenate((flags, flags))
+    starts = np.arange(n)
+    return strided_sums(doubled, group_size, starts, np.full(n, total)), total
+
+
+def offset_counts(data: Union[str, np.ndarray], group_size: int) -> Tuple[np.ndarray, np.ndarray]:
+    n = len(data)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+    flags = printable_flags(group_values(data, group_size, circular=False))
+    starts = np.arange(n)
+    totals = (n - starts) // group_size
+    return strided_sums(flags, group_size, starts, totals), totals
+
+
+def score_rotations(data: Union[str, np.ndarray], group_size: int) -> np.ndarray:
+    valid, total = rotation_counts(data, group_size)
+    return valid / total * 100 if total else np.zeros(len(valid))
+
+
+def validity(data: Union[str, np.ndarray], group_size: int = 2) -> float:
+    total = len(data) // group_size
+    if total == 0:
+        return 0
+    flags = printable_flags(group_values(data, group_size, circular=False))
+    return int(flags[:total * group_size:group_size].sum()) / total * 100
+
+
+def render(data: Union[str, np.ndarray], group_size: int, rotation: int = 0, control_markers: bool = False) -> str:
+    n = len(data)
+    total = n // group_size
+    if total == 0:
+        return ""
+
+    grouped = group_values(data, group_size, circular=True)
+    positions = (rotation + np.arange(total) * group_size) % n
+    table = RENDER_TABLES[control_markers]
+    return ''.join([table[value] if value >= 0 else "?" for value in grouped[positions].tolist()])
+
+
+def top_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    # The k highest scores in descending order; ties keep the earlier index, so callers' positional tie-breaks hold
+    if len(scores) <= k:
+        return np.argsort(-scores, kind='stable')
+    kth = np.partition(scores, len(scores) - k)[len(scores) - k]
+    tied = np.flatnonzero(scores >= kth)
+    return tied[np.argsort(-scores[tied], kind='stable')][:k]
+
+
+def top_rotations(data: Union[str, np.ndarray], group_sizes: List[int], threshold: float,
+                  limit: int = None, always: int = 0, ranker=None) -> List[Dict[str, float]]:
+    # Rotations must clear the validity threshold; the ranker, when given, orders the survivors instead of validity
+    candidates = []
+    for group_size in group_sizes:
+        valid, total = rotation_counts(data, group_size)
+        if total == 0:
+            continue
+
+        scores = valid / total * 100
+        instrumentation.count(len(scores))
+        ranks = scores if ranker is None else ranker.score_rotations(data, group_size)
+        passing = np.flatnonzero(scores > threshold)
+        leading = passing[passing < always]
+        ranked = passing[np.argsort(-ranks[passing], kind='stable')]
+        chosen = ranked if limit is None else ranked[:limit]
+
+        for rotation in np.union1d(leading, chosen).tolist():
+            candidate = {
+                'rotation': rotation,
+                'group_size': group_size,
+                'valid_chars': int(valid[rotation]),
+                'total_groups': total,
+                'validity': float(scores[rotation])
+            }
+            if ranker is not None:
+                candidate[ranker.name] = float(ranks[rotation])
+            candidates.append(candidate)
+
+    candidates.sort(key=lambda candidate: (candidate['rotation'], candidate['group_size']))
+    return candidates
+
+
+def mixed_group_sizes(values: np.ndarray) -> np.ndarray:
+    # Variable-width decimal ASCII: a group opening with 1 spans three digits (100-126), any other spans two
+    return np.where(values == 1, 3, 2)
+
+
+def mixed_layout(data: Union[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # Over the doubled data: the group value starting at every position, whether it is damaged, and where the next
+    # group starts. The jump table has one extra sentinel entry that points at itself.
+    values, invalid = as_digit_array(data)
+    n = len(values)
+    doubled = np.concatenate((values, values))
+    broken = np.concatenate((invalid, invalid))
+    length = 2 * n
+    sentinel = length
+
+    sizes = mixed_group_sizes(doubled)
+    grouped = np.zeros(length, dtype=np.int64)
+    damaged = np.zeros(length, dtype=bool)
+    padded = np.concatenate((doubled, np.zeros(3, dtype=doubled.dtype)))
+    padded_broken = np.concatenate((broken, np.ones(3, dtype=bool)))
+    for k in range(3):
+        within = k < sizes
+        grouped = np.where(within, grouped * 10 + padded[k:k + length], grouped)
+        damaged |= within & padded_broken[k:k + length]
+
+    jump = np.append(np.minimum(np.arange(length) + sizes, sentinel), sentinel)
+    return grouped, damaged, jump
+
+
+def chain_sums(jump: np.ndarray, gains: np.ndarray, n: int, lookahead: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    # For every start p < n, the sum of gains over the groups chained from p that end within p + n, and their count.
+    # With a lookahead, a group only counts when that many groups after it also end within p + n.
+    # Binary lifting over the jumps, one table level per power of two.
+    gain = np.append(gains, 0)
+    length = len(gains)
+    ahead = np.arange(len(jump))
+    for _ in range(lookahead):
+        ahead = jump[ahead]
+    levels = [(jump, gain.astype(np.float64), np.append(np.ones(length, dtype=np.int64), 0))]
+    while (1 << len(levels)) <= n:
+        jump, gain, count = levels[-1]
+        levels.append((jump[jump], gain + gain[jump], count + count[jump]))
+
+    position = np.arange(n)
+    limit = position + n
+    sums = np.zeros(n)
+    counts = np.zeros(n, dtype=np.int64)
+    for jump, gain, count in reversed(levels):
+        target = jump[position]
+        fits = ahead[target] <= limit
+        sums[fits] += gain[position[fits]]
+        counts[fits] += count[position[fits]]
+        position = np.where(fits, target, position)
+    return sums, counts
+
+
+def mixed_rotation_sums(data: Union[str, np.ndarray], weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    n = len(data)
+    if n == 0:
+        return np.zeros(0), np.zeros(0, dtype=np.int64)
+
+    grouped, damaged, jump = mixed_layout(data)
+    return chain_sums(jump, np.where(damaged, 0, weights[grouped]), n)
+
+
+def mixed_groups(data: str) -> List[str]:
+    groups = []
+    i = 0
+    while i < len(data):
+        size = 3 if data[i] == '1' else 2
+        if i + size > len(data):
+            break
+        groups.append(data[i:i + size])
+        i += size
+    return groups
+
+
+class TableScorer:
+
+    def __init__(self, weights: np.ndarray, name: str):
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.name = name
+
+    def score_values(self, values: List[int]) -> float:
+        if not values:
+            return 0
+        hits = sum(self.weights[value] for value in values if 0 <= value < len(self.weights))
+        return hits / len(values) * 100
+
+    def score_rotations(self, data: Union[str, np.ndarray], group_size) -> np.ndarray:
+        if group_size == MIXED:
+            sums, counts = mixed_rotation_sums(data, self.weights)
+            return np.divide(sums, counts, out=np.zeros(len(sums)), where=counts > 0) * 100
+
+        n = len(data)
+        total = n // group_size
+        if total == 0:
+            return np.zeros(n)
+
+        grouped = group_values(data, group_size, circular=True)
+        gains = np.where(grouped >= 0, self.weights[np.maximum(grouped, 0)], 0)
+        sums = strided_sums(np.concatenate((gains, gains)), group_size, np.arange(n), np.full(n, total))
+        return sums / total * 100
+
+
+CONTROL_INCLUSIVE = np.zeros(10 ** MAX_GROUP_SIZE, dtype=bool)
+CONTROL_INCLUSIVE[1:127] = True
+
+PRINTABLE_SCORER = TableScorer(PRINTABLE, 'printable')
+CONTROL_INCLUSIVE_SCORER = TableScorer(CONTROL_INCLUSIVE, 'control_inclusive')
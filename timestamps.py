@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+
+from collections.abc import Sequence
+from typing import Any, Dict, List, Tuple, Union
+
+import numpy as np
+
+import instrumentation
+
+# Epoch name -> (seconds from the Unix epoch to this epoch's zero, ticks per second)
+# GPS time is taken without its leap-second offset (18 s since 2017)
+EPOCHS = {
+    'unix': (0, 1),
+    'unix_ms': (0, 1000),
+    'ntp': (-2208988800, 1),
+    'gps': (315964800, 1),
+    'filetime': (-11644473600, 10 ** 7)
+}
+WIDTHS = (32, 40, 64)
+BYTEORDERS = ('big', 'little')
+RANGE = (946684800, 1893456000)
+BLOCK_SIZE = 1 << 20
+
+TIMESTAMP_DTYPE = np.dtype([
+    ('position', np.int64),
+    ('width', np.uint8),
+    ('little', np.bool_),
+    ('epoch', np.uint8),
+    ('raw', np.uint64),
+    ('unix_ms', np.int64)
+])
+
+
+def as_buffer(data: Union[bytes, bytearray, memoryview, np.ndarray]) -> np.ndarray:
+    return data if isinstance(data, np.ndarray) else np.frombuffer(data, dtype=np.uint8)
+
+
+def byte_windows(data: np.ndarray, start: int, count: int, width: int, byteorder: str) -> np.ndarray:
+    # Rolling shift-or over strided slices: one vectorized pass per byte of the window
+    values = np.zeros(count, dtype=np.uint64)
+    offsets = range(width) if byteorder == 'big' else range(width - 1, -1, -1)
+    for k in offsets:
+        values = (values << np.uint64(8)) | data[start + k:start + k + count]
+    return values
+
+
+def nibble_windows(data: np.ndarray, start: int, count: int, width: int) -> np.ndarray:
+    # Big-endian windows that start on the low half of a byte, as read from hex text at odd digit positions
+    bits = 8 * width
+    body = byte_windows(data, start, count, width, 'big') & np.uint64((1 << (bits - 4)) - 1)
+    return (body << np.uint64(4)) | (data[start + width:start + width + count] >> 4)
+
+
+def tick_range(epoch: str, width: int, low: int, high: int) -> Tuple[int, int]:
+    offset, ticks = EPOCHS[epoch]
+    return max((low - offset) * ticks, 0), min((high - offset) * ticks, (1 << (8 * width)) - 1)
+
+
+class TimestampCandidates(Sequence):
+
+    def __init__(self, records: np.ndarray, epochs: Tuple[str, ...]):
+        self.records = records
+        self.epochs = epochs
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.as_dicts(self.records[index])
+        index = range(len(self.records))[index]
+        return self.as_dicts(self.records[index:index + 1])[0]
+
+    def as_dicts(self, records: np.ndarray) -> List[Dict[str, Any]]:
+        # Columns are converted to Python values in bulk; per-record access to a structured array is slow
+        columns = [records[name].tolist() for name in ('position', 'width', 'little', 'epoch', 'raw', 'unix_ms')]
+        return [self.as_dict(*row, text) for *row, text in zip(*columns, format_utc(records['unix_ms']).tolist())]
+
+    def as_dict(self, position: int, width: int, little: bool, epoch: int, raw: int, unix_ms: int,
+                text: str) -> Dict[str, Any]:
+        byteorder = 'little' if little else 'big'
+        return {
+            'position': position,
+            'width': width,
+            'byteorder': byteorder,
+            'epoch': self.epochs[epoch],
+            'hex': raw.to_bytes(width // 8, byteorder).hex() if little else f"{raw:0{width // 4}x}",
+            'raw': raw,
+            'unix_ms': unix_ms,
+            'datetime': text,
+            'year': int(text[:4])
+        }
+
+    def unique(self) -> 'TimestampCandidates':
+        # Ordered by raw value, keeping the first window that produced each one
+        _, first = np.unique(self.records['raw'], return_index=True)
+        return TimestampCandidates(self.records[first], self.epochs)
+
+    def datetimes(self) -> List[str]:
+        return format_utc(self.records['unix_ms']).tolist()
+
+
+def format_utc(unix_ms: np.ndarray) -> np.ndarray:
+    # Bulk ISO formatting in UTC, only ever applied to windows that survived the range filter
+    text = np.datetime_as_string(np.atleast_1d(np.asarray(unix_ms, dtype=np.int64)).astype('datetime64[ms]'), unit='s')
+    return np.char.replace(text, 'T', ' ') if len(text) else text
+
+
+def scan_block(data: np.ndarray, start: int, count: int, width: int, byteorder: str, nibble: bool,
+               epochs: Tuple[str, ...], low: int, high: int) -> np.ndarray:
+    size = width // 8
+    values = nibble_windows(data, start, count, size) if nibble else byte_windows(data, start, count, size, byteorder)
+
+    found = []
+    for epoch_index, epoch in enumerate(epochs):
+        raw_low, raw_high = tick_range(epoch, size, low, high)
+        if raw_low > raw_high:
+            continue
+        rows = np.flatnonzero((values >= np.uint64(raw_low)) & (values <= np.uint64(raw_high)))
+        if not len(rows):
+            continue
+
+        offset, ticks = EPOCHS[epoch]
+        raw = values[rows]
+        seconds, fraction = np.divmod(raw, np.uint64(ticks))
+        block = np.empty(len(rows), dtype=TIMESTAMP_DTYPE)
+        block['position'] = 2 * (start + rows) + (1 if nibble else 0)
+        block['width'] = width
+        block['little'] = byteorder == 'little'
+        block['epoch'] = epoch_index
+        block['raw'] = raw
+        block['unix_ms'] = ((seconds.astype(np.int64) + offset) * 1000
+                            + fraction.astype(np.int64) * 1000 // ticks)
+        found.append(block)
+    return np.concatenate(found) if found else np.empty(0, dtype=TIMESTAMP_DTYPE)
+
+
+def scan_timestamps(data: Union[bytes, bytearray, memoryview, np.ndarray], widths: Tuple[int, ...] = WIDTHS,
+                    byteorders: Tuple[str, ...] = BYTEORDERS, epochs: Tuple[str, ...] = tuple(EPOCHS),
+                    low: int = RANGE[0], high: int = RANGE[1], nibble_aligned: bool = False,
+                    block_size: int = BLOCK_SIZE) -> TimestampCandidates:
+    data = as_buffer(data)
+    blocks = []
+    evaluated = 0
+
+    # Records come out grouped by width, then byte order, then epoch, each in position order
+    for width in widths:
+        size = width // 8
+        for byteorder in byteorders:
+            # Hex-digit alignment only has a meaning for big-endian reads of hex text
+            phases = (False, True) if nibble_aligned and byteorder == 'big' else (False,)
+            group = []
+            for nibble in phases:
+                starts = len(data) - size - (1 if nibble else 0) + 1
+                for start in range(0, max(starts, 0), block_size):
+                    count = min(block_size, starts - start)
+                    evaluated += count
+                    group.append(scan_block(data, start, count, width, byteorder, nibble, epochs, low, high))
+            if group:
+                records = np.concatenate(group)
+                blocks.append(records[np.lexsort((records['position'], records['epoch']))])
+
+    instrumentation.count(evaluated)
+    records = np.concatenate(blocks) if blocks else np.empty(0, dtype=TIMESTAMP_DTYPE)
+    return TimestampCandidates(records, tuple(epochs))
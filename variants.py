@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+
+import hashlib
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+import numpy as np
+
+import digits
+
+
+class VariantRegistry(Mapping):
+
+    def __init__(self):
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._values: Dict[str, Any] = {}
+        self._strings: Dict[str, str] = {}
+        self._arrays: Dict[str, np.ndarray] = {}
+        self._digests: Dict[str, str] = {}
+
+    @classmethod
+    def from_mapping(cls, variants: Mapping) -> 'VariantRegistry':
+        if isinstance(variants, VariantRegistry):
+            return variants
+
+        registry = cls()
+        for name, data in variants.items():
+            registry.register(name, lambda data=data: data)
+        return registry
+
+    def register(self, name: str, factory: Callable[[], Any]):
+        self._factories[name] = factory
+        for cache in (self._values, self._strings, self._arrays, self._digests):
+            cache.pop(name, None)
+
+    def __getitem__(self, name: str) -> str:
+        if name not in self._strings:
+            value = self.value(name)
+            self._strings[name] = value if isinstance(value, str) else digits.to_digit_string(value)
+        return self._strings[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._factories)
+
+    def __len__(self) -> int:
+        return len(self._factories)
+
+    def value(self, name: str) -> Any:
+        if name not in self._values:
+            self._values[name] = self._factories[name]()
+        return self._values[name]
+
+    def array(self, name: str) -> np.ndarray:
+        if name not in self._arrays:
+            value = self.value(name)
+            self._arrays[name] = digits.to_digit_array(value) if isinstance(value, str) else value
+        return self._arrays[name]
+
+    def digest(self, name: str) -> str:
+        if name not in self._digests:
+            value = self.value(name)
+            if isinstance(value, str):
+                payload = value.encode('ascii')
+            else:
+                payload = (np.asarray(value, dtype=digits.DIGIT_DTYPE) + ord('0')).tobytes()
+            self._digests[name] = hashlib.blake2b(payload, digest_size=16).hexdigest()
+        return self._digests[name]
+
+    def groups(self) -> Iterator[Tuple[str, List[str]]]:
+        members: Dict[str, List[str]] = {}
+        for name in self._factories:
+            members.setdefault(self.digest(name), []).append(name)
+
+        for names in members.values():
+            yield names[0], names
+
+    def unique_items(self) -> Iterator[Tuple[str, str, List[str]]]:
+        for canonical, names in self.groups():
+            yield canonical, self[canonical], names
+
+    def unique_count(self) -> int:
+        return len({self.digest(name) for name in self._factories})
+
+    def label(self, names: List[str]) -> str:
+        if len(names) == 1:
+            return names[0]
+        return f"{names[0]} (= {', '.join(names[1:])})"